@@ -7,20 +7,38 @@ api_key_exp_time = {
     "player_name": self.rsi_handle
 }
 
-kill_result = {
-    "result": "exclusion"/"own_death"/"other_kill",
-    "data": {
-        "player": target_name,
-        "victim": killed,
-        "time": kill_time,
-        "zone": killed_zone,
-        "weapon": weapon,
-        "rsi_profile": rsi_profile,
-        "game_mode": self.game_mode,
-        "client_ver": "7.0",
-        "killers_ship": self.active_ship,
-        "anonymize_state": self.anonymize_state
-    }
+# KillEvent.to_wire(), posted to reportKill
+kill_event = {
+    "player": target_name,
+    "victim": killed,
+    "time": kill_time,
+    "zone": killed_zone,
+    "weapon": weapon,
+    "rsi_profile": rsi_profile,
+    "game_mode": self.game_mode,
+    "client_ver": "7.0",
+    "killers_ship": self.active_ship,
+    "anonymize_state": {"enabled": False}
+}
+
+# DeathEvent.to_wire(), posted to reportACKill for Arena Commander Free Flight deaths
+death_event = {
+    "time": kill_time,
+    "player": killer,
+    "victim": target_name,
+    "game_mode": self.game_mode
+}
+
+# Entry of cfg_dict["pickle"] for a kill that failed to post
+pickled_kill = {
+    "payload": kill_event,
+    "endpoint": "reportKill"
+}
+
+# Entries pickled by older versions are still read
+legacy_pickled_kill = {
+    "kill_result": {"result": "killer", "data": kill_event},
+    "endpoint": "reportKill"
 }
 
 heartbeart_base = {
@@ -1,10 +1,8 @@
 
-from sys import exit
-from time import sleep
 from os import path
 from psutil import process_iter
-from threading import Thread
 from queue import Queue
+from multiprocessing import freeze_support
 import warnings
 warnings.filterwarnings("ignore", message="Couldn't find ffmpeg or avconv")
 
@@ -13,8 +11,10 @@ from modules.cfg_handler import Cfg_Handler
 from modules.api_client import API_Client
 from modules.gui import GUI
 from modules.log_parser import LogParser
+from modules.log_checkpoint import LogCheckpoint
 from modules.sounds import Sounds
 from modules.commander_mode.cm_core import CM_Core
+from modules.scheduler import Scheduler
 
 class KillTracker():
     """Official Kill Tracker for BlightVeil."""
@@ -31,6 +31,8 @@ class KillTracker():
         self.player_geid = {"current": "N/A"}
         self.active_ship = {"current": "N/A"}
         self.update_queue = Queue()    
+        # Runs every periodic job of the app, instead of a sleeping thread per job
+        self.scheduler = Scheduler()
         
     def check_if_process_running(self, process_name:str) -> str:
         """Check if a process is running by name."""
@@ -104,39 +106,34 @@ class KillTracker():
             self.log.error(f"get_sc_log_location(): Error: {e.__class__.__name__} {e}")
 
     def monitor_game_state(self) -> None:
-        """Continuously monitor the game state and manage log monitoring."""
-        while self.program_state["enabled"]:
-            try:
-                game_running = self.is_game_running()
+        """Check the game state and manage log monitoring, run every 5 seconds by the scheduler."""
+        try:
+            game_running = self.is_game_running()
 
-                if game_running and not self.monitoring["active"]:  # Log only when transitioning to running
-                    self.log_parser.log_file_location = self.get_sc_log_location(self.get_sc_processes())
-                    self.log.success("Star Citizen is running. Starting kill tracking.")
-                    self.rsi_handle["current"] = self.log_parser.find_rsi_handle()
-                    self.log.success(f"Current RSI handle is {self.rsi_handle['current']}.")
-                    self.player_geid["current"] = self.log_parser.find_rsi_geid()
-                    self.log.info(f"Current User GEID is {self.player_geid['current']}.")
-                    self.monitoring["active"] = True
-                    self.log_parser.start_tail_log_thread()
+            if game_running and not self.monitoring["active"]:  # Log only when transitioning to running
+                self.log_parser.log_file_location = self.get_sc_log_location(self.get_sc_processes())
+                self.log.success("Star Citizen is running. Starting kill tracking.")
+                # Handle, GEID, game mode and ship are recovered in a single read of the log
+                self.log_parser.bootstrap_session()
+                self.log.success(f"Current RSI handle is {self.rsi_handle['current']}.")
+                self.log.info(f"Current User GEID is {self.player_geid['current']}.")
+                self.monitoring["active"] = True
+                self.log_parser.start_tail_log_thread()
 
-                elif not game_running and self.monitoring["active"]:  # Log only when transitioning to stopped
-                    self.log.warning("Star Citizen has stopped.")
-                    self.monitoring["active"] = False
+            elif not game_running and self.monitoring["active"]:  # Log only when transitioning to stopped
+                self.log.warning("Star Citizen has stopped.")
+                self.monitoring["active"] = False
 
-            except Exception as e:
-                self.log.error(f"monitor_game_state(): Error: {e.__class__.__name__} {e}")
-            sleep(5)  # Check every 5 seconds
+        except Exception as e:
+            self.log.error(f"monitor_game_state(): Error: {e.__class__.__name__} {e}")
 
     def auto_shutdown(self, app, delay_in_seconds):
-        def shutdown():
-            sleep(delay_in_seconds) 
-            self.log.warning("Application has been open for 72 hours. Shutting down in 60 seconds.")
-            sleep(60)
-            app.quit()
-            exit(0) 
-
-        # Run the shutdown logic in a separate thread
-        Thread(target=shutdown, daemon=True).start()
+        """Warn and quit the app once it has been open for the given time."""
+        self.scheduler.after(
+            "auto_shutdown_warning", delay_in_seconds,
+            lambda: self.log.warning("Application has been open for 72 hours. Shutting down in 60 seconds.")
+        )
+        self.scheduler.after("auto_shutdown", delay_in_seconds + 60, app.quit)
 
 def main():
     try:
@@ -204,6 +201,13 @@ def main():
     try:
         # API needs ref to some class instances for functions
         api_client_module.cm = cm_module
+        # Every module schedules its periodic jobs on the shared scheduler
+        api_client_module.scheduler = kt.scheduler
+        cfg_module.scheduler = kt.scheduler
+        cm_module.scheduler = kt.scheduler
+        gui_module.scheduler = kt.scheduler
+        log_parser_module.scheduler = kt.scheduler
+        kt.scheduler.start()
         # GUI needs ref to some class instances to setup the GUI
         gui_module.api = api_client_module
         gui_module.cm = cm_module
@@ -216,30 +220,47 @@ def main():
         try:
             #TODO Make a module import framework to easily add in future modules
             kt.log_parser = log_parser_module
+            # Resume Game.log where the previous run stopped
+            log_parser_module.checkpoint = LogCheckpoint()
             # Add logger ref to classes
             kt.log = gui_module.log
+            kt.scheduler.log = gui_module.log
             cfg_module.log = gui_module.log
             api_client_module.log = gui_module.log
+            api_client_module.transport.log = gui_module.log
             sound_module.log = gui_module.log
             cm_module.log = gui_module.log
             log_parser_module.log = gui_module.log
+            log_parser_module.checkpoint.log = gui_module.log
         except Exception as e:
             print(f"main(): ERROR in setting up the app loggers: {e.__class__.__name__} {e}")
 
+        try:
+            # Weapon names and ignored victims are known before Servitor answers
+            api_client_module.load_cached_data_maps()
+        except Exception as e:
+            print(f"main(): ERROR loading the cached data maps: {e.__class__.__name__} {e}")
+
         try:
             sound_module.setup_sounds()
         except Exception as e:
             print(f"main(): ERROR in setting up the sounds module: {e.__class__.__name__} {e}")
         
+        try:
+            # Connect to Servitor ahead of the first kill
+            kt.scheduler.after("warm_up", 0, api_client_module.transport.warm_up, blocking=True)
+        except Exception as e:
+            print(f"main(): ERROR warming up the Servitor connection: {e.__class__.__name__} {e}")
+
         try:
             # Kill Tracker log pickler
-            monitor_thr = Thread(target=cfg_module.log_pickler, daemon=True).start()
+            kt.scheduler.every("log_pickler", cfg_module.log_pickler, 60, jitter=5, delay=0)
         except Exception as e:
             print(f"main(): ERROR starting log pickler: {e.__class__.__name__} {e}")
 
         try:
-            # Kill Tracker monitor loop
-            monitor_thr = Thread(target=kt.monitor_game_state, daemon=True).start()
+            # Kill Tracker game state monitor, blocking as starting the log monitoring scans the whole Game.log
+            kt.scheduler.every("monitor_game_state", kt.monitor_game_state, 5, delay=0, blocking=True)
             kt.auto_shutdown(gui_module.app, 72 * 60 * 60)
         except Exception as e:
             print(f"main(): ERROR starting game state monitoring: {e.__class__.__name__} {e}")
@@ -252,13 +273,22 @@ def main():
     except KeyboardInterrupt:
         print("Program interrupted. Exiting gracefully...")
         kt.monitoring["active"] = False
-        if isinstance(monitor_thr, Thread):
-            monitor_thr.join(1)
         gui_module.app.quit()
     except Exception as e:
         print(f"main(): ERROR starting GUI main loop: {e.__class__.__name__} {e}")
 
+    try:
+        # Cancel the periodic jobs without waiting, a request or log scan in flight is dropped with its daemon thread
+        kt.scheduler.stop(wait=False)
+        if game_running:
+            print("Executing final config save.")
+            cfg_module.save_cfg("pickle", cfg_module.cfg_dict["pickle"])
+    except Exception as e:
+        print(f"main(): ERROR shutting down: {e.__class__.__name__} {e}")
+
 if __name__ == '__main__':
+    # Worker processes of the parallel log scan re-run this file in the frozen build
+    freeze_support()
     try:
         main()
     except Exception as e:
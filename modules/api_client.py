@@ -1,12 +1,18 @@
 import requests
 import webbrowser
-from threading import Thread
 from datetime import datetime
 import pytz
 from tzlocal import get_localzone
 from packaging import version
-from time import sleep
-import itertools
+
+# Import kill tracker modules
+from modules.log_matcher import VictimRuleMatcher, IdIndex
+from modules.log_events import get_pickled_payload
+from modules.transport import Transport
+from modules.data_map_cache import DataMapCache, get_content_hash, diff_data_maps
+
+# Import global settings
+import global_settings
 
 class API_Client():
     """API client for the Kill Tracker."""
@@ -22,11 +28,25 @@ class API_Client():
         self.request_timeout = 12
         self.api_key = {"value": None}
         self.api_fqdn = "http://blightveil.org:25966"
+        # Pooled keep-alive connections shared by every Servitor call, also used by commander mode
+        self.transport = Transport(self.api_fqdn, self.api_key, self.local_version)
+        # Endpoints Servitor takes batches for, None until it was asked
+        self.batch_endpoints = None
         self.sc_data = {"weapons": [], "ships": [], "ignoredVictimRules": []}
+        # Lookup structures derived from sc_data, rebuilt whenever a data map changes
+        self.victim_matcher = VictimRuleMatcher()
+        self.data_indexes = {"weapons": IdIndex(), "ships": IdIndex()}
+        # Data maps of the last run, refreshed from Servitor with conditional requests
+        self.data_map_cache = DataMapCache()
+        # Read once, the ETags are sent whether or not the game was running at startup
+        self.data_map_cache.load()
+        # Content hash of every data map in sc_data, so an unchanged pull costs one comparison
+        self.data_map_hashes = {}
         self.expiration_time = None
         self.countdown_active = False
         self.connection_healthy = False
         self.countdown_interval = 60
+        self.scheduler = None
         self.key_status_valid_color = "#04B431"
         self.key_status_invalid_color = "red"
 
@@ -79,28 +99,19 @@ class API_Client():
     def validate_api_key(self, key) -> bool:
         """Validate the API key."""
         try:
-            url = f"{self.api_fqdn}/validateKey"
-            headers = {
-                "Authorization": key,
-                "Content-Type": "application/json"
-            }
             api_key_data = {
                 "api_key": key,
                 "player_name": self.rsi_handle["current"]
             }
             self.log.debug(f"validate_api_key(): Request payload: {api_key_data}")
-            response = requests.post(
-                url, 
-                headers=headers, 
-                json=api_key_data, 
-                timeout=self.request_timeout
-            )
+            # The key is not active yet, so it is passed explicitly
+            response = self.transport.post("validateKey", api_key_data, headers={"Authorization": key})
             self.log.debug(f"validate_api_key(): Response text: {response.text}")
             if response.status_code != 200:
                 self.log.error(f"Error in validating the key: code {response.status_code}")
                 self.connection_healthy = False
                 return False
-            self.connection_healthy = True
+            self.mark_connection_healthy()
             return True
         except requests.RequestException as e:
             self.log.error(f"validate_api_key(): Request Error: {e.__class__.__name__} {e}")
@@ -133,9 +144,7 @@ class API_Client():
                     self.log.success("Key activated and saved. Servitor connection established.")
                     self.gui.api_status_label.config(text="Key Status: Valid", fg=self.key_status_valid_color)
                     if not self.countdown_active:
-                        self.countdown_active = True
-                        thr = Thread(target=self.start_api_key_countdown, daemon=True)
-                        thr.start()
+                        self.start_api_key_countdown()
                 else:
                     self.log.error("Error: Invalid key. Please enter a valid key from Discord.")
                     self.api_key["value"] = None
@@ -149,24 +158,14 @@ class API_Client():
     def post_api_key_expiration_time(self):
         """Retrieve the expiration time for the API key from the validation server."""
         try:
-            url = f"{self.api_fqdn}/validateKey"
-            headers = {
-                "Authorization": self.api_key["value"],
-                "Content-Type": "application/json"
-            }
             api_key_exp_time = {
                 "player_name": self.rsi_handle["current"]
             }
             self.log.debug(f"post_api_key_expiration_time(): Request payload: {api_key_exp_time}")
-            response = requests.post(
-                url, 
-                headers=headers, 
-                json=api_key_exp_time, 
-                timeout=self.request_timeout
-            )
+            response = self.transport.post("validateKey", api_key_exp_time)
             self.log.debug(f"post_api_key_expiration_time(): Response text: {response.text}")
             if response.status_code == 200:
-                self.connection_healthy = True
+                self.mark_connection_healthy()
                 response_data = response.json()
                 post_key_exp_result = response_data.get("expires_at")
                 if post_key_exp_result:
@@ -188,120 +187,142 @@ class API_Client():
         self.connection_healthy = False
         return "error"
 
+    def mark_connection_healthy(self) -> None:
+        """Record a successful Servitor call, a comeback drains the pickled kills right away."""
+        if self.scheduler and not self.connection_healthy and self.cfg_handler.cfg_dict["pickle"]:
+            self.scheduler.wake("log_pickler")
+        self.connection_healthy = True
+
     def start_api_key_countdown(self) -> None:
-        """Start the countdown for the API key's expiration, refreshing expiry data periodically."""
-        def stop_countdown():
-            if self.cm:
-                self.cm.stop_heartbeat_threads()
-            self.api_key["value"] = None
-            self.monitoring["active"] = False
-            self.gui.api_status_label.config(text="Key Status: Expired", fg=self.key_status_invalid_color)
-            self.countdown_active = False
+        """Start the countdown for the API key's expiration, the scheduler refreshes the expiry data periodically."""
+        self.countdown_active = True
+        self.scheduler.every("api_key_countdown", self.update_api_key_countdown, self.countdown_interval, jitter=5, delay=0, blocking=True)
 
+    def stop_api_key_countdown(self) -> None:
+        """Stop the countdown and everything that needs a valid key."""
+        self.scheduler.cancel("api_key_countdown")
+        if self.cm:
+            self.cm.stop_heartbeat_threads()
+        self.api_key["value"] = None
+        self.monitoring["active"] = False
+        self.gui.api_status_label.config(text="Key Status: Expired", fg=self.key_status_invalid_color)
+        self.countdown_active = False
+
+    def update_api_key_countdown(self) -> None:
+        """Refresh the expiry data, the key status label and the SC data maps."""
         server_tz = pytz.timezone('US/Mountain')
         local_tz = get_localzone()
 
-        while self.countdown_active:
-            try:
-                if not self.api_key["value"]:
-                    raise Exception("Request to get the expiration time will not be sent because the API key does not exist.")
-                if self.rsi_handle["current"] == "N/A":
-                    raise Exception("RSI handle name has not been found yet!")
-                # Get the expiration time from the server (already returned in UTC)
-                post_key_exp_result = self.post_api_key_expiration_time()
-                if post_key_exp_result == "error":
-                    self.log.warning("Failed to get the key expiration time. Continuing anyway ...")
-                elif post_key_exp_result == "invalidated":
+        try:
+            if not self.api_key["value"]:
+                raise Exception("Request to get the expiration time will not be sent because the API key does not exist.")
+            if self.rsi_handle["current"] == "N/A":
+                raise Exception("RSI handle name has not been found yet!")
+            # Get the expiration time from the server (already returned in UTC)
+            post_key_exp_result = self.post_api_key_expiration_time()
+            if post_key_exp_result == "error":
+                self.log.warning("Failed to get the key expiration time. Continuing anyway ...")
+            elif post_key_exp_result == "invalidated":
+                self.cfg_handler.save_cfg("key", "")
+                self.log.error("Key has been invalidated by Servitor. Please get a new key or speak with a BlightVeil admin.")
+                self.stop_api_key_countdown()
+                return # Skip further calculations if invalidated
+            # Expiration time was returned
+            else:
+                expiration_time = datetime.strptime(post_key_exp_result, "%Y-%m-%dT%H:%M:%S.%fZ")
+                expiration_time = expiration_time.replace(tzinfo=local_tz)
+                now = datetime.now(server_tz)
+
+                # Check if the key has expired
+                if now > expiration_time:
+                    self.log.error(f"Key expired. Please enter a new Kill Tracker key.")
                     self.cfg_handler.save_cfg("key", "")
-                    self.log.error("Key has been invalidated by Servitor. Please get a new key or speak with a BlightVeil admin.")
-                    stop_countdown()
-                    continue # Skip further calculations if invalidated
-                # Expiration time was returned
-                else:
-                    expiration_time = datetime.strptime(post_key_exp_result, "%Y-%m-%dT%H:%M:%S.%fZ")
-                    expiration_time = expiration_time.replace(tzinfo=local_tz)
-                    now = datetime.now(server_tz)
-
-                    # Check if the key has expired
-                    if now > expiration_time:
-                        self.log.error(f"Key expired. Please enter a new Kill Tracker key.")
-                        self.cfg_handler.save_cfg("key", "")
-                        stop_countdown()
-                        continue # Skip further calculations if expired
-
-                    # Calculate the remaining time
-                    remaining_time = expiration_time - now
-                    total_seconds = int(remaining_time.total_seconds())
-
-                    # Debugging output
-                    self.log.debug(f"Expiration Time: {expiration_time}")
-                    self.log.debug(f"Current Time (now): {now}")
-                    self.log.debug(f"Remaining Time: {remaining_time}")
-                    self.log.debug(f"Total Seconds Remaining: {total_seconds}")
-
-                    # Break the total seconds into days, hours, minutes, and seconds
-                    days, remainder = divmod(total_seconds, 86400)
-                    hours, remainder = divmod(remainder, 3600)
-                    minutes, seconds = divmod(remainder, 60)
-
-                    # Building the countdown text
-                    if total_seconds > 0:
-                        if days > 0:
-                            countdown_text = f"Key Status: Valid (Expires in {days} days)"
-                        elif hours > 0:
-                            countdown_text = f"Key Status: Valid (Expires in {hours} hours {minutes} minutes)"
-                        else:
-                            countdown_text = f"Key Status: Valid (Expires in {minutes} minutes {seconds} seconds)"
-                        self.gui.api_status_label.config(text=countdown_text, fg=self.key_status_valid_color)
-                        self.cfg_handler.save_cfg("key", self.api_key["value"])
-                        # Update local SC data
-                        self.log.debug("Pulling SC data mappings from Servitor.")
-                        self.get_data_map("weapons")
-                        sleep(1)
-                        #self.get_data_map("ships") # NOT NEEDED ATM
-                        #sleep(1)
-                        self.get_data_map("ignoredVictimRules")
-                        sleep(1)
-                    else:
-                        self.log.error(f"Key expired. Please enter a new Kill Tracker key.")
-                        self.cfg_handler.save_cfg("key", "")
-                        stop_countdown()
-            except Exception as e:
-                self.log.error(f"General error in key expiration countdown: {e.__class__.__name__} {e}")
+                    self.stop_api_key_countdown()
+                    return # Skip further calculations if expired
+
+                # Calculate the remaining time
+                remaining_time = expiration_time - now
+                total_seconds = int(remaining_time.total_seconds())
+
+                # Debugging output
+                self.log.debug(f"Expiration Time: {expiration_time}")
+                self.log.debug(f"Current Time (now): {now}")
+                self.log.debug(f"Remaining Time: {remaining_time}")
+                self.log.debug(f"Total Seconds Remaining: {total_seconds}")
+
+                # Break the total seconds into days, hours, minutes, and seconds
+                days, remainder = divmod(total_seconds, 86400)
+                hours, remainder = divmod(remainder, 3600)
+                minutes, seconds = divmod(remainder, 60)
 
-            sleep(self.countdown_interval)
+                # Building the countdown text
+                if total_seconds > 0:
+                    if days > 0:
+                        countdown_text = f"Key Status: Valid (Expires in {days} days)"
+                    elif hours > 0:
+                        countdown_text = f"Key Status: Valid (Expires in {hours} hours {minutes} minutes)"
+                    else:
+                        countdown_text = f"Key Status: Valid (Expires in {minutes} minutes {seconds} seconds)"
+                    self.gui.api_status_label.config(text=countdown_text, fg=self.key_status_valid_color)
+                    self.cfg_handler.save_cfg("key", self.api_key["value"])
+                    # Update local SC data
+                    self.log.debug("Pulling SC data mappings from Servitor.")
+                    self.get_data_map("weapons")
+                    #self.get_data_map("ships") # NOT NEEDED ATM
+                    self.get_data_map("ignoredVictimRules")
+                else:
+                    self.log.error(f"Key expired. Please enter a new Kill Tracker key.")
+                    self.cfg_handler.save_cfg("key", "")
+                    self.stop_api_key_countdown()
+        except Exception as e:
+            self.log.error(f"General error in key expiration countdown: {e.__class__.__name__} {e}")
         
 #########################################################################################################
 ### LOG PARSER API                                                                                    ###
 #########################################################################################################
 
+    def load_cached_data_maps(self) -> None:
+        """Start from the data maps cached by the last run, so the parser does not wait for the first pull."""
+        self.data_map_cache.log = self.log
+        for data_type, entry in self.data_map_cache.entries.items():
+            if data_type in self.sc_data:
+                self.sc_data[data_type] = entry["data"]
+                self.data_map_hashes[data_type] = get_content_hash(entry["data"])
+                self.refresh_data_indexes(data_type)
+                self.log.debug(f"load_cached_data_maps(): Loaded {len(entry['data'])} cached {data_type} entries.")
+
     def get_data_map(self, data_type:str) -> None:
-        """Get data map from the server."""
+        """Get data map from the server, an unchanged map is answered with 304 Not Modified."""
         try:
             if not self.api_key["value"]:
                 self.log.warning("Error: Data map for {} will not be pulled because the key does not exist. Using default mappings.")
                 return
             
-            url = f"{self.api_fqdn}/api/server/data/{data_type}"
-            headers = {
-                'Authorization': self.api_key["value"] if self.api_key["value"] else ""
-            }
             self.log.debug(f"get_data_map(): Requesting data for {data_type} from Servitor.")
-            response = requests.get(
-                url, 
-                headers=headers, 
-                timeout=self.request_timeout
-            )
-            if response.status_code == 200:
-                self.connection_healthy = True
+            etag = self.data_map_cache.get_etag(data_type)
+            response = self.transport.get(f"api/server/data/{data_type}", "data", {"If-None-Match": etag} if etag else None)
+            if response.status_code == 304:
+                self.mark_connection_healthy()
+                self.log.debug(f"get_data_map(): Local SC data for {data_type} is the same as Servitor.")
+            elif response.status_code == 200:
+                self.mark_connection_healthy()
                 self.log.debug(f'{data_type} data has been downloaded from Servitor.')
                 # Merge incoming SC data into new dict
                 server_data = response.json()[data_type]
-                diff = list(itertools.filterfalse(lambda x: x in self.sc_data[data_type], server_data)) + list(itertools.filterfalse(lambda x: x in server_data, self.sc_data[data_type]))
-                if len(diff) > 0:
+                server_hash = get_content_hash(server_data)
+                if data_type not in self.data_map_hashes:
+                    self.data_map_hashes[data_type] = get_content_hash(self.sc_data[data_type])
+                changed = server_hash != self.data_map_hashes[data_type]
+                if changed or response.headers.get("ETag") != etag:
+                    self.data_map_cache.save(data_type, server_data, response.headers.get("ETag"))
+                if changed:
                     self.log.debug(f"get_data_map(): Local SC data for the Kill Tracker differs from Servitor data. Updating local data for {data_type}")
-                    self.log.debug(f'get_data_map(): Diff for {data_type} data: {diff}')
+                    if global_settings.DEBUG_MODE["enabled"]:
+                        added, removed = diff_data_maps(self.sc_data[data_type], server_data)
+                        self.log.debug(f'get_data_map(): Diff for {data_type} data: added {added}, removed {removed}')
                     self.sc_data[data_type] = server_data
+                    self.data_map_hashes[data_type] = server_hash
+                    self.refresh_data_indexes(data_type)
                 else:
                     self.log.debug(f"get_data_map(): Local SC data for {data_type} is the same as Servitor.")
             else:
@@ -314,29 +335,28 @@ class API_Client():
             self.log.error(f"get_data_map(): Error: {e.__class__.__name__} {e}")
             self.connection_healthy = False
 
-    def post_kill_event(self, kill_result: dict, endpoint: str) -> bool:
-        """Post the kill parsed from the log."""
+    def refresh_data_indexes(self, data_type:str) -> None:
+        """Rebuild the lookups derived from a data map and swap them in with a single assignment."""
+        if data_type == "ignoredVictimRules":
+            self.victim_matcher = VictimRuleMatcher(self.sc_data["ignoredVictimRules"])
+        elif data_type in self.data_indexes:
+            # A fresh index also drops the lookups remembered from the old data
+            self.data_indexes[data_type] = IdIndex(self.sc_data[data_type])
+
+    def post_kill_event(self, event, endpoint: str) -> bool:
+        """Post a kill event parsed from the log, or the wire payload of a pickled one."""
+        payload = event.to_wire() if hasattr(event, "to_wire") else event
         try:
             if not self.api_key["value"]:
                 self.log.error("Error: kill event will not be sent because the key does not exist. Please enter a valid Kill Tracker key to establish connection with Servitor...")
                 return
             
-            url = f"{self.api_fqdn}/{endpoint}"
-            headers = {
-                'content-type': 'application/json',
-                'Authorization': self.api_key["value"] if self.api_key["value"] else ""
-            }
-            self.log.debug(f"post_kill_event(): Request payload: {kill_result['data']}")
-            response = requests.post(
-                url, 
-                headers=headers, 
-                json=kill_result["data"], 
-                timeout=self.request_timeout
-            )
+            self.log.debug(f"post_kill_event(): Request payload: {payload}")
+            response = self.transport.post(endpoint, payload)
             self.log.debug(f"post_kill_event(): Response text: {response.text}")
             if response.status_code == 200:
-                self.connection_healthy = True
-                self.log.success(f'Kill of {kill_result["data"]["victim"]} by {kill_result["data"]["player"]} has been posted to Servitor!')
+                self.mark_connection_healthy()
+                self.log.success(f'Kill of {payload["victim"]} by {payload["player"]} has been posted to Servitor!')
                 return True
             else:
                 self.log.error(f"Error when posting kill: code {response.status_code}")
@@ -346,10 +366,93 @@ class API_Client():
         except Exception as e:
             self.log.error(f"post_kill_event(): Error: {e.__class__.__name__} {e}")
         # Failure state
-        self.log.error(f"Error: kill event {kill_result} will not be sent!")
+        self.log.error(f"Error: kill event {payload} will not be sent!")
         self.connection_healthy = False
-        pickle_payload = {"kill_result": kill_result, "endpoint": endpoint}
-        if pickle_payload not in self.cfg_handler.cfg_dict["pickle"]:
-            self.cfg_handler.cfg_dict["pickle"].append(pickle_payload)
+        if self.pickle_kill_event(payload, endpoint):
             self.log.warning(f'Connection seems to be unhealthy. Pickling kill.')
         return False
+
+    def get_batch_endpoints(self) -> set:
+        """Ask Servitor once which kill endpoints have a batch variant, a server without the capabilities endpoint has none."""
+        if self.batch_endpoints is not None:
+            return self.batch_endpoints
+        try:
+            response = self.transport.get("capabilities")
+            if response.status_code == 200:
+                self.batch_endpoints = set(response.json().get("batch", []))
+                self.log.debug(f"get_batch_endpoints(): Servitor takes batches for {self.batch_endpoints}.")
+            elif response.status_code in (404, 405):
+                self.batch_endpoints = set()
+            else:
+                # Ask again with the next batch
+                return set()
+        except requests.exceptions.RequestException as e:
+            self.log.debug(f"get_batch_endpoints(): HTTP Error: {e}")
+            return set()
+        except Exception as e:
+            self.log.error(f"get_batch_endpoints(): Error: {e.__class__.__name__} {e}")
+            self.batch_endpoints = set()
+        return self.batch_endpoints
+
+    def post_kill_events(self, events:list, endpoint: str) -> list:
+        """Post kill events in one request to the batch variant of the endpoint, or one by one if Servitor has none.
+
+        Returns the result of every event like post_kill_event does, failed events are pickled.
+        """
+        if len(events) == 1 or endpoint not in self.get_batch_endpoints():
+            return [self.post_kill_event(event, endpoint) for event in events]
+        payloads = [event.to_wire() if hasattr(event, "to_wire") else event for event in events]
+        try:
+            if not self.api_key["value"]:
+                self.log.error("Error: kill events will not be sent because the key does not exist. Please enter a valid Kill Tracker key to establish connection with Servitor...")
+                return [None] * len(payloads)
+            self.log.debug(f"post_kill_events(): Request payload: {payloads}")
+            response = self.transport.post(f"{endpoint}Batch", {"events": payloads})
+            self.log.debug(f"post_kill_events(): Response text: {response.text}")
+            if response.status_code == 200:
+                self.mark_connection_healthy()
+                results = response.json()["results"]
+                acked = []
+                for index, payload in enumerate(payloads):
+                    # A result missing from the response counts as a failed post
+                    result = results[index] if index < len(results) else {"ok": False, "error": "no result"}
+                    if result.get("ok"):
+                        self.log.success(f'Kill of {payload["victim"]} by {payload["player"]} has been posted to Servitor!')
+                        acked.append(True)
+                    else:
+                        self.log.error(f"Error when posting kill: {result.get('error')}")
+                        self.pickle_kill_event(payload, endpoint)
+                        acked.append(False)
+                return acked
+            elif response.status_code in (404, 405):
+                # Batch support was withdrawn, post them one by one from now on
+                self.log.warning(f"Servitor does not take batches for {endpoint} anymore.")
+                self.batch_endpoints = set()
+                return [self.post_kill_event(payload, endpoint) for payload in payloads]
+            else:
+                self.log.error(f"Error when posting kills: code {response.status_code}")
+        except requests.exceptions.RequestException as e:
+            self.gui.async_loading_animation()
+            self.log.error(f"HTTP Error sending kill events: {e}")
+        except Exception as e:
+            self.log.error(f"post_kill_events(): Error: {e.__class__.__name__} {e}")
+        # Failure state
+        self.log.error(f"Error: {len(payloads)} kill events will not be sent!")
+        self.connection_healthy = False
+        pickled = False
+        for payload in payloads:
+            if self.pickle_kill_event(payload, endpoint):
+                pickled = True
+        if pickled:
+            self.log.warning(f'Connection seems to be unhealthy. Pickling kills.')
+        return [False] * len(payloads)
+
+    def pickle_kill_event(self, event, endpoint: str) -> bool:
+        """Buffer a kill event for the log pickler to post later, return False if it is already buffered."""
+        payload = event.to_wire() if hasattr(event, "to_wire") else event
+        with self.cfg_handler.lock:
+            # Retried legacy entries carry the same payload in the old layout
+            if any(get_pickled_payload(entry) == payload for entry in self.cfg_handler.cfg_dict["pickle"]):
+                return False
+            self.cfg_handler.cfg_dict["pickle"].append({"payload": payload, "endpoint": endpoint})
+        return True
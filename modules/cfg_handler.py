@@ -1,8 +1,12 @@
 import base64
 import hashlib
 import json
-from time import sleep
+import os
 from pathlib import Path
+from threading import RLock
+
+# Import kill tracker modules
+from modules.log_events import get_pickled_payload
 
 class Cfg_Handler:
     """Config Handler with simple XOR encryption (built-in only)."""
@@ -10,7 +14,10 @@ class Cfg_Handler:
     def __init__(self, program_state, rsi_handle=None):
         self.log = None
         self.api = None
+        self.scheduler = None
         self.program_state = program_state
+        # Held while the config is changed or written, the pickle buffer is shared by several threads
+        self.lock = RLock()
         self.old_cfg_path = Path.cwd() / "killtracker_key.cfg"
         self.cfg_path = Path.cwd() / "bv_killtracker.cfg"
         self.cfg_dict = {"key": "", "volume": {"level": 0.5, "is_muted": False}, "pickle": []}
@@ -59,11 +66,15 @@ class Cfg_Handler:
     def save_cfg(self, data_type: str, data) -> None:
         """Encrypt and save the configuration with XOR and base64."""
         try:
-            self.cfg_dict[data_type] = data
-            cfg_json = json.dumps(self.cfg_dict)
-            encrypted_data = base64.b64encode(self._xor_encrypt(cfg_json.encode('utf-8')))
-            with open(str(self.cfg_path), "wb") as f:
-                f.write(encrypted_data)
+            with self.lock:
+                self.cfg_dict[data_type] = data
+                cfg_json = json.dumps(self.cfg_dict)
+                encrypted_data = base64.b64encode(self._xor_encrypt(cfg_json.encode('utf-8')))
+                # Replace the config in one step so a crash never leaves a torn key and buffer
+                temp_path = self.cfg_path.with_name(self.cfg_path.name + ".tmp")
+                with open(str(temp_path), "wb") as f:
+                    f.write(encrypted_data)
+                os.replace(temp_path, self.cfg_path)
             if self.log:
                 self.log.debug(f"Successfully saved encrypted config to {str(self.cfg_path)}.")
         except Exception as e:
@@ -73,30 +84,27 @@ class Cfg_Handler:
                 print(f"Was not able to save the config to {str(self.cfg_path)} - {e}.")
 
     def log_pickler(self) -> None:
-        """Pickle and unpickle kill logs."""
-        while self.program_state["enabled"]:
-            try:
-                if len(self.cfg_dict["pickle"]) > 0:
-                    if self.log:
-                        self.log.debug(f'Current buffer: {self.cfg_dict["pickle"]}.')
-                    self.save_cfg("pickle", self.cfg_dict["pickle"])
-                    if self.api and getattr(self.api, "connection_healthy", False):
-                        pickle_payload = self.cfg_dict["pickle"][0]
-                        if self.log:
-                            self.log.info(f'Attempting to post a previous kill from the buffer: {pickle_payload["kill_result"]}')
-                        uploaded = self.api.post_kill_event(pickle_payload["kill_result"], pickle_payload["endpoint"])
-                        if uploaded:
-                            self.cfg_dict["pickle"].pop(0)
-                            self.save_cfg("pickle", self.cfg_dict["pickle"])
-            except Exception as e:
+        """Pickle and unpickle kill logs, run every 60 seconds by the scheduler and woken up when Servitor is reachable again."""
+        try:
+            if len(self.cfg_dict["pickle"]) > 0:
                 if self.log:
-                    self.log.error(f"log_pickler(): Error: {e.__class__.__name__} {e}")
-                else:
-                    print(f"log_pickler(): Error: {e.__class__.__name__} {e}")
-            for sec in range(60):
-                if not self.program_state["enabled"]:
+                    self.log.debug(f'Current buffer: {self.cfg_dict["pickle"]}.')
+                self.save_cfg("pickle", self.cfg_dict["pickle"])
+                if self.api and getattr(self.api, "connection_healthy", False):
+                    pickle_payload = self.cfg_dict["pickle"][0]
+                    kill_payload = get_pickled_payload(pickle_payload)
                     if self.log:
-                        self.log.info("Executing final config save.")
-                    self.save_cfg("pickle", self.cfg_dict["pickle"])
-                    break
-                sleep(1)
+                        self.log.info(f'Attempting to post a previous kill from the buffer: {kill_payload}')
+                    uploaded = self.api.post_kill_event(kill_payload, pickle_payload["endpoint"])
+                    if uploaded:
+                        with self.lock:
+                            self.cfg_dict["pickle"].remove(pickle_payload)
+                            self.save_cfg("pickle", self.cfg_dict["pickle"])
+                        if self.cfg_dict["pickle"] and self.scheduler:
+                            # Drain the rest of the buffer while the connection holds
+                            self.scheduler.wake("log_pickler")
+        except Exception as e:
+            if self.log:
+                self.log.error(f"log_pickler(): Error: {e.__class__.__name__} {e}")
+            else:
+                print(f"log_pickler(): Error: {e.__class__.__name__} {e}")
@@ -1,7 +1,6 @@
 from typing import Union
 
 import requests
-from time import sleep
 
 class CM_API_Client():
     """Commander Mode API module for the Kill Tracker."""
@@ -16,7 +15,7 @@ class CM_API_Client():
                 self.log.debug("Error: Heartbeat is not active. Death event will not be sent.")
                 return
 
-            url = f"{self.api_fqdn}/validateKey" # API endpoint is setup to receive heartbeats
+            # API endpoint is setup to receive heartbeats
             status = "alive" if self.active_ship["current"] != "N/A" else "dead"
             heartbeat_event = {
                 'is_heartbeat': True,
@@ -37,17 +36,8 @@ class CM_API_Client():
                 heartbeat_event['zone'] = player_ship
                 heartbeat_event['status'] = "alive"
             # If it's not either of the above if/else statements, its probably a flag update!
-            headers = {
-                'content-type': 'application/json',
-                'Authorization': self.api_key["value"] if self.api_key["value"] else ""
-            }
             self.log.debug(f"post_heartbeat_event(): Request payload: {heartbeat_event}")
-            response = requests.post(
-                url,
-                headers=headers,
-                json=heartbeat_event,
-                timeout=self.request_timeout
-            )
+            response = self.transport.post("validateKey", heartbeat_event, "heartbeat")
             self.log.debug(f"post_heartbeat_event(): Response text: {response.text}")
             if response.status_code != 200:
                 self.log.error(f"Error in posting event: code {response.status_code}")
@@ -59,52 +49,41 @@ class CM_API_Client():
             self.log.error(f"post_heartbeat_event(): Error: {e.__class__.__name__} {e}")
 
     def post_heartbeat(self) -> None:
-        """Sends a heartbeat to the server every interval and updates the UI with active commanders."""        
-        while self.heartbeat_status["active"]:
-            try:
-                sleep(self.heartbeat_interval)
-                if not self.api_key["value"]:
-                    self.log.warning("Error: heartbeat will not be sent because the key does not exist.")
-                    # Call disconnect commander and exit
-                    self.toggle_commander()
-                    break
-                
-                url = f"{self.api_fqdn}/validateKey"
-                # Determine status based on the active ship
-                status = "alive" if self.active_ship["current"] != "N/A" else "dead"
-                heartbeart_base = {
-                    'is_heartbeat': True,
-                    'player': self.rsi_handle["current"],
-                    'zone': self.active_ship["current"],
-                    'client_ver': "7.0",
-                    'status': status,
-                    'mode': "commander",
-                    'is_commander': self.is_commander,
-                }
-                if self.is_commander is True:
-                    heartbeart_base['alloc_users'] = self.alloc_users if self.alloc_users else None
-                headers = {
-                    'content-type': 'application/json',
-                    'Authorization': self.api_key["value"] if self.api_key["value"] else ""
-                }
-                #self.log.debug(f"post_heartbeat(): Request payload: {heartbeart_base}")
-                response = requests.post(
-                    url, 
-                    headers=headers, 
-                    json=heartbeart_base, 
-                    timeout=self.request_timeout
-                )
-                self.log.debug(f"post_heartbeat(): Response text: {response.text}")
-                response.raise_for_status()  # Raises an exception for HTTP errors
-                response_data = response.json()
-                # Update the UI with active commanders if the response contains the key
-                if 'commanders' in response_data:
-                    active_commanders = response_data['commanders']
-                    # Put the updated commanders list in the queue for the GUI thread to process
-                    self.update_queue.put(active_commanders)
-                else:
-                    self.log.debug("No commanders found in response.")
-            except requests.RequestException as e:
-                self.log.error(f"HTTP Error when sending heartbeat: {e}")
-            except Exception as e:
-                self.log.error(f"post_heartbeat(): Error: {e.__class__.__name__} {e}")
+        """Sends a heartbeat to the server and updates the UI with active commanders, run every interval by the scheduler."""
+        try:
+            if not self.api_key["value"]:
+                self.log.warning("Error: heartbeat will not be sent because the key does not exist.")
+                # Call disconnect commander and exit
+                self.toggle_commander()
+                return
+
+            # Determine status based on the active ship
+            status = "alive" if self.active_ship["current"] != "N/A" else "dead"
+            heartbeart_base = {
+                'is_heartbeat': True,
+                'player': self.rsi_handle["current"],
+                'zone': self.active_ship["current"],
+                'client_ver': "7.0",
+                'status': status,
+                'mode': "commander",
+                'is_commander': self.is_commander,
+            }
+            if self.is_commander is True:
+                heartbeart_base['alloc_users'] = self.alloc_users if self.alloc_users else None
+            #self.log.debug(f"post_heartbeat(): Request payload: {heartbeart_base}")
+            # Reuses the keep-alive connection instead of reconnecting every interval
+            response = self.transport.post("validateKey", heartbeart_base, "heartbeat")
+            self.log.debug(f"post_heartbeat(): Response text: {response.text}")
+            response.raise_for_status()  # Raises an exception for HTTP errors
+            response_data = response.json()
+            # Update the UI with active commanders if the response contains the key
+            if 'commanders' in response_data:
+                active_commanders = response_data['commanders']
+                # Put the updated commanders list in the queue for the GUI thread to process
+                self.update_queue.put(active_commanders)
+            else:
+                self.log.debug("No commanders found in response.")
+        except requests.RequestException as e:
+            self.log.error(f"HTTP Error when sending heartbeat: {e}")
+        except Exception as e:
+            self.log.error(f"post_heartbeat(): Error: {e.__class__.__name__} {e}")
@@ -1,5 +1,3 @@
-from threading import Thread
-from time import sleep
 # Inherit sub-modules
 from modules.commander_mode.cm_api import CM_API_Client
 from modules.commander_mode.cm_gui import CM_GUI
@@ -12,11 +10,14 @@ class CM_Core(CM_API_Client, CM_GUI):
         self.api_key = api_module.api_key
         self.api_fqdn = api_module.api_fqdn
         self.request_timeout = api_module.request_timeout
+        self.transport = api_module.transport
         self.monitoring = monitoring
         self.heartbeat_status = heartbeat_status
         self.rsi_handle = rsi_handle
         self.active_ship = active_ship
         self.update_queue = update_queue
+        self.scheduler = None
+        # Scheduled tasks while connected to commander
         self.heartbeat_daemon = None
         self.cm_update_daemon = None
         self.commander_window = None
@@ -149,47 +150,43 @@ class CM_Core(CM_API_Client, CM_GUI):
     def check_for_cm_updates(self) -> None:
         """
         Checks the update_queue for new commander data and refreshes the user list.
-        This method should be called periodically from the Tkinter main loop.
+        This method is run every second by the scheduler while connected to commander.
         """
-        while self.heartbeat_status["active"]:
-            try:
-                if not self.update_queue.empty():
-                    active_commanders = self.update_queue.get()
-                    #self.log.debug(f"check_for_cm_updates(): Received active commanders payload: {active_commanders}")
-                    self.refresh_user_list(active_commanders)
-                sleep(1)
-            except Exception as e:
-                self.log.error(f"check_for_cm_updates(): Error: {e.__class__.__name__} - {e}")
+        try:
+            if not self.update_queue.empty():
+                active_commanders = self.update_queue.get()
+                #self.log.debug(f"check_for_cm_updates(): Received active commanders payload: {active_commanders}")
+                self.refresh_user_list(active_commanders)
+        except Exception as e:
+            self.log.error(f"check_for_cm_updates(): Error: {e.__class__.__name__} - {e}")
 
     def start_heartbeat_threads(self) -> None:
-        """Start the heartbeat threads."""
+        """Schedule the heartbeat and commander update tasks."""
         try:
             if not self.heartbeat_daemon and not self.cm_update_daemon:
                 self.log.info("Connecting to Commander...")
-                self.heartbeat_daemon = Thread(target=self.post_heartbeat, daemon=True)
-                self.heartbeat_daemon.start()
-                self.log.debug(f"start_heartbeat_threads(): Started heartbeat thread.")
-                self.cm_update_daemon = Thread(target=self.check_for_cm_updates, daemon=True)
-                self.cm_update_daemon.start()
-                self.log.debug(f"start_heartbeat_threads(): Started CM update thread.")
+                self.heartbeat_daemon = self.scheduler.every("cm_heartbeat", self.post_heartbeat, self.heartbeat_interval, jitter=0.5, blocking=True)
+                self.log.debug(f"start_heartbeat_threads(): Started heartbeat task.")
+                self.cm_update_daemon = self.scheduler.every("cm_updates", self.check_for_cm_updates, 1, blocking=True)
+                self.log.debug(f"start_heartbeat_threads(): Started CM update task.")
             else:
                 raise Exception("Already connected to commander!")
         except Exception as e:
             self.log.error(f"Error(): {e}")
 
     def stop_heartbeat_threads(self) -> None:
-        """Stop the heartbeat thread."""
+        """Cancel the heartbeat and commander update tasks."""
         try:
-            if (isinstance(self.heartbeat_daemon, Thread) and self.heartbeat_daemon.is_alive() and 
-                isinstance(self.cm_update_daemon, Thread) and self.cm_update_daemon.is_alive()
-            ):
+            if self.heartbeat_daemon and self.cm_update_daemon:
                 self.log.info("Commander is shutting down...")
                 self.heartbeat_status["active"] = False
                 self.clear_listboxes()
+                self.scheduler.cancel("cm_heartbeat")
                 self.heartbeat_daemon = None
-                self.log.debug(f"stop_heartbeat_threads(): Stopped heartbeat thread.")
+                self.log.debug(f"stop_heartbeat_threads(): Stopped heartbeat task.")
+                self.scheduler.cancel("cm_updates")
                 self.cm_update_daemon = None
-                self.log.debug(f"stop_heartbeat_threads(): Stopped CM update thread.")
+                self.log.debug(f"stop_heartbeat_threads(): Stopped CM update task.")
                 
             else:
                 self.log.debug("stop_heartbeat_threads(): Commander Mode is not connected.")
@@ -0,0 +1,63 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+
+class DataMapCache():
+    """SC data maps saved next to the config with the ETag Servitor sent them with."""
+    def __init__(self, cache_path:Path=None):
+        self.log = None
+        # Kept apart from the encrypted config, which is rewritten far more often
+        self.cache_path = cache_path if cache_path else Path.cwd() / "bv_killtracker_data.json"
+        self.entries = {}
+        self.loaded = False
+
+    def load(self) -> dict:
+        """Read the cached data maps, {data_type: {"etag": ..., "data": [...]}}, empty if there is no usable cache."""
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as cache_file:
+                entries = json.load(cache_file)
+            self.entries = {
+                data_type: entry for data_type, entry in entries.items()
+                if isinstance(entry, dict) and isinstance(entry.get("data"), list)
+            }
+        except FileNotFoundError:
+            self.entries = {}
+        except Exception as e:
+            # A broken cache is pulled again from Servitor
+            if self.log:
+                self.log.warning(f"Ignoring the data map cache {self.cache_path}: {e.__class__.__name__} {e}")
+            self.entries = {}
+        self.loaded = True
+        return self.entries
+
+    def get_etag(self, data_type:str) -> str:
+        """Get the ETag of the cached data map, None if it is not cached."""
+        return self.entries.get(data_type, {}).get("etag")
+
+    def save(self, data_type:str, data:list, etag:str=None) -> None:
+        """Cache a data map next to the others, the file is replaced in one step so a crash never leaves half of it."""
+        if not self.loaded:
+            # The other data maps in the file are kept
+            self.load()
+        self.entries[data_type] = {"etag": etag, "data": data}
+        temp_path = self.cache_path.with_name(self.cache_path.name + ".tmp")
+        try:
+            with open(temp_path, "w", encoding="utf-8") as cache_file:
+                json.dump(self.entries, cache_file)
+            os.replace(temp_path, self.cache_path)
+        except Exception as e:
+            if self.log:
+                self.log.error(f"DataMapCache.save(): Error: {e.__class__.__name__} {e}")
+
+def get_content_hash(content) -> str:
+    """Get the hash of the canonical JSON of a data map or entry, key order does not matter but list order does."""
+    return hashlib.sha1(json.dumps(content, sort_keys=True, separators=(",", ":")).encode("utf-8")).hexdigest()
+
+def diff_data_maps(old_entries:list, new_entries:list) -> tuple:
+    """Get the entries added and removed between two data maps, compared by entry hash."""
+    old_hashes = {get_content_hash(entry): entry for entry in old_entries}
+    new_hashes = {get_content_hash(entry): entry for entry in new_entries}
+    added = [new_hashes[entry_hash] for entry_hash in new_hashes.keys() - old_hashes.keys()]
+    removed = [old_hashes[entry_hash] for entry_hash in old_hashes.keys() - new_hashes.keys()]
+    return added, removed
@@ -0,0 +1,161 @@
+from collections import deque
+from threading import Thread, Condition
+from time import monotonic
+
+class EventConsumer():
+    """A consumer of the event bus with its own bounded queue and worker thread."""
+    OVERFLOW_POLICIES = ("drop_oldest", "drop_newest", "spill")
+
+    def __init__(self, name:str, handler, maxsize:int, overflow:str="drop_oldest", spill=None, batch_size:int=1, batch_window:float=0.0):
+        if overflow not in self.OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy {overflow} for consumer {name}.")
+        if overflow == "spill" and spill is None:
+            raise ValueError(f"Consumer {name} spills on overflow but has no spill handler.")
+        self.log = None
+        self.name = name
+        self.handler = handler
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self.spill = spill
+        # Handlers of batching consumers get a list of up to batch_size events, collected for at most batch_window seconds
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+        # Pending (queued_at, event) pairs
+        self.queue = deque()
+        self.condition = Condition()
+        self.running = False
+        self.thread = None
+        self.metrics = {
+            "published": 0, "processed": 0, "failed": 0, "dropped": 0, "spilled": 0,
+            "max_depth": 0, "last_lag": 0.0, "max_lag": 0.0
+        }
+
+    def start(self) -> None:
+        """Start the worker thread if it's not already running."""
+        with self.condition:
+            if self.running:
+                return
+            self.running = True
+        self.thread = Thread(target=self.run, name=f"event-{self.name}", daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        """Let the worker finish the queued events and exit."""
+        with self.condition:
+            self.running = False
+            self.condition.notify()
+
+    def offer(self, event) -> None:
+        """Queue the event, or handle it right away while the worker isn't running."""
+        if not self.running:
+            self.metrics["published"] += 1
+            self.deliver([event] if self.batch_size > 1 else event, 0.0)
+            return
+        overflowed = None
+        with self.condition:
+            self.metrics["published"] += 1
+            if len(self.queue) >= self.maxsize:
+                if self.overflow == "drop_oldest":
+                    self.queue.popleft()
+                    self.metrics["dropped"] += 1
+                elif self.overflow == "drop_newest":
+                    self.metrics["dropped"] += 1
+                    return
+                else:
+                    self.metrics["spilled"] += 1
+                    overflowed = event
+            if overflowed is None:
+                self.queue.append((monotonic(), event))
+                self.metrics["max_depth"] = max(self.metrics["max_depth"], len(self.queue))
+                self.condition.notify()
+        if overflowed is not None:
+            # Spill outside the lock, the handler may do I/O
+            self.call(self.spill, overflowed)
+
+    def run(self) -> None:
+        """Handle queued events until stopped and drained."""
+        while True:
+            with self.condition:
+                while self.running and not self.queue:
+                    self.condition.wait()
+                if not self.queue:
+                    return
+                if self.batch_size == 1:
+                    queued_at, event = self.queue.popleft()
+                else:
+                    # Give the rest of a burst a moment to arrive, a lone event is delivered right away
+                    deadline = monotonic() + self.batch_window
+                    while self.running and 1 < len(self.queue) < self.batch_size:
+                        remaining = deadline - monotonic()
+                        if remaining <= 0:
+                            break
+                        self.condition.wait(remaining)
+                    batch = [self.queue.popleft() for _ in range(min(len(self.queue), self.batch_size))]
+                    queued_at = batch[0][0]
+                    event = [batched_event for _, batched_event in batch]
+            self.deliver(event, monotonic() - queued_at)
+
+    def deliver(self, event, lag:float) -> None:
+        """Run the handler for one event or batch and record how long it waited in the queue."""
+        count = len(event) if self.batch_size > 1 else 1
+        self.metrics["last_lag"] = lag
+        self.metrics["max_lag"] = max(self.metrics["max_lag"], lag)
+        if self.call(self.handler, event):
+            self.metrics["processed"] += count
+        else:
+            self.metrics["failed"] += count
+
+    def call(self, handler, event) -> bool:
+        """Call a handler without letting its errors escape into the bus."""
+        try:
+            handler(event)
+            return True
+        except Exception as e:
+            if self.log:
+                self.log.error(f"EventConsumer {self.name}: Error: {e.__class__.__name__} {e}")
+            return False
+
+    def get_metrics(self) -> dict:
+        """Get the queue depth, the age of the oldest queued event and the counters."""
+        with self.condition:
+            depth = len(self.queue)
+            oldest = monotonic() - self.queue[0][0] if self.queue else 0.0
+            return dict(self.metrics, depth=depth, lag=oldest, maxsize=self.maxsize, overflow=self.overflow)
+
+class EventBus():
+    """Routes typed events from the log parser to consumers, each draining its own bounded queue."""
+    def __init__(self):
+        self.log = None
+        self.consumers = {}
+        self.routes = {}
+
+    def subscribe(
+        self, name:str, handler, event_types:tuple, maxsize:int=64, overflow:str="drop_oldest", spill=None, batch_size:int=1, batch_window:float=0.0
+    ) -> EventConsumer:
+        """Add a consumer for the given event types."""
+        consumer = EventConsumer(name, handler, maxsize, overflow, spill, batch_size, batch_window)
+        consumer.log = self.log
+        self.consumers[name] = consumer
+        for event_type in event_types:
+            self.routes.setdefault(event_type, []).append(consumer)
+        return consumer
+
+    def publish(self, event) -> None:
+        """Hand the event to every consumer of its type, never blocking the caller on a consumer."""
+        for consumer in self.routes.get(type(event), ()):
+            consumer.offer(event)
+
+    def start(self) -> None:
+        """Start the consumer threads, events are handled inline by the publisher until then."""
+        for consumer in self.consumers.values():
+            consumer.log = self.log
+            consumer.start()
+
+    def stop(self) -> None:
+        """Stop the consumer threads once their queues are drained."""
+        for consumer in self.consumers.values():
+            consumer.stop()
+
+    def get_metrics(self) -> dict:
+        """Get the queue depth and lag metrics of every consumer."""
+        return {name: consumer.get_metrics() for name, consumer in self.consumers.items()}
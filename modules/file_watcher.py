@@ -0,0 +1,129 @@
+import ctypes
+import ctypes.util
+import select
+import struct
+import sys
+from abc import ABC, abstractmethod
+from os import path, read, close, stat, O_NONBLOCK, O_CLOEXEC
+from time import sleep, monotonic
+
+class FileWatcher(ABC):
+    """Interface of the Game.log watchers, blocks the tailer until the file may have changed."""
+    name = "none"
+
+    def __init__(self, file_location:str):
+        self.file_location = file_location
+
+    @abstractmethod
+    def wait(self, timeout:float) -> bool:
+        """Block until the file changes or the timeout passes, return True if a change was seen."""
+
+    def close(self) -> None:
+        """Release the resources held by the watcher."""
+        pass
+
+class PollingWatcher(FileWatcher):
+    """Stats the file, polling fast while it is growing and backing off while it is idle."""
+    name = "polling"
+
+    def __init__(self, file_location:str, min_interval:float=0.05, max_interval:float=1.0, backoff:float=1.5):
+        super().__init__(file_location)
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.interval = min_interval
+        self.last_signature = self.get_signature()
+
+    def get_signature(self) -> tuple:
+        """Get the size and modification time of the file, None if it can't be read."""
+        try:
+            st = stat(self.file_location)
+            return (st.st_size, st.st_mtime_ns)
+        except OSError:
+            return None
+
+    def wait(self, timeout:float) -> bool:
+        """Poll the file until it changes or the timeout passes, return True if a change was seen."""
+        deadline = monotonic() + timeout
+        while True:
+            signature = self.get_signature()
+            if signature != self.last_signature:
+                self.last_signature = signature
+                # The file is active again, poll at full speed
+                self.interval = self.min_interval
+                return True
+            remaining = deadline - monotonic()
+            if remaining <= 0:
+                return False
+            sleep(min(self.interval, remaining))
+            self.interval = min(self.interval * self.backoff, self.max_interval)
+
+class InotifyWatcher(FileWatcher):
+    """Blocks on Linux inotify events for the file, wakes up as soon as the game writes to it."""
+    name = "inotify"
+    IN_MODIFY = 0x00000002
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    EVENT_HEADER = struct.Struct("iIII")
+
+    def __init__(self, file_location:str):
+        super().__init__(file_location)
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.fd = libc.inotify_init1(O_NONBLOCK | O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        # Watch the directory so a recreated Game.log is still seen
+        directory, self.file_name = path.split(path.abspath(file_location))
+        mask = self.IN_MODIFY | self.IN_CLOSE_WRITE | self.IN_MOVED_TO | self.IN_CREATE
+        if libc.inotify_add_watch(self.fd, directory.encode(), mask) < 0:
+            errno = ctypes.get_errno()
+            close(self.fd)
+            raise OSError(errno, f"inotify_add_watch failed for {directory}")
+        self.file_name = self.file_name.encode()
+
+    def wait(self, timeout:float) -> bool:
+        """Block on inotify until the file changes or the timeout passes, return True if a change was seen."""
+        deadline = monotonic() + timeout
+        while True:
+            remaining = deadline - monotonic()
+            if remaining <= 0:
+                return False
+            ready, _, _ = select.select([self.fd], [], [], remaining)
+            if not ready:
+                return False
+            if self.read_events():
+                return True
+
+    def read_events(self) -> bool:
+        """Drain the pending events, return True if any of them is about the watched file."""
+        try:
+            buffer = read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return False
+        matched = False
+        pos = 0
+        while pos + self.EVENT_HEADER.size <= len(buffer):
+            _, _, _, name_len = self.EVENT_HEADER.unpack_from(buffer, pos)
+            pos += self.EVENT_HEADER.size
+            if buffer[pos:pos + name_len].rstrip(b"\0") == self.file_name:
+                matched = True
+            pos += name_len
+        return matched
+
+    def close(self) -> None:
+        """Close the inotify descriptor."""
+        try:
+            close(self.fd)
+        except OSError:
+            pass
+
+def create_file_watcher(file_location:str, backend:str="auto") -> FileWatcher:
+    """Create the best watcher available on this platform, falling back to polling."""
+    if backend in ("auto", "inotify") and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(file_location)
+        except (OSError, AttributeError):
+            # No usable inotify, fall back to polling
+            pass
+    return PollingWatcher(file_location)
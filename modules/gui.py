@@ -1,7 +1,5 @@
 import tkinter as tk
 from tkinter import scrolledtext
-from threading import Thread
-from time import sleep
 from datetime import datetime
 from os import path
 
@@ -65,6 +63,7 @@ class GUI():
         self.sounds = None
         self.api = None
         self.cm = None
+        self.scheduler = None
         self.key_entry = None
         self.api_status_label = None
         self.curr_killstreak_label = None
@@ -127,16 +126,15 @@ class GUI():
             self.sounds.set_volume(volume)
 
     def async_loading_animation(self) -> None:
-        def animate():
+        def animate(dots:str):
             try:
-                for dots in [".", "..", "..."]:
-                    self.log.info(dots)
-                    self.app.update_idletasks()
-                    sleep(0.2)
+                self.log.info(dots)
+                self.app.update_idletasks()
             except Exception as e:
                 self.log.error(f"animate(): Error: {e.__class__.__name__} {e}")
-                return
-        Thread(target=animate, daemon=True).start()
+        # One timer per frame, 0.2 s apart
+        for frame, dots in enumerate([".", "..", "..."]):
+            self.scheduler.after(f"loading_animation_{frame}", frame * 0.2, lambda dots=dots: animate(dots))
     
     def create_label(
             self, window=None, text:str=None, font:str=None, command=None, bg:str=None, fg:str=None, wraplength:int=None, justify:str=None, cursor:str=None) -> tk.Label:
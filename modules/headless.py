@@ -0,0 +1,113 @@
+import sys
+
+# Import kill tracker modules
+from modules.log_parser import LogParser
+from modules.log_matcher import VictimRuleMatcher, IdIndex
+
+class HeadlessLogger():
+    """Counts log messages per level, printing them to stderr only when verbose."""
+    def __init__(self, verbose:bool=False):
+        self.verbose = verbose
+        self.counts = {"debug": 0, "info": 0, "warning": 0, "error": 0, "success": 0}
+
+    def write(self, level:str, message:str) -> None:
+        self.counts[level] += 1
+        if self.verbose:
+            print(f"{level.upper()} {message}", file=sys.stderr)
+
+    def debug(self, message:str) -> None:
+        self.write("debug", message)
+
+    def info(self, message:str) -> None:
+        self.write("info", message)
+
+    def warning(self, message:str) -> None:
+        self.write("warning", message)
+
+    def error(self, message:str) -> None:
+        self.write("error", message)
+
+    def success(self, message:str) -> None:
+        self.write("success", message)
+
+class HeadlessLabel():
+    """Stands in for a Tk label and keeps its last configuration."""
+    def __init__(self):
+        self.options = {}
+
+    def config(self, **options) -> None:
+        self.options.update(options)
+
+class HeadlessGUI():
+    """Records what the parser would have shown in the GUI."""
+    def __init__(self):
+        self.vehicle_status = []
+
+    def __getattr__(self, name:str):
+        # Labels are created on first use, like the GUI does in setup_gui()
+        if name.endswith("_label"):
+            label = HeadlessLabel()
+            setattr(self, name, label)
+            return label
+        raise AttributeError(name)
+
+    def update_vehicle_status(self, status_text:str) -> None:
+        self.vehicle_status.append(status_text)
+
+    def async_loading_animation(self) -> None:
+        pass
+
+class HeadlessSounds():
+    """Counts the sounds the parser would have played."""
+    def __init__(self):
+        self.played = 0
+
+    def play_random_sound(self) -> None:
+        self.played += 1
+
+class HeadlessAPI():
+    """Records the kills the parser would have posted, with optional data maps for weapon names and ignored victims."""
+    def __init__(self, data_map:dict=None):
+        self.api_key = {"value": "headless"}
+        self.connection_healthy = True
+        self.sc_data = {"weapons": [], "ships": [], "ignoredVictimRules": []}
+        self.victim_matcher = VictimRuleMatcher()
+        self.data_indexes = {"weapons": IdIndex(), "ships": IdIndex()}
+        self.posts = []
+        for data_type, entries in (data_map if data_map else {}).items():
+            self.sc_data[data_type] = entries
+            self.refresh_data_indexes(data_type)
+
+    def refresh_data_indexes(self, data_type:str) -> None:
+        """Rebuild the lookups derived from a data map, like API_Client does."""
+        if data_type == "ignoredVictimRules":
+            self.victim_matcher = VictimRuleMatcher(self.sc_data["ignoredVictimRules"])
+        elif data_type in self.data_indexes:
+            self.data_indexes[data_type] = IdIndex(self.sc_data[data_type])
+
+    def post_kill_event(self, event, endpoint:str) -> bool:
+        self.posts.append((endpoint, event.to_wire() if hasattr(event, "to_wire") else event))
+        return True
+
+    def post_kill_events(self, events:list, endpoint:str) -> list:
+        return [self.post_kill_event(event, endpoint) for event in events]
+
+    def pickle_kill_event(self, event, endpoint:str) -> bool:
+        return self.post_kill_event(event, endpoint)
+
+class HeadlessCM():
+    """Records the commander mode heartbeats the parser would have sent."""
+    def __init__(self):
+        self.heartbeats = []
+
+    def post_heartbeat_event(self, target_name, killed_zone, player_ship) -> None:
+        self.heartbeats.append((target_name, killed_zone, player_ship))
+
+def create_headless_parser(data_map:dict=None, verbose:bool=False) -> LogParser:
+    """Create a LogParser wired to recording stubs instead of Tk, pygame and Servitor."""
+    parser = LogParser(
+        HeadlessGUI(), HeadlessAPI(data_map), HeadlessSounds(), HeadlessCM(), "headless",
+        {"active": True}, {"current": "N/A"}, {"current": "N/A"}, {"current": "FPS"}, {"enabled": False}
+    )
+    parser.log = HeadlessLogger(verbose)
+    return parser
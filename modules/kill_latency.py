@@ -0,0 +1,65 @@
+import json
+from collections import Counter, deque
+from threading import Lock
+
+# Timestamps a reported kill collects on its way from Game.log to Servitor, in order
+STAGES = ("written", "read", "parsed", "enqueued", "sent", "acked", "pickled")
+
+class KillLatencyTracker():
+    """Keeps the stage timestamps of the latest kills and reports rolling percentiles of the time spent before each stage."""
+    def __init__(self, window:int=200):
+        self.kills = deque(maxlen=window)
+        self.outcomes = Counter()
+        # Kills are recorded by the upload consumer and reported from other threads
+        self.lock = Lock()
+
+    def record(self, stages:dict) -> None:
+        """Add a kill that was acknowledged or pickled, durations are taken between consecutive stages it reached."""
+        durations = {}
+        previous = None
+        for stage in STAGES:
+            if stage not in stages:
+                continue
+            if previous is not None:
+                durations[stage] = max(stages[stage] - previous, 0.0)
+            previous = stages[stage]
+        if "written" in stages:
+            durations["total"] = max(previous - stages["written"], 0.0)
+        with self.lock:
+            self.kills.append(durations)
+            self.outcomes["acked" if "acked" in stages else "pickled"] += 1
+
+    def report(self) -> dict:
+        """Get p50, p95 and p99 in seconds of every stage over the kills in the window."""
+        with self.lock:
+            kills = list(self.kills)
+            outcomes = dict(self.outcomes)
+        stages = {}
+        for stage in STAGES[1:] + ("total",):
+            durations = sorted(kill[stage] for kill in kills if stage in kill)
+            if durations:
+                stages[stage] = {
+                    "count": len(durations),
+                    "p50": get_percentile(durations, 0.5),
+                    "p95": get_percentile(durations, 0.95),
+                    "p99": get_percentile(durations, 0.99),
+                    "max": durations[-1],
+                }
+        return {"kills": len(kills), "window": self.kills.maxlen, "outcomes": outcomes, "stages": stages}
+
+    def format_report(self) -> str:
+        report = self.report()
+        stages = ", ".join(
+            f"{stage} p50={timing['p50'] * 1000:.0f}ms p95={timing['p95'] * 1000:.0f}ms p99={timing['p99'] * 1000:.0f}ms"
+            for stage, timing in report["stages"].items()
+        )
+        return f"Kill latency over {report['kills']} kills {report['outcomes']}: {stages}"
+
+    def export(self, file_location:str) -> None:
+        """Write the report as JSON."""
+        with open(file_location, "w", encoding="utf-8") as report_file:
+            json.dump(self.report(), report_file, indent=2)
+
+def get_percentile(durations:list, fraction:float) -> float:
+    """Get the nearest-rank percentile of sorted durations."""
+    return durations[min(int(fraction * len(durations)), len(durations) - 1)]
@@ -0,0 +1,161 @@
+import os
+from dataclasses import dataclass
+
+# Import kill tracker modules
+from modules.log_matcher import (
+    EventMatcher, BOOTSTRAP_TOKENS, BOOTSTRAP_ANCHORS, BOOTSTRAP_PRIORITY, LOGIN_TOKEN, CHARACTER_TOKEN, STATE_TOKENS,
+    is_vehicle_enter, is_vehicle_exit, parse_ship_info, parse_game_mode, parse_rsi_handle, parse_player_geid
+)
+from modules.log_reader import iter_line_batches, iter_candidate_batches, iter_lines_reversed, find_last_line_end
+
+@dataclass
+class SessionBootstrap():
+    """Session identity and state recovered from Game.log before tailing starts."""
+    rsi_handle: str = "N/A"
+    player_geid: str = "N/A"
+    game_mode: str = "Nothing"
+    active_ship: str = "FPS"
+    active_ship_id: str = "N/A"
+    resume_offset: int = 0
+
+class SessionScanner():
+    """Recovers the session identity and state from Game.log."""
+    def __init__(self, encoding:str="utf-8", errors:str="replace", chunk_size:int=1024 * 1024):
+        self.encoding = encoding
+        self.errors = errors
+        self.chunk_size = chunk_size
+        self.event_matcher = EventMatcher(BOOTSTRAP_TOKENS, BOOTSTRAP_ANCHORS, BOOTSTRAP_PRIORITY)
+        self.state_anchors = tuple(token.encode(encoding) for token in STATE_TOKENS)
+        self.line_anchors = tuple(anchor.encode(encoding) for anchor in self.event_matcher.anchors)
+        self.identity_anchors = (LOGIN_TOKEN.encode(encoding), CHARACTER_TOKEN.encode(encoding))
+        # Logs bigger than this are prefiltered in parallel by worker processes
+        self.parallel_threshold = 128 * 1024 * 1024
+        self.workers = os.cpu_count()
+
+    def scan(self, log_file_location:str) -> SessionBootstrap:
+        """Read the log once from the start and collect everything the parser starts from."""
+        bootstrap = SessionBootstrap()
+        classify = self.event_matcher.classify
+        with open(log_file_location, "rb") as sc_log:
+            end = find_last_line_end(sc_log, self.chunk_size)
+            sc_log.seek(0)
+            # Only lines with a bootstrap anchor can change the state, the rest is never decoded
+            if end >= self.parallel_threshold and self.workers > 1:
+                batches = iter_candidate_batches(log_file_location, 0, end, self.line_anchors, self.encoding, self.errors, self.workers)
+            else:
+                batches = iter_line_batches(sc_log, self.chunk_size, self.encoding, self.errors, self.line_anchors)
+            for lines, offset in batches:
+                for line in lines:
+                    for event_type in classify(line):
+                        if self.apply_line(bootstrap, event_type, line):
+                            break
+                bootstrap.resume_offset = offset
+        return bootstrap
+
+    def scan_reverse(self, log_file_location:str) -> SessionBootstrap:
+        """Recover the state by reading backwards from EOF, so startup cost does not grow with old history."""
+        bootstrap = SessionBootstrap()
+        with open(log_file_location, "rb") as sc_log:
+            bootstrap.resume_offset = find_last_line_end(sc_log, self.chunk_size)
+            self.scan_identity(log_file_location, sc_log, bootstrap)
+            classify = self.event_matcher.classify
+            # Destruction lines newer than the vehicle control event still being looked for
+            destructions = []
+            ship_resolved = False
+            lines = iter_lines_reversed(sc_log, bootstrap.resume_offset, self.chunk_size, self.encoding, self.errors, self.state_anchors)
+            for line in lines:
+                try:
+                    event_types = classify(line)
+                    if "game_mode" in event_types:
+                        # Everything before the latest context load belongs to a previous map
+                        bootstrap.game_mode = parse_game_mode(line)
+                        break
+                    if ship_resolved:
+                        continue
+                    if "vehicle_control" in event_types:
+                        if is_vehicle_enter(line):
+                            ship_enter = parse_ship_info(line)
+                            if ship_enter:
+                                if not any(ship_enter.ship_id in destruction for destruction in destructions):
+                                    bootstrap.active_ship = ship_enter.ship
+                                    bootstrap.active_ship_id = ship_enter.ship_id
+                                ship_resolved = True
+                            continue
+                        if is_vehicle_exit(line):
+                            ship_resolved = True
+                            continue
+                    if "vehicle_destruction" in event_types:
+                        destructions.append(line)
+                except (IndexError, ValueError):
+                    # Malformed line, skip it
+                    continue
+            lines.close()
+        return bootstrap
+
+    def scan_identity(self, log_file_location:str, sc_log, bootstrap:SessionBootstrap) -> None:
+        """Find the latest login and character lines before the resume offset."""
+        if bootstrap.resume_offset >= self.parallel_threshold and self.workers > 1:
+            # Without a relogin the whole log is read, so big logs are prefiltered in parallel
+            batches = iter_candidate_batches(
+                log_file_location, 0, bootstrap.resume_offset, self.identity_anchors, self.encoding, self.errors, self.workers
+            )
+            for lines, _ in batches:
+                for line in lines:
+                    try:
+                        if LOGIN_TOKEN in line:
+                            bootstrap.rsi_handle = parse_rsi_handle(line)
+                        elif CHARACTER_TOKEN in line:
+                            bootstrap.player_geid = parse_player_geid(line)
+                    except (IndexError, ValueError):
+                        continue
+            return
+        lines = iter_lines_reversed(sc_log, bootstrap.resume_offset, self.chunk_size, self.encoding, self.errors, self.identity_anchors)
+        for line in lines:
+            try:
+                # A relogin replaces the identity, so the newest line of each kind wins
+                if bootstrap.rsi_handle == "N/A" and LOGIN_TOKEN in line:
+                    bootstrap.rsi_handle = parse_rsi_handle(line)
+                elif bootstrap.player_geid == "N/A" and CHARACTER_TOKEN in line:
+                    bootstrap.player_geid = parse_player_geid(line)
+            except (IndexError, ValueError):
+                continue
+            if bootstrap.rsi_handle != "N/A" and bootstrap.player_geid != "N/A":
+                break
+        lines.close()
+
+    def apply_line(self, bootstrap:SessionBootstrap, event_type:str, line:str) -> bool:
+        """Update the bootstrap state with a classified line, return True once the line is consumed."""
+        try:
+            if event_type == "login":
+                # A relogin replaces the handle, the latest login belongs to the running session
+                bootstrap.rsi_handle = parse_rsi_handle(line)
+                return True
+            if event_type == "character":
+                bootstrap.player_geid = parse_player_geid(line)
+                return True
+            if event_type == "game_mode":
+                bootstrap.game_mode = parse_game_mode(line)
+                # A context load puts the player on a new map, so any earlier vehicle is gone
+                bootstrap.active_ship = "FPS"
+                bootstrap.active_ship_id = "N/A"
+                return True
+            if event_type == "vehicle_control":
+                if is_vehicle_enter(line):
+                    ship_enter = parse_ship_info(line)
+                    if ship_enter:
+                        bootstrap.active_ship = ship_enter.ship
+                        bootstrap.active_ship_id = ship_enter.ship_id
+                    return True
+                if is_vehicle_exit(line):
+                    bootstrap.active_ship = "FPS"
+                    bootstrap.active_ship_id = "N/A"
+                    return True
+                return False
+            if event_type == "vehicle_destruction" and bootstrap.active_ship_id in line:
+                bootstrap.active_ship = "FPS"
+                bootstrap.active_ship_id = "N/A"
+                return True
+        except (IndexError, ValueError):
+            # Malformed line, keep the state as it is
+            return True
+        return False
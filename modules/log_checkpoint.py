@@ -0,0 +1,111 @@
+import hashlib
+import json
+import os
+import sys
+from dataclasses import asdict
+from os import fstat
+from pathlib import Path
+from time import monotonic
+
+# Import kill tracker modules
+from modules.log_bootstrap import SessionBootstrap
+
+# The first line of Game.log carries the time the game started writing it
+HEAD_SIZE = 4096
+
+def read_log_identity(log_file_location:str) -> dict:
+    """Identify the file currently at the log path by device, inode, creation time and a hash of its first line."""
+    with open(log_file_location, "rb") as sc_log:
+        st = fstat(sc_log.fileno())
+        head = sc_log.read(HEAD_SIZE)
+    newline = head.find(b"\n")
+    return {
+        "dev": st.st_dev,
+        "ino": st.st_ino,
+        "created": get_creation_time(st),
+        # None until the game has finished writing the first line
+        "head": hashlib.sha1(head[:newline]).hexdigest() if newline != -1 else None,
+        "size": st.st_size,
+    }
+
+def get_creation_time(st) -> float:
+    """Get the creation time of the file where the platform records one, None otherwise."""
+    if hasattr(st, "st_birthtime"):
+        return st.st_birthtime
+    if sys.platform == "win32":
+        # st_ctime is the creation time on Windows, on POSIX it changes with every write
+        return st.st_ctime
+    return None
+
+def is_same_log(saved:dict, current:dict) -> bool:
+    """Check if two identities describe the same log file, a replaced or rotated log never matches."""
+    if saved["dev"] != current["dev"] or saved["ino"] != current["ino"]:
+        return False
+    if saved["created"] is not None and current["created"] is not None and saved["created"] != current["created"]:
+        return False
+    if saved["head"] is not None and saved["head"] != current["head"]:
+        return False
+    # A log shorter than what was already read has been truncated
+    return current["size"] >= saved.get("offset", 0)
+
+class LogCheckpoint():
+    """Persists how far Game.log was processed so a restart on the same log resumes without a rescan."""
+    def __init__(self, checkpoint_path:Path=None, save_interval:float=10):
+        self.log = None
+        # Kept apart from the encrypted config, the tail thread rewrites it every save interval
+        self.checkpoint_path = checkpoint_path if checkpoint_path else Path.cwd() / "bv_killtracker_checkpoint.json"
+        self.save_interval = save_interval
+        self.identity = None
+        self.last_save = {"offset": None, "time": 0.0}
+
+    def track(self, log_file_location:str) -> dict:
+        """Take the identity of the log being tailed, checkpoints are saved against it."""
+        self.identity = read_log_identity(log_file_location)
+        self.identity["file"] = log_file_location
+        return self.identity
+
+    def load(self, log_file_location:str) -> SessionBootstrap:
+        """Get the session saved for this exact log file, None if there is none or the file was replaced."""
+        try:
+            try:
+                with open(self.checkpoint_path, "r", encoding="utf-8") as checkpoint_file:
+                    saved = json.load(checkpoint_file)
+            except FileNotFoundError:
+                return None
+            if not saved or saved["identity"]["head"] is None:
+                return None
+            identity = dict(saved["identity"], offset=saved["state"]["resume_offset"])
+            if not is_same_log(identity, read_log_identity(log_file_location)):
+                if self.log:
+                    self.log.debug("LogCheckpoint.load(): Game.log was replaced since the last checkpoint.")
+                return None
+            return SessionBootstrap(**saved["state"])
+        except Exception as e:
+            if self.log:
+                self.log.error(f"LogCheckpoint.load(): Error: {e.__class__.__name__} {e}")
+            return None
+
+    def save(self, bootstrap:SessionBootstrap, force:bool=False) -> None:
+        """Save the session state and offset, throttled to one write per save interval."""
+        try:
+            if self.identity is None or bootstrap.resume_offset == self.last_save["offset"]:
+                return
+            now = monotonic()
+            if not force and now - self.last_save["time"] < self.save_interval:
+                return
+            if self.identity["head"] is None:
+                # The first line was still being written when tracking started
+                self.track(self.identity["file"])
+                if self.identity["head"] is None:
+                    return
+            identity = {key: self.identity[key] for key in ("dev", "ino", "created", "head")}
+            # The file is replaced in one step so a crash never leaves half of it
+            temp_path = self.checkpoint_path.with_name(self.checkpoint_path.name + ".tmp")
+            with open(temp_path, "w", encoding="utf-8") as checkpoint_file:
+                json.dump({"identity": identity, "state": asdict(bootstrap)}, checkpoint_file)
+            os.replace(temp_path, self.checkpoint_path)
+            self.last_save["offset"] = bootstrap.resume_offset
+            self.last_save["time"] = now
+        except Exception as e:
+            if self.log:
+                self.log.error(f"LogCheckpoint.save(): Error: {e.__class__.__name__} {e}")
@@ -0,0 +1,92 @@
+from dataclasses import dataclass, field
+
+@dataclass(slots=True)
+class KillEvent():
+    """The current player killed another player."""
+    time: str
+    player: str
+    victim: str
+    zone: str
+    weapon: str
+    rsi_profile: str
+    game_mode: str
+    client_ver: str
+    killers_ship: str
+    anonymize_state: dict
+    # Epoch time of every stage the kill passed, see modules/kill_latency.py
+    stages: dict = field(default_factory=dict, repr=False, compare=False)
+
+    def to_wire(self) -> dict:
+        """Get the reportKill payload, see docs/api/json_payloads.py."""
+        return {
+            'player': self.player,
+            'victim': self.victim,
+            'time': self.time,
+            'zone': self.zone,
+            'weapon': self.weapon,
+            'rsi_profile': self.rsi_profile,
+            'game_mode': self.game_mode,
+            'client_ver': self.client_ver,
+            'killers_ship': self.killers_ship,
+            'anonymize_state': self.anonymize_state
+        }
+
+@dataclass(slots=True)
+class DeathEvent():
+    """The current player died, killed by someone else or by themselves."""
+    time: str
+    player: str
+    killer: str
+    weapon: str
+    zone: str
+    game_mode: str
+    suicide: bool = False
+    stages: dict = field(default_factory=dict, repr=False, compare=False)
+
+    def to_wire(self) -> dict:
+        """Get the reportACKill payload, see docs/api/json_payloads.py."""
+        return {
+            'time': self.time,
+            'player': self.killer,
+            'victim': self.player,
+            'game_mode': self.game_mode,
+        }
+
+@dataclass(slots=True)
+class KillIgnored():
+    """A kill line that must not be reported, the reason is "exclusion" or "reset"."""
+    reason: str
+
+@dataclass(slots=True)
+class ZoneChange():
+    """The player's active zone changed, e.g. by entering a ship or a jump."""
+    zone: str
+    jump_drive: bool = False
+
+@dataclass(slots=True)
+class ShipEnter():
+    """The player took control of a ship."""
+    ship: str
+    ship_id: str
+
+@dataclass(slots=True)
+class VehicleStatus():
+    """The vehicle status shown in the GUI changed."""
+    status: str
+
+@dataclass(slots=True)
+class SessionStats():
+    """Kill and death counters of the session after a kill or death."""
+    kills: int
+    deaths: int
+    curr_killstreak: int
+    max_killstreak: int
+    kd_display: str
+    died: bool = False
+
+def get_pickled_payload(pickle_entry:dict) -> dict:
+    """Get the wire payload of a pickled kill, including entries pickled before events had a wire format."""
+    if "payload" in pickle_entry:
+        return pickle_entry["payload"]
+    # Legacy entry: {"kill_result": {"result": ..., "data": {...}}, "endpoint": ...}
+    return pickle_entry["kill_result"]["data"]
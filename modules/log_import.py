@@ -0,0 +1,166 @@
+import json
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+# Import kill tracker modules
+from modules.headless import create_headless_parser
+from modules.event_bus import EventBus
+from modules.log_bootstrap import SessionBootstrap
+from modules.log_checkpoint import read_log_identity
+from modules.log_events import KillEvent, DeathEvent
+from modules.log_reader import iter_line_batches, find_last_line_end
+
+# Star Citizen moves the Game.log of every previous session here
+BACKUP_DIR = "logbackups"
+COUNTED_STATS = ("kills", "deaths", "suicides", "errors")
+TALLIED_STATS = ("weapons", "ships", "killed_by")
+
+def find_log_backups(log_file_location:str) -> list:
+    """Get the archived session logs next to Game.log, oldest first by name."""
+    backup_dir = Path(log_file_location).parent / BACKUP_DIR
+    if not backup_dir.is_dir():
+        return []
+    return sorted(str(backup) for backup in backup_dir.glob("*.log"))
+
+def get_weapon_class(weapon:str) -> str:
+    """Strip the entity id from a raw weapon such as KLWE_LaserRepeater_S3_1234."""
+    weapon_class, _, entity_id = weapon.rpartition("_")
+    return weapon_class if weapon_class and entity_id.isdigit() else weapon
+
+def get_import_key(identity:dict) -> str:
+    """Identify an archived log by its first line and size, backups keep both when they are moved or copied."""
+    return f"{identity['head']}:{identity['size']}"
+
+def import_log_file(log_path:str, data_map:dict=None, rsi_handle:str=None) -> dict:
+    """Parse one archived log and get its kill, death, weapon and ship aggregates, runs in a worker process.
+
+    Only the events of rsi_handle are counted, or of the latest login without one, a relogin to another
+    account mid-session switches the player like it does in the live tail.
+    """
+    stats = {"file": log_path, "rsi_handle": None, "kills": 0, "deaths": 0, "suicides": 0, "errors": 0}
+    stats.update({tally: Counter() for tally in TALLIED_STATS})
+    parser = create_headless_parser(data_map)
+    # Only the aggregator consumes events, nothing is uploaded, heartbeated or played
+    parser.event_bus = EventBus()
+
+    def aggregate(event) -> None:
+        # Handled inline while the line is read, so the current handle is the one the event was made with
+        if parser.rsi_handle["current"] != stats["rsi_handle"]:
+            return
+        if isinstance(event, KillEvent):
+            stats["kills"] += 1
+            stats["weapons"][get_weapon_class(event.weapon)] += 1
+            stats["ships"][event.killers_ship] += 1
+        elif event.suicide:
+            stats["suicides"] += 1
+        else:
+            stats["deaths"] += 1
+            stats["killed_by"][event.killer] += 1
+    parser.event_bus.subscribe("import", aggregate, (KillEvent, DeathEvent))
+
+    bootstrap = SessionBootstrap()
+    with open(log_path, "rb") as sc_log:
+        bootstrap.resume_offset = find_last_line_end(sc_log, parser.backlog_chunk_size)
+        parser.session_scanner.scan_identity(log_path, sc_log, bootstrap)
+        if bootstrap.rsi_handle == "N/A":
+            # Never logged in, e.g. the game crashed while loading
+            stats["skipped"] = True
+            return stats
+        stats["rsi_handle"] = rsi_handle if rsi_handle else bootstrap.rsi_handle
+        played = False
+        sc_log.seek(0)
+        # Replayed from the start, the login and character lines set the identity as they come
+        batches = iter_line_batches(sc_log, parser.backlog_chunk_size, parser.log_encoding, parser.log_decode_errors, parser.line_anchors)
+        for lines, offset in batches:
+            for line in lines:
+                try:
+                    parser.read_log_line(line, True)
+                except Exception:
+                    stats["errors"] += 1
+                played = played or parser.rsi_handle["current"] == stats["rsi_handle"]
+    if not played:
+        # Another account played this session
+        stats["skipped"] = True
+    return stats
+
+def merge_stats(lifetime:dict, file_stats:dict) -> dict:
+    """Add the aggregates of one log to the lifetime stats."""
+    for counter in COUNTED_STATS:
+        lifetime[counter] = lifetime.get(counter, 0) + file_stats[counter]
+    for tally in TALLIED_STATS:
+        merged = Counter(lifetime.get(tally, {}))
+        merged.update(file_stats[tally])
+        lifetime[tally] = dict(merged.most_common())
+    return lifetime
+
+class LogImporter():
+    """Imports archived session logs in a process pool and keeps lifetime stats in their own file."""
+    def __init__(self, stats_path:Path=None, workers:int=None):
+        self.log = None
+        # Kept apart from the encrypted config, which the running tracker rewrites from its own copy
+        self.stats_path = stats_path if stats_path else Path.cwd() / "bv_killtracker_lifetime.json"
+        self.workers = workers if workers else os.cpu_count()
+
+    def get_lifetime_stats(self) -> dict:
+        """Get the saved lifetime stats and the logs they were built from."""
+        try:
+            with open(self.stats_path, "r", encoding="utf-8") as stats_file:
+                saved = json.load(stats_file)
+        except FileNotFoundError:
+            saved = None
+        return saved if saved else {"totals": {}, "imported": {}}
+
+    def save_lifetime_stats(self, lifetime:dict) -> None:
+        """Save the lifetime stats, the file is replaced in one step so a crash never leaves half of it."""
+        temp_path = self.stats_path.with_name(self.stats_path.name + ".tmp")
+        try:
+            with open(temp_path, "w", encoding="utf-8") as stats_file:
+                json.dump(lifetime, stats_file)
+            os.replace(temp_path, self.stats_path)
+        except Exception as e:
+            self.log_error(f"save_lifetime_stats(): Error: {e.__class__.__name__} {e}")
+
+    def import_logs(self, log_paths:list, data_map:dict=None, rsi_handle:str=None) -> dict:
+        """Parse the logs that weren't imported yet, one per worker, merge them into the lifetime stats and save them."""
+        lifetime = self.get_lifetime_stats()
+        pending = {}
+        for log_path in log_paths:
+            try:
+                key = get_import_key(read_log_identity(log_path))
+                if key not in lifetime["imported"] and key not in pending.values():
+                    pending[log_path] = key
+            except Exception as e:
+                self.log_error(f"import_logs(): Error reading {log_path}: {e.__class__.__name__} {e}")
+        if not pending:
+            return lifetime
+
+        workers = max(1, min(self.workers, len(pending)))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(import_log_file, log_path, data_map, rsi_handle): log_path for log_path in pending}
+            for future in as_completed(futures):
+                log_path = futures[future]
+                try:
+                    file_stats = future.result()
+                except Exception as e:
+                    self.log_error(f"import_logs(): Error parsing {log_path}: {e.__class__.__name__} {e}")
+                    continue
+                if file_stats.get("skipped"):
+                    # Left out of the imported logs, another handle may still claim it
+                    continue
+                lifetime["imported"][pending[log_path]] = {
+                    "file": os.path.basename(log_path),
+                    "rsi_handle": file_stats["rsi_handle"],
+                    "kills": file_stats["kills"],
+                    "deaths": file_stats["deaths"],
+                }
+                merge_stats(lifetime["totals"], file_stats)
+        self.save_lifetime_stats(lifetime)
+        return lifetime
+
+    def log_error(self, message:str) -> None:
+        if self.log:
+            self.log.error(message)
+        else:
+            print(message)
@@ -0,0 +1,219 @@
+import re
+from collections import OrderedDict
+from datetime import datetime
+
+# Import kill tracker modules
+from modules.log_events import ShipEnter
+
+# Tokens of the lines carrying the player's identity
+LOGIN_TOKEN = "<Legacy login response> [CIG-net] User Login Success"
+CHARACTER_TOKEN = "AccountLoginCharacterStatus_Character"
+
+# Trigger tokens read_log_line reacts to, mapped to the event type of the line
+EVENT_TOKENS = {
+    LOGIN_TOKEN: "login",
+    CHARACTER_TOKEN: "character",
+    "<Vehicle Control Flow>": "vehicle_control",
+    "<Context Establisher Done>": "game_mode",
+    "CPlayerShipRespawnManager::OnVehicleSpawned": "ac_ship_spawn",
+    "<Vehicle Destruction>": "vehicle_destruction",
+    "<local client>: Entering control state dead": "vehicle_destruction",
+    "OnEntityEnterZone": "player_event",
+    "CActor::Kill": "player_event",
+    "<Jump Drive State Changed>": "jump_drive",
+}
+
+# Anchor substrings of the trigger tokens, scanned first so noise lines are rejected early.
+# Words like "Login" or "Vehicle" are avoided, [Login] and [Vehicle] team tags are common on noise lines.
+TOKEN_ANCHORS = {
+    "<Legacy login response>": (LOGIN_TOKEN,),
+    CHARACTER_TOKEN: (CHARACTER_TOKEN,),
+    "<Vehicle ": ("<Vehicle Control Flow>", "<Vehicle Destruction>"),
+    "CPlayerShipRespawnManager": ("CPlayerShipRespawnManager::OnVehicleSpawned",),
+    "<Context Establisher Done>": ("<Context Establisher Done>",),
+    "Entering control state dead": ("<local client>: Entering control state dead",),
+    "OnEntityEnterZone": ("OnEntityEnterZone",),
+    "CActor::Kill": ("CActor::Kill",),
+    "<Jump Drive State Changed>": ("<Jump Drive State Changed>",),
+}
+
+# Trigger tokens needed to recover the session state before tailing starts
+BOOTSTRAP_TOKENS = {
+    LOGIN_TOKEN: "login",
+    CHARACTER_TOKEN: "character",
+    "<Context Establisher Done>": "game_mode",
+    "<Vehicle Control Flow>": "vehicle_control",
+    "<Vehicle Destruction>": "vehicle_destruction",
+    "<local client>: Entering control state dead": "vehicle_destruction",
+}
+
+BOOTSTRAP_ANCHORS = {
+    "<Legacy login response>": (LOGIN_TOKEN,),
+    CHARACTER_TOKEN: (CHARACTER_TOKEN,),
+    "<Context Establisher Done>": ("<Context Establisher Done>",),
+    "<Vehicle ": ("<Vehicle Control Flow>", "<Vehicle Destruction>"),
+    "Entering control state dead": ("<local client>: Entering control state dead",),
+}
+
+BOOTSTRAP_PRIORITY = ("login", "character", "game_mode", "vehicle_control", "vehicle_destruction")
+
+# Tokens of the lines that change the game mode or vehicle state
+STATE_TOKENS = tuple(token for token, event_type in BOOTSTRAP_TOKENS.items() if event_type not in ("login", "character"))
+
+SHIP_INFO_PATTERN = re.compile(r"for '([\w]+(?:_[\w]+)+)_(\d+)'")
+
+# Order in which event types are tried when a line carries more than one token
+EVENT_PRIORITY = (
+    "login",
+    "character",
+    "vehicle_control",
+    "game_mode",
+    "ac_ship_spawn",
+    "vehicle_destruction",
+    "player_event",
+    "jump_drive",
+)
+
+class EventMatcher():
+    """Classifies log lines into event types from a precompiled table of trigger tokens."""
+    def __init__(self, tokens:dict=None, anchors:dict=None, priority:tuple=EVENT_PRIORITY):
+        self.tokens = dict(tokens if tokens else EVENT_TOKENS)
+        self.priority = priority
+        # Compile the table into (anchor, ((token, event_type), ...)) pairs
+        self.anchor_table = []
+        covered = set()
+        for anchor, anchor_tokens in (anchors if anchors else TOKEN_ANCHORS).items():
+            for token in anchor_tokens:
+                if anchor not in token:
+                    raise ValueError(f"Trigger token {token} does not contain its anchor {anchor}.")
+            self.anchor_table.append((anchor, tuple((token, self.tokens[token]) for token in anchor_tokens)))
+            covered.update(anchor_tokens)
+        self.anchors = tuple(anchor for anchor, _ in self.anchor_table)
+        missing = set(self.tokens) - covered
+        if missing:
+            raise ValueError(f"Trigger tokens without an anchor: {missing}")
+
+    def classify(self, line:str) -> tuple:
+        """Get the event types of the line in priority order, empty if the line is noise."""
+        # Fast path for noise lines: one substring scan per anchor
+        for anchor in self.anchors:
+            if anchor in line:
+                break
+        else:
+            return ()
+        event_types = []
+        # The anchors before the first hit are known to be missing
+        for anchor, candidates in self.anchor_table[self.anchors.index(anchor):]:
+            if anchor in line:
+                for token, event_type in candidates:
+                    if token in line and event_type not in event_types:
+                        event_types.append(event_type)
+        if len(event_types) > 1:
+            event_types.sort(key=self.priority.index)
+        return tuple(event_types)
+
+def is_vehicle_enter(line:str) -> bool:
+    """Check if a vehicle control line grants the player control of a vehicle."""
+    return (
+        ("CVehicleMovementBase::SetDriver:" in line and "requesting control token for" in line) or
+        ("CVehicle::Initialize::<lambda_1>::operator ():" in line and "granted control token for" in line)
+    )
+
+def is_vehicle_exit(line:str) -> bool:
+    """Check if a vehicle control line releases the player's control of a vehicle."""
+    return (
+        ("CVehicleMovementBase::ClearDriver:" in line and "releasing control token for" in line) or
+        ("losing control token for" in line)
+    )
+
+def parse_ship_info(line:str) -> ShipEnter:
+    """Get the ship type and ID from a vehicle control line."""
+    match = SHIP_INFO_PATTERN.search(line)
+    if match:
+        return ShipEnter(match.group(1), match.group(2))
+    return None
+
+def parse_game_mode(line:str) -> str:
+    """Get the game mode from a context establisher line."""
+    return line.split(' ')[8].split("=")[1].strip("\"")
+
+def parse_rsi_handle(line:str) -> str:
+    """Get the RSI handle from a login line."""
+    line_index = line.index("Handle[") + len("Handle[")
+    if 0 == line_index:
+        return "N/A"
+    potential_handle = line[line_index:].split(' ')[0]
+    return potential_handle[0:-1]
+
+def parse_player_geid(line:str) -> str:
+    """Get the player GEID from a character status line."""
+    return line.split(' ')[11]
+
+def parse_log_timestamp(line:str) -> float:
+    """Get the epoch time of a line from its leading <ISO 8601> stamp, None if it has none."""
+    if not line.startswith("<"):
+        return None
+    try:
+        # fromisoformat only takes the Z suffix from Python 3.11 on
+        return datetime.fromisoformat(line[1:line.index(">")].replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+class VictimRuleMatcher():
+    """Matches kill lines against the ignoredVictimRules, lowercasing the line only once."""
+    def __init__(self, rules:list=None):
+        # Rule values are lowercased once per data map refresh instead of once per line
+        self.patterns = tuple((rule["value"].lower(), rule["value"]) for rule in (rules if rules else []))
+
+    def match(self, line:str) -> str:
+        """Get the value of the first rule found in the line, None if no rule matches."""
+        lowered = line.lower()
+        for pattern, value in self.patterns:
+            if pattern in lowered:
+                return value
+        return None
+
+class IdIndex():
+    """Resolves raw log ids such as KLWE_LaserRepeater_S3_1234 to data map names, remembering recent lookups."""
+    def __init__(self, entries:list=None, cache_size:int=1024):
+        self.entries = tuple(entries if entries else [])
+        # Id -> (list position, name), the first entry wins like the list scan did
+        self.positions = {}
+        for position, entry in enumerate(self.entries):
+            self.positions.setdefault(entry["id"], (position, entry["name"]))
+        self.id_lengths = sorted({len(entry_id) for entry_id in self.positions if entry_id})
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+
+    def resolve(self, raw_id:str) -> str:
+        """Get the name for the raw id, None if no entry matches."""
+        try:
+            name = self.cache[raw_id]
+            self.cache.move_to_end(raw_id)
+            return name
+        except KeyError:
+            pass
+        name = self.lookup(raw_id)
+        self.cache[raw_id] = name
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return name
+
+    def lookup(self, raw_id:str) -> str:
+        """Get the name of the first entry in list order whose id is contained in the raw id, None if there is none.
+
+        Same result as scanning the list, but every substring of the raw id with the length of some id is probed
+        in a dict instead, so the cost depends on the raw id and not on the number of entries.
+        """
+        positions = self.positions
+        # An empty id is contained in every raw id
+        best = positions.get("")
+        size = len(raw_id)
+        for length in self.id_lengths:
+            if length > size:
+                break
+            for start in range(size - length + 1):
+                hit = positions.get(raw_id[start:start + length])
+                if hit is not None and (best is None or hit[0] < best[0]):
+                    best = hit
+        return best[1] if best is not None else None
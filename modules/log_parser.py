@@ -1,8 +1,22 @@
-import re
-from time import sleep
-from os import stat
+from time import sleep, monotonic, time
+from os import fstat, cpu_count
 from threading import Thread
 
+# Import kill tracker modules
+from modules.log_matcher import (
+    EventMatcher, is_vehicle_enter, is_vehicle_exit, parse_ship_info, parse_game_mode, parse_log_timestamp,
+    parse_rsi_handle, parse_player_geid
+)
+from modules.log_reader import iter_line_batches, iter_candidate_batches, find_last_line_end, LogTailer
+from modules.log_bootstrap import SessionBootstrap, SessionScanner
+from modules.file_watcher import create_file_watcher
+from modules.log_checkpoint import read_log_identity, is_same_log
+from modules.log_events import KillEvent, DeathEvent, KillIgnored, ZoneChange, VehicleStatus, SessionStats
+from modules.event_bus import EventBus
+from modules.parser_metrics import ParserMetrics
+from modules.tail_watchdog import TailWatchdog
+from modules.kill_latency import KillLatencyTracker
+
 class LogParser():
     """Parses the game.log file for Star Citizen."""
     def __init__(self, gui_module, api_client_module, sound_module, cm_module, local_version, monitoring, rsi_handle, player_geid, active_ship, anonymize_state):
@@ -23,6 +37,23 @@ class LogParser():
         self.active_ship_id = "N/A"
         self.player_geid = player_geid
         self.log_file_location = None
+        self.log_encoding = "utf-8"
+        self.log_decode_errors = "replace"
+        self.backlog_chunk_size = 1024 * 1024
+        self.backlog_progress_interval = 5
+        # Backlogs bigger than this are prefiltered in parallel by worker processes
+        self.parallel_scan_threshold = 128 * 1024 * 1024
+        self.parallel_scan_workers = cpu_count()
+        self.replaying_backlog = False
+        self.resume_offset = 0
+        # "reverse" reads back from EOF to the latest context load, "forward" reads the whole log
+        self.bootstrap_mode = "reverse"
+        # "auto" picks inotify where available and adaptive polling otherwise
+        self.watch_backend = "auto"
+        self.watch_timeout = 1
+        self.file_watcher = None
+        # Time from a line being written to it being dispatched, in seconds
+        self.dispatch_latency = {"last": 0.0, "avg": 0.0, "max": 0.0, "count": 0}
         self.curr_killstreak = 0
         self.max_killstreak = 0
         self.kill_total = 0
@@ -34,20 +65,72 @@ class LogParser():
             'GRIN', 'TMBL', 'GAMA'
         ]
 
+        # Single-pass line classifier and the handler for each event type
+        self.event_matcher = EventMatcher()
+        self.classify_line = self.event_matcher.classify
+        # Lines without a trigger token anchor are dropped as bytes, before they are decoded
+        self.line_anchors = tuple(anchor.encode(self.log_encoding) for anchor in self.event_matcher.anchors)
+        self.event_handlers = {
+            "login": self.handle_login,
+            "character": self.handle_character,
+            "vehicle_control": self.handle_vehicle_control,
+            "game_mode": self.handle_game_mode,
+            "ac_ship_spawn": self.handle_ac_ship_spawn,
+            "vehicle_destruction": self.handle_vehicle_destruction,
+            "player_event": self.handle_player_event,
+            "jump_drive": self.handle_jump_drive,
+        }
+        self.session_scanner = SessionScanner(self.log_encoding, self.log_decode_errors, self.backlog_chunk_size)
+        # Persistent tail checkpoint, set by the main module
+        self.checkpoint = None
+        # Side effects of parsed events run on their own consumer threads, so they never stall the tail thread
+        self.event_bus = EventBus()
+        self.event_bus.subscribe("gui", self.show_event, (VehicleStatus, SessionStats), maxsize=64, overflow="drop_oldest")
+        self.event_bus.subscribe("sound", self.play_event_sound, (KillEvent,), maxsize=2, overflow="drop_newest")
+        # Kills of a burst are posted together when Servitor takes batches
+        self.upload_batch_window = 0.25
+        self.upload_consumer = self.event_bus.subscribe(
+            "upload", self.upload_events, (KillEvent, DeathEvent), maxsize=256, overflow="spill", spill=self.spill_upload,
+            batch_size=20, batch_window=self.upload_batch_window
+        )
+        self.event_bus.subscribe("heartbeat", self.send_heartbeat, (DeathEvent, ZoneChange), maxsize=16, overflow="drop_oldest")
+        # Hot path timings, only collected in Debug Mode
+        self.metrics = ParserMetrics(self)
+        # End offset of the last dispatched live line, None until live tailing starts
+        self.tail_offset = None
+        self.tailer = None
+        self.tail_watchdog = TailWatchdog(self)
+        # Time each reported kill spent in every stage from Game.log to Servitor
+        self.kill_latency = KillLatencyTracker()
+        # When the batch being dispatched was read from the log
+        self.batch_read_at = None
+        # Shared scheduler of the app, set by the main module
+        self.scheduler = None
+
     def start_tail_log_thread(self) -> None:
         """Start the log tailing in a separate thread only if it's not already running."""
+        self.event_bus.log = self.log
+        self.event_bus.start()
+        self.metrics.log = self.log
+        self.scheduler.every("parser_metrics", self.metrics.tick, 1)
+        self.tail_watchdog.log = self.log
+        self.scheduler.every("tail_watchdog", self.tail_watchdog.sample, self.tail_watchdog.interval)
         thr = Thread(target=self.tail_log, daemon=True)
         thr.start()
 
     def tail_log(self) -> None:
         """Read the log file and display events in the GUI."""
+        sc_log = None
+        tailer = None
         try:
-            sc_log = open(self.log_file_location, "r")
-            if sc_log is None:
-                self.log.error(f"No log file found at {self.log_file_location}")
-                return
+            sc_log = open(self.log_file_location, "rb")
+            # Everything before the resume offset was already read by the session bootstrap
+            sc_log.seek(self.resume_offset)
+            log_identity = read_log_identity(self.log_file_location)
         except Exception as e:
             self.log.error(f"Error opening log file: {e.__class__.__name__} {e}")
+            self.stop_tail_log(sc_log, tailer)
+            return
         try:
             self.log.warning("Enter Kill Tracker Key to establish Servitor connection...")
             sleep(1)
@@ -61,30 +144,34 @@ class LogParser():
             self.log.error(f"Error waiting for Servitor connection to be established: {e.__class__.__name__} {e}")
 
         try:
-            # Read all lines to find out what game mode player is currently, in case they booted up late.
+            # Replay the lines written since the session bootstrap, e.g. while waiting for the key.
             # Don't upload kills, we don't want repeating last session's kills in case they are actually available.
             self.log.info("Loading old log (if available)! Note that old kills shown will not be uploaded as they are stale.")
-            lines = sc_log.readlines()
-            for line in lines:
-                if not self.api.api_key["value"]:
-                    self.log.error("Error: key is invalid. Loading old log stopped.")
-                    break
-                self.read_log_line(line, False)
-            # After loading old log, always default to FPS on the label
-            self.active_ship["current"] = "FPS"
-            self.active_ship_id = "N/A"
-            self.gui.update_vehicle_status("FPS")
+            resume_offset = self.replay_backlog(sc_log)
+            # Hand off to live tailing right after the last complete line of the old log
+            sc_log.seek(resume_offset)
+            self.event_bus.publish(VehicleStatus(self.active_ship["current"]))
+            self.save_checkpoint(resume_offset, True)
         except Exception as e:
             self.log.error(f"Error reading old log file: {e.__class__.__name__} {e}")
         
         try:
-            # Main loop to monitor the log
-            last_log_file_size = stat(self.log_file_location).st_size
-            self.log.debug(f"tail_log(): Last log size: {last_log_file_size}.")
+            # Main loop to monitor the log, woken up by the file watcher instead of a fixed sleep
+            self.file_watcher = create_file_watcher(self.log_file_location, self.watch_backend)
+            tailer = LogTailer(sc_log, self.log_encoding, self.log_decode_errors, self.backlog_chunk_size, self.line_anchors)
+            self.tailer = tailer
+            self.tail_offset = tailer.offset
+            self.log.info(f"Watching the game log with the {self.file_watcher.name} backend.")
+            if self.rsi_handle["current"] == "N/A":
+                # Picked up by handle_login as soon as the game writes the login line
+                self.log.warning("RSI handle name has not been found yet, kills are tracked once you log in.")
             self.log.success("Kill Tracking initiated.")
             self.log.success("Go Forth And Slaughter...")
         except Exception as e:
-            self.log.error(f"Error getting log file size: {e.__class__.__name__} {e}")
+            # Without a watcher and tailer the loop below would only fail on every pass
+            self.log.error(f"Error starting the log file watcher, Kill Tracking is not active: {e.__class__.__name__} {e}")
+            self.stop_tail_log(sc_log, None)
+            return
         
         while self.monitoring["active"]:
             try:
@@ -92,139 +179,290 @@ class LogParser():
                     self.log.error("Error: key is invalid. Kill Tracking is not active...")
                     sleep(5)
                     continue
-                # Handle RSI handle first before continuing
-                if self.rsi_handle["current"] == "N/A":
-                    self.log.error(f"RSI handle name has not been found yet. Retrying ...")
-                    self.rsi_handle["current"] = self.find_rsi_handle()
-                    if self.rsi_handle["current"] != "N/A":
-                        self.log.success(f"Refound RSI handle name: {self.rsi_handle['current']}.")
-                where = sc_log.tell()
-                line = sc_log.readline()
-                if not line:
-                    sleep(1)
-                    sc_log.seek(where)
-                    if last_log_file_size > stat(self.log_file_location).st_size:
-                        sc_log.close()
-                        sc_log = open(self.log_file_location, "r")
-                        last_log_file_size = stat(self.log_file_location).st_size
-                else:
-                    self.read_log_line(line, True)
+                # Everything the game wrote since the last read arrives as one batch
+                lines = tailer.read_lines()
+                if lines:
+                    self.read_log_lines(lines, True)
+                    self.tail_offset = tailer.offset
+                    self.save_checkpoint(tailer.offset)
+                    continue
+                self.tail_offset = tailer.offset
+                self.save_checkpoint(tailer.offset)
+                if not tailer.eof:
+                    # The read budget went to noise only, the rest is already written so don't wait for a change
+                    continue
+                self.file_watcher.wait(self.watch_timeout)
+                current_identity = read_log_identity(self.log_file_location)
+                if not is_same_log(dict(log_identity, offset=tailer.offset), current_identity):
+                    # The log was truncated, replaced or rotated, start over from the beginning of the new file
+                    self.log.info("Game log was replaced, reopening it.")
+                    sc_log.close()
+                    sc_log = open(self.log_file_location, "rb")
+                    tailer.attach(sc_log)
+                    self.tail_offset = tailer.offset
+                    log_identity = read_log_identity(self.log_file_location)
+                    if self.checkpoint:
+                        self.checkpoint.track(self.log_file_location)
+                elif log_identity["head"] is None:
+                    # The first line is complete now, later replacements are told apart by it
+                    log_identity = current_identity
             except Exception as e:
                 self.log.error(f"Error reading game log file: {e.__class__.__name__} {e}")
+                # E.g. the log is briefly gone while the game rotates it, don't spin on the error
+                sleep(self.watch_timeout)
+        self.stop_tail_log(sc_log, tailer)
+
+    def stop_tail_log(self, sc_log, tailer) -> None:
+        """Save the checkpoint and release what tail_log set up, either may be None if the setup failed."""
+        self.tail_offset = None
+        self.scheduler.cancel("parser_metrics")
+        self.scheduler.cancel("tail_watchdog")
+        self.metrics.disable()
+        if self.file_watcher:
+            self.file_watcher.close()
+            self.file_watcher = None
+        try:
+            if tailer:
+                self.save_checkpoint(tailer.offset, True)
+        except Exception as e:
+            self.log.error(f"Error saving the log checkpoint: {e.__class__.__name__} {e}")
+        if sc_log:
+            sc_log.close()
         self.log.info("Game log monitoring has stopped.")
 
-    def _extract_ship_info(self, line):
-        match = re.search(r"for '([\w]+(?:_[\w]+)+)_(\d+)'", line)
-        if match:
-            ship_type = match.group(1)
-            ship_id = match.group(2)
-            return {"ship_type": ship_type, "ship_id": ship_id}
-        return None
+    def replay_backlog(self, sc_log) -> int:
+        """Replay the log from the current position to EOF in fixed-size chunks and return the byte offset reached."""
+        offset = sc_log.tell()
+        total_bytes = fstat(sc_log.fileno()).st_size
+        start_offset = offset
+        # Every line scanned, most never reach a handler because the anchors drop them undecoded
+        progress = {"lines": 0}
+        candidate_lines = 0
+        start_time = monotonic()
+        last_progress = start_time
+        if total_bytes - offset >= self.parallel_scan_threshold and self.parallel_scan_workers > 1:
+            # Only lines with a trigger token anchor reach a handler, the rest is skipped without decoding
+            end = find_last_line_end(sc_log, self.backlog_chunk_size)
+            batches = iter_candidate_batches(
+                self.log_file_location, offset, end, self.line_anchors, self.log_encoding, self.log_decode_errors,
+                self.parallel_scan_workers, progress
+            )
+        else:
+            batches = iter_line_batches(
+                sc_log, self.backlog_chunk_size, self.log_encoding, self.log_decode_errors, self.line_anchors, progress
+            )
+        self.replaying_backlog = True
+        try:
+            for lines, offset in batches:
+                if not self.api.api_key["value"]:
+                    self.log.error("Error: key is invalid. Loading old log stopped.")
+                    break
+                for line in lines:
+                    try:
+                        self.read_log_line(line, False)
+                    except Exception as e:
+                        self.log.error(f"replay_backlog(): Error: {e.__class__.__name__} {e}")
+                candidate_lines += len(lines)
+                now = monotonic()
+                if now - last_progress >= self.backlog_progress_interval:
+                    last_progress = now
+                    self.log.info(
+                        f"Loading old log: {progress['lines']:,} lines, {(offset - start_offset) / 1048576:.1f} of "
+                        f"{(total_bytes - start_offset) / 1048576:.1f} MB ({progress['lines'] / (now - start_time):,.0f} lines/sec)"
+                    )
+        finally:
+            self.replaying_backlog = False
+        self.resume_offset = 0
+        elapsed = max(monotonic() - start_time, 1e-6)
+        self.log.info(
+            f"Loaded old log: {progress['lines']:,} lines ({candidate_lines:,} with a trigger token), "
+            f"{(offset - start_offset) / 1048576:.1f} MB in {elapsed:.1f} s ({progress['lines'] / elapsed:,.0f} lines/sec)"
+        )
+        return offset
 
-    def read_log_line(self, line: str, upload_kills: bool) -> None:
-        if upload_kills and "<Vehicle Control Flow>" in line:
-                if (
-                    ("CVehicleMovementBase::SetDriver:" in line and "requesting control token for" in line) or
-                    ("CVehicle::Initialize::<lambda_1>::operator ():" in line and "granted control token for" in line)
-                ):
-                    ship_data = self._extract_ship_info(line)
-                    if ship_data:
-                        self.active_ship["current"] = ship_data["ship_type"]
-                        self.active_ship_id = ship_data["ship_id"]
-                        self.log.info(f"Entered ship: {self.active_ship['current']} (ID: {self.active_ship_id})")
-                        self.gui.update_vehicle_status(self.active_ship["current"])
-                    return
-                if (
-                    ("CVehicleMovementBase::ClearDriver:" in line and "releasing control token for" in line) or
-                    ("losing control token for" in line)
-                ):
-                    self.active_ship["current"] = "FPS"
-                    self.active_ship_id = "N/A"
-                    self.log.info("Exited ship: Defaulted to FPS (on-foot)")
-                    self.gui.update_vehicle_status("FPS")
-                    return
-                
-        if "<Context Establisher Done>" in line:
-            self.set_game_mode(line)
-            self.log.debug(f"read_log_line(): set_game_mode with: {line}.")
-        elif "CPlayerShipRespawnManager::OnVehicleSpawned" in line and (
-                "SC_Default" != self.game_mode) and (self.player_geid["current"] in line):
-            self.set_ac_ship(line)
-            self.log.debug(f"read_log_line(): set_ac_ship with: {line}.")
-        elif ("<Vehicle Destruction>" in line or
-            "<local client>: Entering control state dead" in line) and (
-                self.active_ship_id in line):
-            self.log.debug(f"read_log_line(): destroy_player_zone with: {line}")
-            self.destroy_player_zone()
-        elif self.rsi_handle["current"] in line:
-            if "OnEntityEnterZone" in line:
-                self.log.debug(f"read_log_line(): set_player_zone with: {line}.")
-                self.set_player_zone(line, False)
-            if "CActor::Kill" in line and not self.check_ignored_victims(line) and upload_kills:
-                kill_result = self.parse_kill_line(line, self.rsi_handle["current"])
-                self.log.debug(f"read_log_line(): kill_result with: {line}.")
-                # Do not send
-                if kill_result["result"] == "exclusion" or kill_result["result"] == "reset":
-                    self.log.debug(f"read_log_line(): Not posting {kill_result['result']} death: {line}.")
-                    return
-                # Log a message for the current user's death
-                elif kill_result["result"] == "killed" or kill_result["result"] == "suicide":
-                    self.curr_killstreak = 0
-                    self.gui.curr_killstreak_label.config(text=f"Current Killstreak: {self.curr_killstreak}", fg="yellow")
-                    self.death_total += 1
-                    self.gui.session_deaths_label.config(text=f"Total Session Deaths: {self.death_total}", fg="red")
-                    self.log.info("You have fallen in the service of BlightVeil.")
-                    if kill_result["result"] == "killed":
-                        self.log.info(f'You were killed by {kill_result["data"]["killer"]} with {kill_result["data"]["weapon"]}.')
-                    # Send death-event to the server via heartbeat
-                    self.cm.post_heartbeat_event(kill_result["data"]["victim"], kill_result["data"]["zone"], None)
-                    self.destroy_player_zone()
-                    self.update_kd_ratio()
-                    if kill_result["result"] == "killed" and self.game_mode == "EA_FreeFlight":
-                        death_result = self.parse_death_line(line, self.rsi_handle["current"])
-                        self.api.post_kill_event(death_result, "reportACKill")
-                # Log a message for the current user's kill
-                elif kill_result["result"] == "killer":
-                    self.curr_killstreak += 1
-                    if self.curr_killstreak > self.max_killstreak:
-                        self.max_killstreak = self.curr_killstreak
-                    self.kill_total += 1
-                    self.gui.curr_killstreak_label.config(text=f"Current Killstreak: {self.curr_killstreak}", fg="#04B431")
-                    self.gui.max_killstreak_label.config(text=f"Max Killstreak: {self.max_killstreak}", fg="#04B431")
-                    self.gui.session_kills_label.config(text=f"Total Session Kills: {self.kill_total}", fg="#04B431")
-                    self.log.success(f"You have killed {kill_result['data']['victim']},")
-                    self.log.info(f"and brought glory to BlightVeil.")
-                    self.sounds.play_random_sound()
-                    self.api.post_kill_event(kill_result, "reportKill")
-                    self.update_kd_ratio()
-                else:
-                    self.log.error(f"Kill failed to parse: {line}")
-        elif "<Jump Drive State Changed>" in line:
+    def update_vehicle_status(self, status_text:str) -> None:
+        """Update the vehicle status label, deferred to the end of a backlog replay."""
+        if not self.replaying_backlog:
+            self.event_bus.publish(VehicleStatus(status_text))
+
+    def read_log_line(self, line: str, upload_kills: bool) -> bool:
+        """Classify the line in a single scan and dispatch it to its event handler, return True if it was an event."""
+        event_types = self.classify_line(line)
+        for event_type in event_types:
+            # Handlers return True once they have consumed the line
+            if self.event_handlers[event_type](line, upload_kills):
+                break
+        return bool(event_types)
+
+    def read_log_lines(self, lines: list, upload_kills: bool) -> None:
+        """Dispatch a batch of live lines, a failing line does not drop the rest of the batch."""
+        self.batch_read_at = time()
+        for line in lines:
+            try:
+                if self.read_log_line(line, upload_kills):
+                    self.record_dispatch_latency(line)
+            except Exception as e:
+                self.log.error(f"read_log_lines(): Error: {e.__class__.__name__} {e}")
+
+    def record_dispatch_latency(self, line: str) -> None:
+        """Measure how long after its timestamp a live line was dispatched."""
+        written_at = parse_log_timestamp(line)
+        if written_at is None:
+            return
+        latency = max(time() - written_at, 0.0)
+        stats = self.dispatch_latency
+        stats["count"] += 1
+        stats["last"] = latency
+        stats["avg"] += (latency - stats["avg"]) / stats["count"]
+        stats["max"] = max(stats["max"], latency)
+        # Lines dispatched outside tail_log, e.g. by the headless parser, have no watcher
+        backend = self.file_watcher.name if self.file_watcher else "none"
+        self.log.debug(f"record_dispatch_latency(): {latency * 1000:.0f} ms via {backend}, avg {stats['avg'] * 1000:.0f} ms")
+
+    def handle_login(self, line: str, upload_kills: bool) -> bool:
+        """Handle a login, a relogin mid-session replaces the RSI handle."""
+        try:
+            rsi_handle = parse_rsi_handle(line)
+        except (IndexError, ValueError):
+            # Malformed line, keep the handle as it is
+            return True
+        if rsi_handle != self.rsi_handle["current"]:
+            self.rsi_handle["current"] = rsi_handle
+            self.log.success(f"Current RSI handle is {rsi_handle}.")
+        return True
+
+    def handle_character(self, line: str, upload_kills: bool) -> bool:
+        """Handle the character status of a login, switching characters replaces the GEID."""
+        try:
+            player_geid = parse_player_geid(line)
+        except IndexError:
+            return True
+        if player_geid != self.player_geid["current"]:
+            self.player_geid["current"] = player_geid
+            self.log.info(f"Current User GEID is {player_geid}.")
+        return True
+
+    def handle_vehicle_control(self, line: str, upload_kills: bool) -> bool:
+        """Handle the player taking or releasing control of a vehicle."""
+        if not upload_kills:
+            return False
+        if is_vehicle_enter(line):
+            ship_enter = parse_ship_info(line)
+            if ship_enter:
+                self.active_ship["current"] = ship_enter.ship
+                self.active_ship_id = ship_enter.ship_id
+                self.log.info(f"Entered ship: {self.active_ship['current']} (ID: {self.active_ship_id})")
+                self.update_vehicle_status(self.active_ship["current"])
+            return True
+        if is_vehicle_exit(line):
+            self.active_ship["current"] = "FPS"
+            self.active_ship_id = "N/A"
+            self.log.info("Exited ship: Defaulted to FPS (on-foot)")
+            self.update_vehicle_status("FPS")
+            return True
+        return False
+
+    def handle_game_mode(self, line: str, upload_kills: bool) -> bool:
+        """Handle a finished context load which carries the game mode."""
+        self.set_game_mode(line)
+        self.log.debug(f"read_log_line(): set_game_mode with: {line}.")
+        return True
+
+    def handle_ac_ship_spawn(self, line: str, upload_kills: bool) -> bool:
+        """Handle the player's ship spawning in Arena Commander."""
+        if "SC_Default" == self.game_mode or self.player_geid["current"] not in line:
+            return False
+        self.set_ac_ship(line)
+        self.log.debug(f"read_log_line(): set_ac_ship with: {line}.")
+        return True
+
+    def handle_vehicle_destruction(self, line: str, upload_kills: bool) -> bool:
+        """Handle the destruction of the player's active ship."""
+        if self.active_ship_id not in line:
+            return False
+        self.log.debug(f"read_log_line(): destroy_player_zone with: {line}")
+        self.destroy_player_zone()
+        return True
+
+    def handle_player_event(self, line: str, upload_kills: bool) -> bool:
+        """Handle zone changes and kills involving the current player."""
+        if self.rsi_handle["current"] not in line:
+            return False
+        if "OnEntityEnterZone" in line:
             self.log.debug(f"read_log_line(): set_player_zone with: {line}.")
-            self.set_player_zone(line, True)
+            self.set_player_zone(line, False)
+        if "CActor::Kill" in line and not self.check_ignored_victims(line) and upload_kills:
+            self.handle_kill(line)
+        return True
+
+    def handle_jump_drive(self, line: str, upload_kills: bool) -> bool:
+        """Handle a jump drive state change."""
+        if self.rsi_handle["current"] in line:
+            # Lines naming the player belong to player events only
+            return True
+        self.log.debug(f"read_log_line(): set_player_zone with: {line}.")
+        self.set_player_zone(line, True)
+        return True
+
+    def handle_kill(self, line: str) -> None:
+        """Parse a kill line of the current player and report it."""
+        read_at = self.batch_read_at if self.batch_read_at else time()
+        event = self.parse_kill_line(line, self.rsi_handle["current"])
+        if isinstance(event, (KillEvent, DeathEvent)):
+            event.stages.update(written=parse_log_timestamp(line), read=read_at, parsed=time())
+        self.log.debug(f"read_log_line(): kill_result with: {line}.")
+        # Do not send
+        if isinstance(event, KillIgnored):
+            self.log.debug(f"read_log_line(): Not posting {event.reason} death: {line}.")
+            return
+        # Log a message for the current user's death
+        elif isinstance(event, DeathEvent):
+            self.curr_killstreak = 0
+            self.death_total += 1
+            self.log.info("You have fallen in the service of BlightVeil.")
+            if not event.suicide:
+                self.log.info(f'You were killed by {event.killer} with {event.weapon}.')
+            # Heartbeat and upload consumers report the death
+            event.stages["enqueued"] = time()
+            self.event_bus.publish(event)
+            self.destroy_player_zone()
+            self.update_kd_ratio(True)
+        # Log a message for the current user's kill
+        elif isinstance(event, KillEvent):
+            self.curr_killstreak += 1
+            if self.curr_killstreak > self.max_killstreak:
+                self.max_killstreak = self.curr_killstreak
+            self.kill_total += 1
+            self.log.success(f"You have killed {event.victim},")
+            self.log.info("and brought glory to BlightVeil.")
+            # Sound and upload consumers take it from here
+            event.stages["enqueued"] = time()
+            self.event_bus.publish(event)
+            self.update_kd_ratio()
+        else:
+            self.log.error(f"Kill failed to parse: {line}")
 
     def set_game_mode(self, line:str) -> None:
         """Parse log for current active game mode."""
-        split_line = line.split(' ')
-        curr_game_mode = split_line[8].split("=")[1].strip("\"")
+        curr_game_mode = parse_game_mode(line)
         if self.game_mode != curr_game_mode:
             self.game_mode = curr_game_mode
         if "SC_Default" == curr_game_mode:
             self.active_ship["current"] = "FPS"
             self.active_ship_id = "N/A"
-            self.gui.update_vehicle_status("FPS")
+            self.update_vehicle_status("FPS")
 
     def set_ac_ship(self, line:str) -> None:
         """Parse log for current active ship."""
         self.active_ship["current"] = line.split(' ')[5][1:-1]
         self.log.debug(f"Player has entered ship: {self.active_ship['current']}")
-        self.gui.update_vehicle_status(self.active_ship["current"])
+        self.update_vehicle_status(self.active_ship["current"])
 
     def destroy_player_zone(self) -> None:
         self.log.debug(f"Ship Destroyed: {self.active_ship['current']} with ID: {self.active_ship_id}")
         self.active_ship["current"] = "FPS"
         self.active_ship_id = "N/A"
-        self.gui.update_vehicle_status("FPS")
+        self.update_vehicle_status("FPS")
 
     def set_player_zone(self, line: str, use_jd) -> None:
         """Set current active ship zone."""
@@ -235,7 +473,7 @@ class LogParser():
         if 0 == line_index:
             self.log.debug(f"Active Zone Change: {self.active_ship['current']}")
             self.active_ship["current"] = "FPS"
-            self.gui.update_vehicle_status("FPS")
+            self.update_vehicle_status("FPS")
             return
         if not use_jd:
             potential_zone = line[line_index:].split(' ')[0]
@@ -247,16 +485,17 @@ class LogParser():
                 self.active_ship["current"] = potential_zone[:potential_zone.rindex('_')]
                 self.active_ship_id = potential_zone[potential_zone.rindex('_') + 1:]
                 self.log.debug(f"Active Zone Change: {self.active_ship['current']} with ID: {self.active_ship_id}")
-                self.cm.post_heartbeat_event(None, None, self.active_ship["current"])
-                self.gui.update_vehicle_status(self.active_ship["current"])
+                if not self.replaying_backlog:
+                    self.event_bus.publish(ZoneChange(self.active_ship["current"], use_jd))
+                self.update_vehicle_status(self.active_ship["current"])
                 return
       
     def check_ignored_victims(self, line) -> bool:
         """Check if any ignored victims are present in the given line."""
-        for data in self.api.sc_data["ignoredVictimRules"]:
-            if data["value"].lower() in line.lower():
-                self.log.debug(f"Found the human readable string: {data['value']} in the raw log string: {line}")
-                return True
+        rule = self.api.victim_matcher.match(line)
+        if rule is not None:
+            self.log.debug(f"Found the human readable string: {rule} in the raw log string: {line}")
+            return True
         return False
 
     def check_exclusion_scenarios(self, line:str) -> bool:
@@ -282,23 +521,24 @@ class LogParser():
     def get_sc_data(self, data_type:str, data_id:str) -> str:
         """Get the human readable string from the parsed log value."""
         try:
-            for data in self.api.sc_data[data_type]:
-                if data["id"] in data_id:
-                    self.log.debug(f"Found the human readable string: {data['name']} of the raw log string: {data_id}")
-                    return data["name"]
+            index = self.api.data_indexes[data_type]
+            if data_id in index.cache:
+                # Already resolved and logged before
+                return index.resolve(data_id)
+            name = index.resolve(data_id)
+            if name is not None:
+                self.log.debug(f"Found the human readable string: {name} of the raw log string: {data_id}")
+                return name
             self.log.warning(f"Did not find the human readable version of the raw log string: {data_id}")
         except Exception as e:
             self.log.error(f"get_weapon(): Error: {e.__class__.__name__} {e}")
             return data_id
 
     def parse_kill_line(self, line:str, curr_user:str):
-        """Parse kill event."""
+        """Parse a kill line into a KillEvent, DeathEvent or KillIgnored, None if it can't be parsed."""
         try:
-            kill_result = {"result": "", "data": {}}
-
             if not self.check_exclusion_scenarios(line):
-                kill_result["result"] = "exclusion"
-                return kill_result
+                return KillIgnored("exclusion")
             
             split_line = line.split(' ')
 
@@ -311,100 +551,56 @@ class LogParser():
 
             if killed == killer:
                 # Current user killed themselves
-                kill_result["result"] = "suicide"
-                kill_result["data"] = {
-                    'player': curr_user,
-                    'weapon': weapon,
-                    'zone': killed_zone
-                }
+                return DeathEvent(kill_time, curr_user, killer, weapon, killed_zone, self.game_mode, suicide=True)
             elif killed == curr_user:
-                mapped_weapon = self.get_sc_data("weapons", weapon)
                 # Current user died
-                kill_result["result"] = "killed"
-                kill_result["data"] = {
-                    'player': curr_user,
-                    'victim': curr_user,
-                    'killer': killer,
-                    'weapon': mapped_weapon,
-                    'zone': self.active_ship["current"]
-                }
+                mapped_weapon = self.get_sc_data("weapons", weapon)
+                return DeathEvent(kill_time, curr_user, killer, mapped_weapon, self.active_ship["current"], self.game_mode)
             elif killer.lower() == "unknown":
                 # Potential Ship reset
-                kill_result["result"] = "reset"
-            else:
-                # Current user killed other player
-                kill_result["result"] = "killer"
-                kill_result["data"] = {
-                    'player': curr_user,
-                    'victim': killed,
-                    'time': kill_time,
-                    'zone': killed_zone,
-                    'weapon': weapon,
-                    'rsi_profile': rsi_profile,
-                    'game_mode': self.game_mode,
-                    'client_ver': self.local_version,
-                    'killers_ship': self.active_ship["current"],
-                    'anonymize_state': self.anonymize_state
-                }
-            return kill_result
+                return KillIgnored("reset")
+            # Current user killed other player
+            return KillEvent(
+                kill_time, curr_user, killed, killed_zone, weapon, rsi_profile, self.game_mode,
+                self.local_version, self.active_ship["current"], dict(self.anonymize_state)
+            )
         except Exception as e:
             self.log.error(f"parse_kill_line(): Error: {e.__class__.__name__} {e}")
-            return {"result": "", "data": None}
-
-    def parse_death_line(self, line:str, curr_user:str):
-        """Parse death event."""
-        try:
-            death_result = {"result": "", "data": {}}
-
-            if not self.check_exclusion_scenarios(line):
-                death_result["result"] = "exclusion"
-                return death_result
+            return None
 
-            split_line = line.split(' ')
+    def bootstrap_session(self) -> SessionBootstrap:
+        """Recover the RSI handle, GEID, game mode and ship from the log before tailing starts."""
+        bootstrap = self.checkpoint.load(self.log_file_location) if self.checkpoint else None
+        if bootstrap:
+            # Same Game.log as last time, pick up where tailing stopped
+            self.log.info(f"Resuming the game log from the last checkpoint at {bootstrap.resume_offset / 1e6:.1f} MB.")
+        elif self.bootstrap_mode == "reverse":
+            bootstrap = self.session_scanner.scan_reverse(self.log_file_location)
+        else:
+            bootstrap = self.session_scanner.scan(self.log_file_location)
+        self.log.debug(f"bootstrap_session(): {bootstrap}")
+        self.rsi_handle["current"] = bootstrap.rsi_handle
+        self.player_geid["current"] = bootstrap.player_geid
+        self.game_mode = bootstrap.game_mode
+        self.active_ship["current"] = bootstrap.active_ship
+        self.active_ship_id = bootstrap.active_ship_id
+        self.resume_offset = bootstrap.resume_offset
+        if bootstrap.rsi_handle == "N/A":
+            self.log.error("RSI Handle not found. Please ensure the game is running and the log file is accessible.")
+            self.gui.api_status_label.config(text="Key Status: Error", fg="yellow")
+        if self.checkpoint:
+            self.checkpoint.track(self.log_file_location)
+        return bootstrap
 
-            kill_time = split_line[0].strip('\'')
-            killer = split_line[12].strip('\'')
+    def save_checkpoint(self, offset: int, force: bool = False) -> None:
+        """Save the session state up to the byte offset, throttled by the checkpoint store."""
+        if self.checkpoint:
+            self.checkpoint.save(SessionBootstrap(
+                self.rsi_handle["current"], self.player_geid["current"], self.game_mode,
+                self.active_ship["current"], self.active_ship_id, offset
+            ), force)
 
-            death_result["result"] = "killed"
-            death_result["data"] = {
-                'time': kill_time,
-                'player': killer,
-                'victim': curr_user,
-                'game_mode': self.game_mode,
-            }
-            return death_result
-        except Exception as e:
-            self.log.error(f"parse_kill_line(): Error: {e.__class__.__name__} {e}")
-            return {"result": "", "data": None}
-
-    def find_rsi_handle(self) -> str:
-        """Get the current user's RSI handle."""
-        acct_str = "<Legacy login response> [CIG-net] User Login Success"
-        sc_log = open(self.log_file_location, "r")
-        lines = sc_log.readlines()
-        for line in lines:
-            if -1 != line.find(acct_str):
-                line_index = line.index("Handle[") + len("Handle[")
-                if 0 == line_index:
-                    self.log.error("RSI Handle not found. Please ensure the game is running and the log file is accessible.")
-                    self.gui.api_status_label.config(text="Key Status: Error", fg="yellow")
-                    return "N/A"
-                potential_handle = line[line_index:].split(' ')[0]
-                return potential_handle[0:-1]
-        self.log.error("RSI Handle not found. Please ensure the game is running and the log file is accessible.")
-        self.gui.api_status_label.config(text="Key Status: Error", fg="yellow")
-        return "N/A"
-
-    def find_rsi_geid(self) -> str:
-        """Get the current user's GEID."""
-        acct_kw = "AccountLoginCharacterStatus_Character"
-        sc_log = open(self.log_file_location, "r")
-        lines = sc_log.readlines()
-        for line in lines:
-            if -1 != line.find(acct_kw):
-                return line.split(' ')[11]
-                
-    def update_kd_ratio(self) -> None:
+    def update_kd_ratio(self, died: bool = False) -> None:
         """Update KDR."""
         self.log.debug(f"update_kd_ratio(): Kills={self.kill_total}, Deaths={self.death_total}")
         if self.kill_total == 0 and self.death_total == 0:
@@ -414,16 +610,17 @@ class LogParser():
         else:
             kd = self.kill_total / self.death_total
             kd_display = f"{kd:.2f}"
-        # Update the KD label in the GUI
-        if hasattr(self.gui, 'kd_ratio_label'):
-            self.gui.kd_ratio_label.config(text=f"KD Ratio: {kd_display}", fg="#00FFFF")
+        # The GUI consumer updates the session labels
+        self.event_bus.publish(SessionStats(
+            self.kill_total, self.death_total, self.curr_killstreak, self.max_killstreak, kd_display, died
+        ))
 
     def handle_player_death(self) -> None:
         """Handle KDR when user dies."""
         self.curr_killstreak = 0
         self.death_total += 1
         # ... other updates ...
-        self.update_kd_ratio()
+        self.update_kd_ratio(True)
 
     def handle_player_kill(self) -> None:
         """Handle KDR when user gets a kill."""
@@ -432,4 +629,83 @@ class LogParser():
             self.max_killstreak = self.curr_killstreak
         self.kill_total += 1
         # ... other updates ...
-        self.update_kd_ratio()
\ No newline at end of file
+        self.update_kd_ratio()
+
+#########################################################################################################
+### EVENT CONSUMERS                                                                                   ###
+#########################################################################################################
+
+    def show_event(self, event) -> None:
+        """GUI consumer: reflect the vehicle status and session counters in the labels."""
+        if isinstance(event, VehicleStatus):
+            self.gui.update_vehicle_status(event.status)
+            return
+        streak_color = "yellow" if event.died else "#04B431"
+        self.gui.curr_killstreak_label.config(text=f"Current Killstreak: {event.curr_killstreak}", fg=streak_color)
+        if event.died:
+            self.gui.session_deaths_label.config(text=f"Total Session Deaths: {event.deaths}", fg="red")
+        else:
+            self.gui.max_killstreak_label.config(text=f"Max Killstreak: {event.max_killstreak}", fg="#04B431")
+            self.gui.session_kills_label.config(text=f"Total Session Kills: {event.kills}", fg="#04B431")
+        if hasattr(self.gui, 'kd_ratio_label'):
+            self.gui.kd_ratio_label.config(text=f"KD Ratio: {event.kd_display}", fg="#00FFFF")
+
+    def play_event_sound(self, event: KillEvent) -> None:
+        """Sound consumer: celebrate a kill."""
+        self.sounds.play_random_sound()
+
+    def get_upload_endpoint(self, event) -> str:
+        """Get the Servitor endpoint an event is reported to, None if it is not reported."""
+        if isinstance(event, KillEvent):
+            return "reportKill"
+        if isinstance(event, DeathEvent) and not event.suicide and event.game_mode == "EA_FreeFlight":
+            return "reportACKill"
+        return None
+
+    def upload_events(self, events:list) -> None:
+        """Upload consumer: post a batch of events to Servitor, one request per endpoint."""
+        batches = {}
+        for event in events:
+            endpoint = self.get_upload_endpoint(event)
+            if endpoint:
+                batches.setdefault(endpoint, []).append(event)
+        for endpoint, batch in batches.items():
+            sent_at = time()
+            for event in batch:
+                event.stages["sent"] = sent_at
+            # Failed posts are pickled by the API client
+            results = self.api.post_kill_events(batch, endpoint)
+            done_at = time()
+            for event, acked in zip(batch, results):
+                if acked is None:
+                    # Dropped without a key, never reaches Servitor
+                    continue
+                event.stages["acked" if acked else "pickled"] = done_at
+                self.record_kill_latency(event)
+        batch_endpoints = getattr(self.api, "batch_endpoints", None)
+        if batch_endpoints is not None:
+            # Without batch endpoints the kills are posted one by one anyway, so they are not held back
+            self.upload_consumer.batch_window = self.upload_batch_window if batch_endpoints else 0.0
+
+    def spill_upload(self, event) -> None:
+        """Pickle an event the upload queue has no room for, the log pickler posts it later."""
+        endpoint = self.get_upload_endpoint(event)
+        if endpoint:
+            self.log.warning("Upload queue is full, pickling kill.")
+            self.api.pickle_kill_event(event, endpoint)
+            event.stages["pickled"] = time()
+            self.record_kill_latency(event)
+
+    def record_kill_latency(self, event) -> None:
+        """Add the stage timestamps of an uploaded or pickled event to the latency tracker."""
+        if event.stages.get("written") is None:
+            # The line had no timestamp
+            event.stages.pop("written", None)
+        self.kill_latency.record(event.stages)
+
+    def send_heartbeat(self, event) -> None:
+        """Heartbeat consumer: tell commander mode about deaths and ship changes."""
+        if isinstance(event, DeathEvent):
+            self.cm.post_heartbeat_event(event.player, event.zone, None)
+        else:
+            self.cm.post_heartbeat_event(None, None, event.zone)
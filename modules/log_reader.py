@@ -0,0 +1,203 @@
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+# Ranges smaller than this are not worth a worker process
+MIN_RANGE_SIZE = 16 * 1024 * 1024
+
+def iter_line_batches(sc_log, chunk_size:int, encoding:str, errors:str, anchors:tuple=None, progress:dict=None):
+    """Yield (lines, end_offset) for every chunk of complete lines from the current position to EOF.
+
+    With anchors only the lines containing one of them are decoded and yielded. A progress dict gets every
+    complete line read added to progress["lines"], the dropped ones included.
+    """
+    offset = sc_log.tell()
+    pending = b""
+    while True:
+        chunk = sc_log.read(chunk_size)
+        if not chunk:
+            return
+        # Only hand out complete lines, the incomplete tail is carried into the next chunk
+        chunk = pending + chunk
+        end = chunk.rfind(b"\n") + 1
+        pending = chunk[end:]
+        if not end:
+            continue
+        offset += end
+        if progress is not None:
+            progress["lines"] = progress.get("lines", 0) + chunk.count(b"\n", 0, end)
+        yield decode_lines(chunk, end, encoding, errors, anchors), offset
+
+def decode_lines(data:bytes, end:int, encoding:str, errors:str, anchors:tuple=None) -> list:
+    """Decode the complete lines in data[:end], only those containing one of the anchors if any are given."""
+    if anchors is None:
+        return data[:end].decode(encoding, errors).splitlines(keepends=True)
+    lines = []
+    for span_start, span_end in find_line_spans(data, anchors, 0, end):
+        # Split like a chunk decode would, so the lines match the unfiltered path
+        lines.extend(data[span_start:span_end].decode(encoding, errors).splitlines(keepends=True))
+    return lines
+
+def find_line_starts(data:bytes, anchors) -> list:
+    """Get the sorted start offsets of the lines in the buffer that contain any of the anchors."""
+    line_starts = set()
+    find = data.find
+    for anchor in anchors:
+        index = find(anchor)
+        while index != -1:
+            line_starts.add(data.rfind(b"\n", 0, index) + 1)
+            # Continue after the end of this line
+            line_end = find(b"\n", index)
+            if line_end == -1:
+                break
+            index = find(anchor, line_end)
+    return sorted(line_starts)
+
+def split_line_ranges(data, start:int, end:int, parts:int) -> list:
+    """Split the bytes between two line starts into (start, end) ranges that begin and end on line boundaries."""
+    ranges = []
+    size = max((end - start) // max(parts, 1), 1)
+    while start < end:
+        newline = data.find(b"\n", min(start + size, end) - 1, end)
+        range_end = newline + 1 if newline != -1 else end
+        ranges.append((start, range_end))
+        start = range_end
+    return ranges
+
+def find_line_spans(data, anchors, start:int, end:int) -> list:
+    """Get the sorted (start, end) offsets of the lines in the range that contain any of the anchors."""
+    spans = set()
+    find = data.find
+    for anchor in anchors:
+        index = find(anchor, start, end)
+        while index != -1:
+            newline = data.rfind(b"\n", start, index)
+            line_end = find(b"\n", index, end)
+            line_end = line_end + 1 if line_end != -1 else end
+            spans.add((newline + 1 if newline != -1 else start, line_end))
+            index = find(anchor, line_end, end)
+    return sorted(spans)
+
+def count_lines(data, start:int, end:int, chunk_size:int=1024 * 1024) -> int:
+    """Count the newlines in the range, a chunk at a time since mmap has no count()."""
+    lines = 0
+    for chunk_start in range(start, end, chunk_size):
+        lines += data[chunk_start:min(chunk_start + chunk_size, end)].count(b"\n")
+    return lines
+
+def scan_line_range(log_file_location:str, start:int, end:int, anchors:tuple) -> tuple:
+    """Find the candidate lines of one range of the memory-mapped log and count all of its lines, runs in a worker process."""
+    with open(log_file_location, "rb") as sc_log:
+        with mmap.mmap(sc_log.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return find_line_spans(data, anchors, start, end), count_lines(data, start, end)
+
+def iter_candidate_batches(
+    log_file_location:str, start:int, end:int, anchors:tuple, encoding:str, errors:str, workers:int=None, progress:dict=None
+):
+    """Yield (lines, end_offset) per range for the lines between the offsets that contain any of the anchors.
+
+    The ranges are prefiltered in parallel worker processes and handed out in file order. A progress dict
+    gets every line of the range added to progress["lines"], like iter_line_batches.
+    """
+    workers = workers if workers else os.cpu_count()
+    with open(log_file_location, "rb") as sc_log:
+        with mmap.mmap(sc_log.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            end = min(end, len(data))
+            parts = min(workers * 4, max((end - start) // MIN_RANGE_SIZE, 1))
+            ranges = split_line_ranges(data, start, end, parts)
+            if not ranges:
+                return
+            with ProcessPoolExecutor(max_workers=min(workers, len(ranges))) as executor:
+                results = executor.map(
+                    scan_line_range, [log_file_location] * len(ranges),
+                    [range_start for range_start, _ in ranges], [range_end for _, range_end in ranges],
+                    [anchors] * len(ranges)
+                )
+                for (_, range_end), (spans, line_count) in zip(ranges, results):
+                    if progress is not None:
+                        progress["lines"] = progress.get("lines", 0) + line_count
+                    lines = []
+                    for span_start, span_end in spans:
+                        lines.extend(data[span_start:span_end].decode(encoding, errors).splitlines(keepends=True))
+                    yield lines, range_end
+
+def find_last_line_end(sc_log, chunk_size:int) -> int:
+    """Get the byte offset right after the last complete line of the file."""
+    pos = sc_log.seek(0, 2)
+    while pos > 0:
+        start = max(0, pos - chunk_size)
+        sc_log.seek(start)
+        newline = sc_log.read(pos - start).rfind(b"\n")
+        if newline != -1:
+            return start + newline + 1
+        pos = start
+    return 0
+
+def iter_lines_reversed(sc_log, end:int, chunk_size:int, encoding:str, errors:str, anchors):
+    """Yield the lines before the end offset that contain any of the anchors, newest first."""
+    pos = end
+    carry = b""
+    while pos > 0:
+        start = max(0, pos - chunk_size)
+        sc_log.seek(start)
+        data = sc_log.read(pos - start) + carry
+        pos = start
+        if start > 0:
+            # The first line of the block may begin in the previous block
+            cut = data.find(b"\n") + 1
+            if not cut:
+                carry = data
+                continue
+            carry = data[:cut]
+            data = data[cut:]
+        for line_start in reversed(find_line_starts(data, anchors)):
+            line_end = data.find(b"\n", line_start) + 1 or len(data)
+            yield data[line_start:line_end].decode(encoding, errors)
+
+class LogTailer():
+    """Reads what was appended to the log a budget of chunks at a time and hands out the complete lines."""
+    def __init__(self, sc_log, encoding:str, errors:str, chunk_size:int=1024 * 1024, anchors:tuple=None, max_chunks:int=8):
+        self.encoding = encoding
+        self.errors = errors
+        self.chunk_size = chunk_size
+        # Lines without any of these bytes are dropped before decoding, None hands out every line
+        self.anchors = anchors
+        # Chunks read per call at most, so a long run of noise doesn't hold the tail thread until EOF
+        self.max_chunks = max_chunks
+        # False while more than the last call's budget is waiting to be read
+        self.eof = False
+        # Complete lines read from the log, including the ones dropped by the anchors
+        self.lines_read = 0
+        self.attach(sc_log)
+
+    def attach(self, sc_log) -> None:
+        """Start tailing a (re)opened log file from its current position."""
+        self.sc_log = sc_log
+        self.pending = b""
+        self.offset = sc_log.tell()
+
+    def read_lines(self) -> list:
+        """Read the bytes available now, up to max_chunks chunks, and return the complete lines.
+
+        The result is empty once everything written was read, then eof is True. It is also empty when the budget
+        only found noise, then eof is False and the offset has still moved on.
+        """
+        self.eof = False
+        for _ in range(self.max_chunks):
+            data = self.sc_log.read(self.chunk_size)
+            if not data:
+                self.eof = True
+                return []
+            # An incomplete last line is kept until the game finishes writing it
+            data = self.pending + data
+            end = data.rfind(b"\n") + 1
+            self.pending = data[end:]
+            if not end:
+                continue
+            self.offset += end
+            self.lines_read += data.count(b"\n", 0, end)
+            lines = decode_lines(data, end, self.encoding, self.errors, self.anchors)
+            # A chunk of noise only is dropped, keep reading instead of waiting for the next write
+            if lines:
+                return lines
+        return []
@@ -0,0 +1,206 @@
+from pathlib import Path
+from time import perf_counter
+
+# Import global settings
+import global_settings
+
+class LatencyHistogram():
+    """Counts durations in power of two microsecond buckets, so percentiles survive without keeping samples."""
+    BUCKETS = 26
+
+    def __init__(self):
+        self.buckets = [0] * self.BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds:float) -> None:
+        # Bucket i holds durations below 2 ** i microseconds
+        self.buckets[min(int(seconds * 1e6).bit_length(), self.BUCKETS - 1)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, fraction:float) -> float:
+        """Get the upper bound in seconds of the bucket holding the given fraction of the durations."""
+        if not self.count:
+            return 0.0
+        rank = fraction * self.count
+        seen = 0
+        for index, bucket in enumerate(self.buckets):
+            seen += bucket
+            if seen >= rank:
+                return min(2 ** index / 1e6, self.max)
+        return self.max
+
+    def snapshot(self) -> dict:
+        return {
+            "count": self.count,
+            "total": self.total,
+            "avg": self.total / self.count if self.count else 0.0,
+            "p50": self.percentile(0.5),
+            "p95": self.percentile(0.95),
+            "p99": self.percentile(0.99),
+            "max": self.max,
+            "buckets_us": {2 ** index: bucket for index, bucket in enumerate(self.buckets) if bucket},
+        }
+
+class ParserMetrics():
+    """Times the parser's hot path while enabled, the wrappers are removed again when disabled."""
+    # Parser methods timed on the tail thread
+    TIMED_METHODS = ("read_log_line", "parse_kill_line", "get_sc_data")
+
+    def __init__(self, parser, dump_interval:float=60, latency_report:str=str(Path.cwd() / "kill_latency_report.json")):
+        self.log = None
+        self.parser = parser
+        self.dump_interval = dump_interval
+        # Exported with every dump that saw new kills
+        self.latency_report = latency_report
+        self.last_dump = None
+        self.kills_exported = 0
+        self.enabled = False
+        self.histograms = {}
+        # Lines the tailer had read at the last reset
+        self.lines_read_base = 0
+        # (target, name, original, is_item) of every installed wrapper
+        self.originals = []
+
+    def enable(self) -> None:
+        """Wrap the parser methods, event handlers, event bus and consumers with timers."""
+        if self.enabled:
+            return
+        parser = self.parser
+        if not self.histograms:
+            # Lines are counted from the first time the metrics are switched on, like the timings
+            self.lines_read_base = self.get_tailer_lines()
+        for name in self.TIMED_METHODS:
+            self.wrap(parser, name, self.timed(name, getattr(parser, name)))
+        for event_type, handler in list(parser.event_handlers.items()):
+            self.wrap(parser.event_handlers, event_type, self.timed(f"event.{event_type}", handler), item=True)
+        # Handing events to the consumers is the last step on the tail thread
+        self.wrap(parser.event_bus, "publish", self.timed("event_bus.publish", parser.event_bus.publish))
+        # GUI, sound and network calls run on the consumer threads
+        for name, consumer in parser.event_bus.consumers.items():
+            self.wrap(consumer, "handler", self.timed(f"consumer.{name}", consumer.handler))
+        self.enabled = True
+
+    def disable(self) -> None:
+        """Put the original methods back, the collected metrics are kept."""
+        for target, name, original, item in reversed(self.originals):
+            if item:
+                target[name] = original
+            elif original is None:
+                delattr(target, name)
+            else:
+                setattr(target, name, original)
+        self.originals.clear()
+        self.enabled = False
+
+    def wrap(self, target, name:str, wrapper, item:bool=False) -> None:
+        if item:
+            self.originals.append((target, name, target[name], True))
+            target[name] = wrapper
+            return
+        # Bound methods are shadowed by an instance attribute and restored by deleting it
+        self.originals.append((target, name, target.__dict__.get(name), False))
+        setattr(target, name, wrapper)
+
+    def timed(self, name:str, function):
+        """Get a wrapper recording the duration of every call into the named histogram."""
+        histogram = self.histograms.setdefault(name, LatencyHistogram())
+        record = histogram.record
+        def wrapper(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                record(perf_counter() - start)
+        return wrapper
+
+    def observe(self, name:str, seconds:float) -> None:
+        """Record a duration measured elsewhere, e.g. the tail lag, while enabled."""
+        if self.enabled:
+            self.histograms.setdefault(name, LatencyHistogram()).record(seconds)
+
+    def reset(self) -> None:
+        """Start collecting from zero, the wrappers keep recording into the same histograms."""
+        for histogram in self.histograms.values():
+            histogram.__init__()
+        self.lines_read_base = self.get_tailer_lines()
+
+    def get_tailer_lines(self) -> int:
+        """Get the lines the live tail read so far, 0 before it started."""
+        return self.parser.tailer.lines_read if self.parser.tailer else 0
+
+    def get_lines_read(self) -> int:
+        """Get the lines the live tail read since the metrics were first enabled or reset."""
+        lines_read = self.get_tailer_lines()
+        if lines_read < self.lines_read_base:
+            # The tail was restarted with a new tailer
+            self.lines_read_base = 0
+        return lines_read - self.lines_read_base
+
+    def snapshot(self) -> dict:
+        """Get the lines read, the candidate lines dispatched, lines per event type, stage timings and event bus queues."""
+        histograms = {name: histogram.snapshot() for name, histogram in self.histograms.items()}
+        return {
+            "enabled": self.enabled,
+            # Every line of the log, most of them are dropped by the anchor prefilter before decoding
+            "lines_read": self.get_lines_read(),
+            # Lines with a trigger token, only these reach read_log_line
+            "candidate_lines": histograms.get("read_log_line", {}).get("count", 0),
+            "event_lines": {
+                name.split(".", 1)[1]: histogram["count"] for name, histogram in histograms.items() if name.startswith("event.")
+            },
+            "timings": histograms,
+            "event_bus": self.parser.event_bus.get_metrics(),
+            "tail_lag": dict(self.parser.tail_watchdog.lag),
+            "kill_latency": self.parser.kill_latency.report(),
+            # Headless parsers have no Servitor transport
+            "transport": self.parser.api.transport.get_metrics() if hasattr(self.parser.api, "transport") else {},
+            "scheduler": self.parser.scheduler.get_metrics() if self.parser.scheduler else {},
+        }
+
+    def format_snapshot(self) -> str:
+        snapshot = self.snapshot()
+        stages = ", ".join(
+            f"{name} n={timing['count']} p50={timing['p50'] * 1e6:.0f}us p99={timing['p99'] * 1e6:.0f}us max={timing['max'] * 1e6:.0f}us"
+            for name, timing in snapshot["timings"].items() if timing["count"]
+        )
+        lag = snapshot["tail_lag"]
+        lines = [
+            f"Parser metrics: {snapshot['lines_read']} lines ({snapshot['candidate_lines']} candidates), events {snapshot['event_lines']}, "
+            f"tail lag {lag['seconds']:.1f} s / {lag['bytes']} bytes (max {lag['max_seconds']:.1f} s, {lag['stalls']} stalls); {stages}",
+            self.parser.kill_latency.format_report(),
+        ]
+        transport = snapshot["transport"]
+        if transport:
+            lines.append(
+                f"Servitor: {transport['requests']} requests on {transport['connections']} connections ({transport['reuse_ratio']:.0%} reused)"
+            )
+        if snapshot["scheduler"]:
+            lines.append("Scheduler: " + ", ".join(
+                f"{name} next={task['next_due']:.1f}s last={task['last_run_time'] * 1000:.0f}ms max={task['max_run_time'] * 1000:.0f}ms"
+                for name, task in snapshot["scheduler"].items()
+            ))
+        return "\n".join(lines)
+
+    def tick(self) -> None:
+        """Follow Debug Mode: instrument the parser while it's on and dump the metrics to the debug log periodically, run every second by the scheduler."""
+        try:
+            if self.last_dump is None:
+                self.last_dump = perf_counter()
+            if global_settings.DEBUG_MODE["enabled"] and not self.enabled:
+                self.enable()
+            elif not global_settings.DEBUG_MODE["enabled"] and self.enabled:
+                self.disable()
+            if self.enabled and perf_counter() - self.last_dump >= self.dump_interval:
+                self.last_dump = perf_counter()
+                self.log.debug(self.format_snapshot())
+                kills = sum(self.parser.kill_latency.outcomes.values())
+                if kills != self.kills_exported:
+                    self.kills_exported = kills
+                    self.parser.kill_latency.export(self.latency_report)
+        except Exception as e:
+            self.log.error(f"ParserMetrics.tick(): Error: {e.__class__.__name__} {e}")
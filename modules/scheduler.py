@@ -0,0 +1,181 @@
+import heapq
+import random
+from concurrent.futures import ThreadPoolExecutor
+from itertools import count
+from threading import Thread, Condition
+from time import monotonic, perf_counter
+
+class ScheduledTask():
+    """A periodic or one-shot task, it never overlaps with itself."""
+    def __init__(self, name:str, function, interval:float=None, jitter:float=0.0, blocking:bool=False):
+        self.name = name
+        self.function = function
+        # None for one-shot timers
+        self.interval = interval
+        self.jitter = jitter
+        # Waits on the network or a long read, run apart from the short ticks of the worker pool
+        self.blocking = blocking
+        self.due = None
+        self.running = False
+        self.cancelled = False
+        self.runs = 0
+        self.failures = 0
+        self.last_run_time = 0.0
+        self.max_run_time = 0.0
+
+class Scheduler():
+    """Runs periodic tasks and timers from one timing thread on a small worker pool, instead of a sleeping thread per loop.
+
+    Blocking tasks run on a daemon thread of their own instead, so a slow request or log scan never delays the
+    short ticks and a stop without waiting doesn't keep the app open until they finish.
+    """
+    def __init__(self, workers:int=4):
+        self.log = None
+        self.workers = workers
+        self.executor = None
+        self.tasks = {}
+        # (due, sequence, task) entries, stale ones are skipped when popped
+        self.heap = []
+        self.sequence = count()
+        self.condition = Condition()
+        self.running = False
+        self.thread = None
+
+    def start(self) -> None:
+        """Start the timing thread if it's not already running."""
+        with self.condition:
+            if self.running:
+                return
+            self.running = True
+            self.executor = ThreadPoolExecutor(self.workers, thread_name_prefix="scheduler")
+        self.thread = Thread(target=self.run, name="scheduler", daemon=True)
+        self.thread.start()
+
+    def stop(self, wait:bool=True) -> None:
+        """Cancel every task and stop, optionally waiting for the running ones of the worker pool to finish."""
+        with self.condition:
+            self.running = False
+            for task in self.tasks.values():
+                task.cancelled = True
+            self.tasks.clear()
+            self.heap.clear()
+            self.condition.notify()
+        if self.executor:
+            self.executor.shutdown(wait=wait, cancel_futures=True)
+
+    def every(self, name:str, function, interval:float, jitter:float=0.0, delay:float=None, blocking:bool=False) -> ScheduledTask:
+        """Run the function every interval seconds, spread by up to jitter seconds either way, first after delay (default interval)."""
+        task = ScheduledTask(name, function, interval, jitter, blocking)
+        self.add(task, interval if delay is None else delay)
+        return task
+
+    def after(self, name:str, delay:float, function, blocking:bool=False) -> ScheduledTask:
+        """Run the function once after delay seconds."""
+        task = ScheduledTask(name, function, blocking=blocking)
+        self.add(task, delay)
+        return task
+
+    def add(self, task:ScheduledTask, delay:float) -> None:
+        with self.condition:
+            # A task of the same name is replaced
+            previous = self.tasks.get(task.name)
+            if previous:
+                previous.cancelled = True
+            self.tasks[task.name] = task
+            self.push(task, monotonic() + delay)
+
+    def push(self, task:ScheduledTask, due:float) -> None:
+        """Queue the task for the given time, the caller holds the condition."""
+        task.due = due
+        heapq.heappush(self.heap, (due, next(self.sequence), task))
+        self.condition.notify()
+
+    def wake(self, name:str) -> bool:
+        """Run the task now instead of at its due time, a running task runs again right after it finishes."""
+        with self.condition:
+            task = self.tasks.get(name)
+            if task is None or task.cancelled:
+                return False
+            if task.running:
+                task.due = monotonic()
+            else:
+                self.push(task, monotonic())
+            return True
+
+    def cancel(self, name:str) -> None:
+        """Cancel the task, a run in progress is finished but not repeated."""
+        with self.condition:
+            task = self.tasks.pop(name, None)
+            if task:
+                task.cancelled = True
+
+    def is_scheduled(self, name:str) -> bool:
+        with self.condition:
+            return name in self.tasks
+
+    def run(self) -> None:
+        """Hand due tasks to the worker pool until stopped."""
+        with self.condition:
+            while self.running:
+                if not self.heap:
+                    self.condition.wait()
+                    continue
+                due, _, task = self.heap[0]
+                wait = due - monotonic()
+                if wait > 0:
+                    self.condition.wait(wait)
+                    continue
+                heapq.heappop(self.heap)
+                # Entries of cancelled, running or rescheduled tasks are stale
+                if task.cancelled or task.running or task.due != due:
+                    continue
+                task.running = True
+                if task.blocking:
+                    # A task never overlaps with itself, so there is at most one of these threads per blocking task
+                    Thread(target=self.execute, args=(task,), name=f"scheduler-{task.name}", daemon=True).start()
+                else:
+                    self.executor.submit(self.execute, task)
+
+    def execute(self, task:ScheduledTask) -> None:
+        """Run a task on a worker and schedule its next run."""
+        due = task.due
+        start = perf_counter()
+        try:
+            task.function()
+        except Exception as e:
+            task.failures += 1
+            if self.log:
+                self.log.error(f"Scheduler task {task.name}: Error: {e.__class__.__name__} {e}")
+        run_time = perf_counter() - start
+        with self.condition:
+            task.runs += 1
+            task.last_run_time = run_time
+            task.max_run_time = max(task.max_run_time, run_time)
+            task.running = False
+            if task.cancelled or not self.running:
+                return
+            if task.due != due:
+                # Woken up while running
+                self.push(task, task.due)
+            elif task.interval is not None:
+                self.push(task, monotonic() + task.interval + random.uniform(-task.jitter, task.jitter))
+            elif self.tasks.get(task.name) is task:
+                del self.tasks[task.name]
+
+    def get_metrics(self) -> dict:
+        """Get when every task is due next and how long its runs took, in seconds."""
+        now = monotonic()
+        with self.condition:
+            return {
+                name: {
+                    "next_due": max(task.due - now, 0.0) if not task.running else 0.0,
+                    "interval": task.interval,
+                    "blocking": task.blocking,
+                    "running": task.running,
+                    "runs": task.runs,
+                    "failures": task.failures,
+                    "last_run_time": task.last_run_time,
+                    "max_run_time": task.max_run_time,
+                }
+                for name, task in self.tasks.items()
+            }
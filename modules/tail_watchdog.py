@@ -0,0 +1,56 @@
+from os import fstat
+from time import time
+
+# Import kill tracker modules
+from modules.log_matcher import parse_log_timestamp
+
+# Enough bytes to hold the <ISO 8601> stamp at the front of a line
+STAMP_SIZE = 64
+
+class TailWatchdog():
+    """Tracks how far live tailing is behind the end of Game.log and warns when ingestion stalls."""
+    def __init__(self, parser, max_lag_seconds:float=10, max_lag_bytes:int=4 * 1024 * 1024, interval:float=1):
+        self.log = None
+        self.parser = parser
+        self.max_lag_seconds = max_lag_seconds
+        self.max_lag_bytes = max_lag_bytes
+        self.interval = interval
+        self.lag = {"bytes": 0, "seconds": 0.0, "max_bytes": 0, "max_seconds": 0.0, "stalls": 0, "stalled": False}
+
+    def sample(self) -> dict:
+        """Measure the unread bytes after the last dispatched line and how long ago the oldest of them was written."""
+        offset = self.parser.tail_offset
+        if offset is None:
+            # Not tailing live yet, the backlog replay is behind by design
+            return self.lag
+        # The incomplete last line the tailer carries was read, the game is still writing it
+        carried = len(self.parser.tailer.pending) if self.parser.tailer else 0
+        with open(self.parser.log_file_location, "rb") as sc_log:
+            behind = max(fstat(sc_log.fileno()).st_size - offset - carried, 0)
+            seconds = 0.0
+            if behind:
+                sc_log.seek(offset)
+                written_at = parse_log_timestamp(sc_log.read(STAMP_SIZE).decode(self.parser.log_encoding, self.parser.log_decode_errors))
+                if written_at is not None:
+                    seconds = max(time() - written_at, 0.0)
+        lag = self.lag
+        lag["bytes"] = behind
+        lag["seconds"] = seconds
+        lag["max_bytes"] = max(lag["max_bytes"], behind)
+        lag["max_seconds"] = max(lag["max_seconds"], seconds)
+        self.parser.metrics.observe("tail_lag", seconds)
+        self.check_stall()
+        return lag
+
+    def check_stall(self) -> None:
+        """Warn once when the lag passes a threshold and again when tailing has caught up."""
+        lag = self.lag
+        stalled = lag["seconds"] >= self.max_lag_seconds or lag["bytes"] >= self.max_lag_bytes
+        if stalled and not lag["stalled"]:
+            lag["stalls"] += 1
+            self.log.warning(
+                f"Kill tracking is {lag['seconds']:.0f} s ({lag['bytes'] / 1048576:.1f} MB) behind the game log, kills are reported late."
+            )
+        elif lag["stalled"] and not stalled:
+            self.log.info("Kill tracking caught up with the game log.")
+        lag["stalled"] = stalled
@@ -0,0 +1,88 @@
+import requests
+from requests.adapters import HTTPAdapter
+from threading import local
+
+# (connect, read) timeouts in seconds for each Servitor call
+TIMEOUTS = {
+    "default": (3.05, 12),
+    "validateKey": (3.05, 12),
+    "reportKill": (3.05, 12),
+    "reportACKill": (3.05, 12),
+    "reportKillBatch": (3.05, 20),
+    "reportACKillBatch": (3.05, 20),
+    "capabilities": (3.05, 5),
+    "data": (3.05, 20),
+    # The next heartbeat is due 5 s later anyway
+    "heartbeat": (3.05, 4),
+    "warm_up": (3.05, 5),
+}
+
+class Transport():
+    """Keep-alive HTTP sessions for all Servitor traffic, every thread has its own session on one shared connection pool."""
+    def __init__(self, api_fqdn:str, api_key:dict, local_version:str, pool_size:int=4, timeouts:dict=None):
+        self.log = None
+        self.api_fqdn = api_fqdn
+        self.api_key = api_key
+        self.local_version = local_version
+        self.timeouts = dict(TIMEOUTS, **(timeouts if timeouts else {}))
+        # Upload, heartbeat, key countdown and log pickler threads can each hold a connection
+        self.adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        # Sessions hold no sockets of their own, so threads that come and go leave nothing open behind
+        self.local = local()
+
+    def get_session(self) -> requests.Session:
+        """Get the session of the calling thread, its connections come from the shared pool."""
+        session = getattr(self.local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.mount("http://", self.adapter)
+            session.mount("https://", self.adapter)
+            session.headers["User-Agent"] = f"Killtracker/{self.local_version}"
+            self.local.session = session
+        return session
+
+    def request(self, method:str, path:str, timeout_key:str=None, headers:dict=None, **kwargs) -> requests.Response:
+        """Send a request to Servitor, authorized with the current key unless the headers carry another one."""
+        request_headers = {"Authorization": self.api_key["value"] if self.api_key["value"] else ""}
+        if headers:
+            request_headers.update(headers)
+        timeout = self.timeouts.get(timeout_key if timeout_key else path, self.timeouts["default"])
+        return self.get_session().request(method, f"{self.api_fqdn}/{path}", headers=request_headers, timeout=timeout, **kwargs)
+
+    def get(self, path:str, timeout_key:str=None, headers:dict=None) -> requests.Response:
+        return self.request("GET", path, timeout_key, headers)
+
+    def post(self, path:str, payload:dict, timeout_key:str=None, headers:dict=None) -> requests.Response:
+        return self.request("POST", path, timeout_key, headers, json=payload)
+
+    def warm_up(self) -> None:
+        """Open a connection to Servitor ahead of time, so the first kill after launch does not pay for the handshake."""
+        try:
+            self.request("HEAD", "", "warm_up").close()
+            self.log.debug(f"Transport.warm_up(): Connection to {self.api_fqdn} is open.")
+        except requests.RequestException as e:
+            self.log.warning(f"Could not reach Servitor yet: {e.__class__.__name__} {e}")
+        except Exception as e:
+            self.log.error(f"Transport.warm_up(): Error: {e.__class__.__name__} {e}")
+
+    def get_metrics(self) -> dict:
+        """Get the requests sent to Servitor and how many of them reused an open connection."""
+        pools = self.adapter.poolmanager.pools
+        request_count = 0
+        connection_count = 0
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is not None:
+                request_count += pool.num_requests
+                connection_count += pool.num_connections
+        reused = max(request_count - connection_count, 0)
+        return {
+            "requests": request_count,
+            "connections": connection_count,
+            "reused": reused,
+            "reuse_ratio": reused / request_count if request_count else 0.0,
+        }
+
+    def close(self) -> None:
+        """Close the pooled connections."""
+        self.adapter.close()
@@ -0,0 +1,16 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# The tests import the kill tracker modules and tools from the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tools.gen_game_log import write_game_log
+
+@pytest.fixture
+def game_log(tmp_path):
+    """A generated session log of 20k lines."""
+    log_path = tmp_path / "Game.log"
+    write_game_log(str(log_path), lines=20000, seed=7)
+    return log_path
@@ -0,0 +1,43 @@
+from tools.bench_parser import (
+    build_data_map, create_parser, sample_lines, cycle_lines, bench_read_log_line, bench_replay_backlog, run_benchmark, compare_results
+)
+from tools.gen_game_log import DEFAULT_MIX, write_game_log
+
+def test_cycle_lines_repeat_up_to_the_minimum():
+    assert cycle_lines(["a", "b"], 5) == ["a", "b"] * 3
+    assert cycle_lines(["a"] * 10, 5) == ["a"] * 10
+    assert cycle_lines([], 5) == []
+
+def test_the_decoy_rules_come_before_the_matching_one():
+    data_map = build_data_map(50)
+    rules = data_map["ignoredVictimRules"]
+    assert len(rules) == 51
+    assert rules[-1] == {"value": "NPC_Archetypes"}
+    parser = create_parser(data_map)
+    assert parser.check_ignored_victims("CActor::Kill: 'NPC_Archetypes-Male-Human-Guard_456'")
+    assert not parser.check_ignored_victims("CActor::Kill: 'Foe_One'")
+
+def test_run_benchmark_keeps_the_best_run():
+    runs = []
+    def function(ops:int) -> int:
+        runs.append(ops)
+        return ops
+    result = run_benchmark(function, (1000,), 3)
+    assert runs == [1000] * 3
+    assert result["ops"] == 1000
+    assert result["us_per_op"] == result["seconds"] / 1000 * 1e6
+
+def test_compare_results_flags_slowdowns_over_the_threshold():
+    baseline = {"benchmarks": {"fast": {"us_per_op": 1.0}, "slow": {"us_per_op": 1.0}}}
+    results = {"benchmarks": {
+        "fast": {"us_per_op": 1.1}, "slow": {"us_per_op": 1.2}, "new": {"us_per_op": 5.0}
+    }}
+    assert compare_results(baseline, results, 0.15) == ["slow"]
+
+def test_the_benchmarks_run_the_parser(tmp_path):
+    data_map = build_data_map(5)
+    lines = sample_lines(2000, 1, DEFAULT_MIX)
+    assert bench_read_log_line(data_map, lines) == len(lines)
+    log_path = tmp_path / "Game.log"
+    line_count, _ = write_game_log(str(log_path), lines=2000, seed=1)
+    assert bench_replay_backlog(data_map, str(log_path), line_count) == line_count
@@ -0,0 +1,30 @@
+import json
+
+from modules.api_client import API_Client
+from modules.data_map_cache import DataMapCache
+from modules.headless import HeadlessGUI
+
+WEAPONS = [{"id": "KLWE_LaserRepeater_S3", "name": "Attrition-3"}]
+RULES = [{"value": "NPC_Archetypes"}]
+
+def test_save_keeps_the_other_data_maps(tmp_path):
+    cache_path = tmp_path / "bv_killtracker_data.json"
+    DataMapCache(cache_path).save("weapons", WEAPONS, "w1")
+    # A new cache that never loaded the file still keeps what is in it
+    DataMapCache(cache_path).save("ignoredVictimRules", RULES, "r1")
+    entries = json.loads(cache_path.read_text(encoding="utf-8"))
+    assert entries == {"weapons": {"etag": "w1", "data": WEAPONS}, "ignoredVictimRules": {"etag": "r1", "data": RULES}}
+
+def test_a_broken_cache_is_replaced(tmp_path):
+    cache_path = tmp_path / "bv_killtracker_data.json"
+    cache_path.write_text("{broken", encoding="utf-8")
+    cache = DataMapCache(cache_path)
+    assert cache.load() == {}
+    cache.save("weapons", WEAPONS, "w1")
+    assert DataMapCache(cache_path).load() == {"weapons": {"etag": "w1", "data": WEAPONS}}
+
+def test_the_api_client_loads_the_cache_when_built(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    DataMapCache().save("weapons", WEAPONS, "w1")
+    api = API_Client(None, HeadlessGUI(), {"active": False}, "1.0", {"current": "N/A"})
+    assert api.data_map_cache.get_etag("weapons") == "w1"
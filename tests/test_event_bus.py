@@ -0,0 +1,105 @@
+from threading import Event
+
+import pytest
+
+from modules.event_bus import EventBus, EventConsumer
+
+class BlockedHandler():
+    """Holds the consumer thread on the first event until released, so the queue fills up."""
+    def __init__(self):
+        self.started = Event()
+        self.release = Event()
+        self.handled = []
+
+    def __call__(self, event) -> None:
+        self.started.set()
+        self.release.wait(5)
+        self.handled.append(event)
+
+def fill(consumer:EventConsumer, handler:BlockedHandler, events:range) -> None:
+    """Start the consumer, block it on the first event and offer the rest."""
+    consumer.start()
+    consumer.offer(events[0])
+    assert handler.started.wait(5)
+    for event in events[1:]:
+        consumer.offer(event)
+
+def drain(consumer:EventConsumer, handler:BlockedHandler) -> None:
+    handler.release.set()
+    consumer.stop()
+    consumer.thread.join(5)
+
+def test_drop_oldest_keeps_the_newest_events():
+    handler = BlockedHandler()
+    consumer = EventConsumer("test", handler, 3, "drop_oldest")
+    fill(consumer, handler, range(8))
+    drain(consumer, handler)
+    assert handler.handled == [0, 5, 6, 7]
+    metrics = consumer.get_metrics()
+    assert (metrics["published"], metrics["processed"], metrics["dropped"]) == (8, 4, 4)
+
+def test_drop_newest_keeps_the_oldest_events():
+    handler = BlockedHandler()
+    consumer = EventConsumer("test", handler, 3, "drop_newest")
+    fill(consumer, handler, range(8))
+    drain(consumer, handler)
+    assert handler.handled == [0, 1, 2, 3]
+    assert consumer.get_metrics()["dropped"] == 4
+
+def test_spill_hands_the_overflow_to_the_spill_handler():
+    handler = BlockedHandler()
+    spilled = []
+    consumer = EventConsumer("test", handler, 3, "spill", spill=spilled.append)
+    fill(consumer, handler, range(8))
+    drain(consumer, handler)
+    assert handler.handled == [0, 1, 2, 3]
+    assert spilled == [4, 5, 6, 7]
+    metrics = consumer.get_metrics()
+    assert (metrics["spilled"], metrics["dropped"], metrics["max_depth"]) == (4, 0, 3)
+
+def test_invalid_overflow_policies_are_rejected():
+    with pytest.raises(ValueError):
+        EventConsumer("test", print, 3, "block")
+    with pytest.raises(ValueError):
+        EventConsumer("test", print, 3, "spill")
+
+def test_events_are_handled_inline_until_started():
+    handled = []
+    bus = EventBus()
+    bus.subscribe("ints", handled.append, (int,))
+    bus.publish(1)
+    bus.publish("not routed")
+    assert handled == [1]
+
+def test_a_failing_handler_does_not_stop_the_consumer():
+    handled = []
+    def handler(event) -> None:
+        if event == 1:
+            raise RuntimeError("broken")
+        handled.append(event)
+    bus = EventBus()
+    consumer = bus.subscribe("ints", handler, (int,))
+    bus.start()
+    for event in range(3):
+        bus.publish(event)
+    bus.stop()
+    consumer.thread.join(5)
+    assert handled == [0, 2]
+    assert (consumer.metrics["processed"], consumer.metrics["failed"]) == (2, 1)
+
+def test_a_burst_is_delivered_in_batches():
+    handler = BlockedHandler()
+    consumer = EventConsumer("test", handler, 64, "drop_oldest", batch_size=4, batch_window=5)
+    fill(consumer, handler, range(11))
+    drain(consumer, handler)
+    assert handler.handled == [[0], [1, 2, 3, 4], [5, 6, 7, 8], [9, 10]]
+
+def test_a_lone_event_is_not_held_for_the_batch_window():
+    handled = Event()
+    consumer = EventConsumer("test", lambda events: handled.set(), 64, "drop_oldest", batch_size=20, batch_window=30)
+    consumer.start()
+    consumer.offer(1)
+    try:
+        assert handled.wait(5)
+    finally:
+        consumer.stop()
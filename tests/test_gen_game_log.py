@@ -0,0 +1,50 @@
+import pytest
+
+from tools.gen_game_log import GameLogGenerator, DEFAULT_MIX, HANDLE, GEID, parse_mix, write_game_log
+
+def test_the_same_seed_gives_the_same_log(tmp_path):
+    write_game_log(str(tmp_path / "a.log"), lines=2000, seed=5)
+    write_game_log(str(tmp_path / "b.log"), lines=2000, seed=5)
+    write_game_log(str(tmp_path / "c.log"), lines=2000, seed=6)
+    assert (tmp_path / "a.log").read_bytes() == (tmp_path / "b.log").read_bytes()
+    assert (tmp_path / "a.log").read_bytes() != (tmp_path / "c.log").read_bytes()
+
+def test_the_counts_match_the_file(game_log):
+    lines, size = write_game_log(str(game_log), lines=12345, seed=1)
+    data = game_log.read_bytes()
+    assert (lines, size) == (12345, len(data))
+    assert data.count(b"\n") == lines
+
+def test_a_size_limit_stops_after_the_batch_that_reaches_it(tmp_path):
+    log_path = tmp_path / "Game.log"
+    lines, size = write_game_log(str(log_path), size_mb=1, seed=1)
+    assert size >= 1e6
+    assert size == log_path.stat().st_size
+
+def test_the_log_starts_with_the_login(game_log):
+    lines = game_log.read_text(encoding="utf-8").splitlines()
+    assert "Log started on" in lines[0]
+    assert f"Handle[{HANDLE}]" in lines[1]
+    assert f"geid {GEID}" in lines[2]
+    assert "<Context Establisher Done>" in lines[3]
+
+def test_a_ship_is_left_by_the_id_it_was_entered_with():
+    generator = GameLogGenerator(seed=1)
+    enter = generator.make_vehicle_enter()
+    ship_id = generator.ship_id
+    assert f"[{ship_id}]" in enter
+    assert f"[{ship_id}]" in generator.make_vehicle_exit()
+    assert generator.ship is None
+
+def test_a_mix_without_other_kinds_gives_only_that_kind():
+    mix = {kind: 0 for kind in DEFAULT_MIX}
+    mix["kill"] = 1
+    generator = GameLogGenerator(seed=1, mix=mix)
+    assert all("CActor::Kill" in generator.line() for _ in range(100))
+
+def test_parse_mix_keeps_the_default_weights():
+    mix = parse_mix("noise=0.5,kill=0.25")
+    assert (mix["noise"], mix["kill"], mix["zone"]) == (0.5, 0.25, DEFAULT_MIX["zone"])
+    assert parse_mix("") == DEFAULT_MIX
+    with pytest.raises(ValueError):
+        parse_mix("missiles=1")
@@ -0,0 +1,108 @@
+import pytest
+
+from modules.log_bootstrap import SessionScanner, SessionBootstrap
+from tools.gen_game_log import GameLogGenerator, HANDLE, GEID
+
+def write_log(log_path, lines:list) -> None:
+    log_path.write_text("".join(lines), encoding="utf-8", newline="\n")
+
+@pytest.fixture
+def relogin_log(tmp_path):
+    """A generated session where another account logs in halfway through."""
+    log_path = tmp_path / "Game.log"
+    first = GameLogGenerator(seed=3)
+    second = GameLogGenerator(seed=4, handle="OtherPilot", geid="999")
+    lines = first.header() + [first.line() for _ in range(5000)]
+    # The relogin has no "Log started" line, the game keeps writing the same file
+    lines += second.header()[1:] + [second.line() for _ in range(5000)]
+    write_log(log_path, lines)
+    return log_path
+
+def test_the_scan_recovers_the_session(game_log):
+    bootstrap = SessionScanner().scan(str(game_log))
+    assert (bootstrap.rsi_handle, bootstrap.player_geid) == (HANDLE, GEID)
+    assert bootstrap.game_mode != "Nothing"
+    assert bootstrap.resume_offset == game_log.stat().st_size
+
+def test_the_scan_follows_the_ship(tmp_path):
+    generator = GameLogGenerator(seed=1)
+    lines = generator.header() + [generator.stamp(generator.make_vehicle_enter())]
+    log_path = tmp_path / "Game.log"
+    write_log(log_path, lines)
+    scanner = SessionScanner()
+    assert scanner.scan(str(log_path)).active_ship_id == generator.ship_id
+    # A context load puts the player on a new map
+    write_log(log_path, lines + [generator.stamp(generator.make_context())])
+    bootstrap = scanner.scan(str(log_path))
+    assert (bootstrap.active_ship, bootstrap.active_ship_id) == ("FPS", "N/A")
+
+def test_the_scan_stops_before_an_incomplete_line(tmp_path):
+    generator = GameLogGenerator(seed=1)
+    log_path = tmp_path / "Game.log"
+    write_log(log_path, generator.header() + ["<2025-03-01T18:00:09.000Z> [Notice] half"])
+    bootstrap = SessionScanner().scan(str(log_path))
+    assert bootstrap.resume_offset == len("".join(generator.header()).encode("utf-8"))
+
+def test_an_empty_log_has_no_session(tmp_path):
+    log_path = tmp_path / "Game.log"
+    log_path.write_bytes(b"")
+    assert SessionScanner().scan(str(log_path)) == SessionBootstrap()
+    assert SessionScanner().scan_reverse(str(log_path)) == SessionBootstrap()
+
+@pytest.mark.parametrize("seed", [1, 2, 3, 4, 5])
+def test_reverse_scan_matches_the_forward_scan(tmp_path, seed):
+    generator = GameLogGenerator(seed=seed)
+    log_path = tmp_path / "Game.log"
+    write_log(log_path, generator.header() + [generator.line() for _ in range(5000)])
+    scanner = SessionScanner(chunk_size=4096)
+    assert scanner.scan_reverse(str(log_path)) == scanner.scan(str(log_path))
+
+def test_reverse_scan_matches_the_forward_scan_on_a_bigger_log(game_log):
+    scanner = SessionScanner()
+    assert scanner.scan_reverse(str(game_log)) == scanner.scan(str(game_log))
+
+def test_reverse_scan_drops_the_ship_at_a_context_load(tmp_path):
+    generator = GameLogGenerator(seed=1)
+    lines = generator.header() + [generator.stamp(generator.make_vehicle_enter())]
+    log_path = tmp_path / "Game.log"
+    write_log(log_path, lines)
+    scanner = SessionScanner()
+    assert scanner.scan_reverse(str(log_path)).active_ship_id == generator.ship_id
+    write_log(log_path, lines + [generator.stamp(generator.make_context())])
+    bootstrap = scanner.scan_reverse(str(log_path))
+    assert (bootstrap.active_ship, bootstrap.active_ship_id) == ("FPS", "N/A")
+
+def test_reverse_scan_drops_a_destroyed_ship(tmp_path):
+    generator = GameLogGenerator(seed=1)
+    lines = generator.header() + [generator.stamp(generator.make_vehicle_enter())]
+    ship, ship_id = generator.ship, generator.ship_id
+    destruction = generator.make_destruction()
+    while f"[{ship_id}]" not in destruction:
+        generator.ship, generator.ship_id = ship, ship_id
+        destruction = generator.make_destruction()
+    log_path = tmp_path / "Game.log"
+    write_log(log_path, lines + [generator.stamp(destruction)])
+    scanner = SessionScanner()
+    bootstrap = scanner.scan_reverse(str(log_path))
+    assert (bootstrap.active_ship, bootstrap.active_ship_id) == ("FPS", "N/A")
+    assert bootstrap == scanner.scan(str(log_path))
+
+def test_parallel_scan_matches_the_serial_scan(game_log):
+    scanner = SessionScanner()
+    scanner.parallel_threshold = 1
+    scanner.workers = 2
+    assert scanner.scan(str(game_log)) == SessionScanner().scan(str(game_log))
+    assert scanner.scan_reverse(str(game_log)) == SessionScanner().scan_reverse(str(game_log))
+
+def test_the_latest_login_wins(relogin_log):
+    scanner = SessionScanner(chunk_size=4096)
+    forward = scanner.scan(str(relogin_log))
+    assert (forward.rsi_handle, forward.player_geid) == ("OtherPilot", "999")
+    assert scanner.scan_reverse(str(relogin_log)) == forward
+
+def test_the_parallel_identity_scan_takes_the_latest_login(relogin_log):
+    scanner = SessionScanner()
+    scanner.parallel_threshold = 1
+    scanner.workers = 2
+    assert scanner.scan(str(relogin_log)) == SessionScanner().scan_reverse(str(relogin_log))
+    assert scanner.scan_reverse(str(relogin_log)).rsi_handle == "OtherPilot"
@@ -0,0 +1,56 @@
+import os
+
+from modules.log_bootstrap import SessionScanner
+from modules.log_checkpoint import LogCheckpoint
+from tools.gen_game_log import GameLogGenerator, write_game_log
+
+def save_session(checkpoint:LogCheckpoint, log_path) -> object:
+    """Track the log and save the session the scanner recovers from it."""
+    checkpoint.track(str(log_path))
+    bootstrap = SessionScanner().scan_reverse(str(log_path))
+    checkpoint.save(bootstrap, True)
+    return bootstrap
+
+def test_resume_on_the_same_log(tmp_path, game_log):
+    checkpoint = LogCheckpoint(tmp_path / "checkpoint.json")
+    bootstrap = save_session(checkpoint, game_log)
+    assert LogCheckpoint(tmp_path / "checkpoint.json").load(str(game_log)) == bootstrap
+
+def test_resume_after_the_log_grew(tmp_path, game_log):
+    checkpoint = LogCheckpoint(tmp_path / "checkpoint.json")
+    bootstrap = save_session(checkpoint, game_log)
+    generator = GameLogGenerator(seed=9)
+    with open(game_log, "a", encoding="utf-8", newline="\n") as sc_log:
+        sc_log.writelines(generator.line() for _ in range(100))
+    assert checkpoint.load(str(game_log)).resume_offset == bootstrap.resume_offset
+
+def test_no_resume_after_rotation(tmp_path, game_log):
+    checkpoint = LogCheckpoint(tmp_path / "checkpoint.json")
+    save_session(checkpoint, game_log)
+    # The game moves the old log to logbackups and starts a new one at the same path
+    (tmp_path / "logbackups").mkdir()
+    os.replace(game_log, tmp_path / "logbackups" / "Game Build(1) 01 Mar 25.log")
+    write_game_log(str(game_log), lines=20000, seed=8)
+    assert checkpoint.load(str(game_log)) is None
+    # The new log is tracked from then on and resumes like any other
+    bootstrap = save_session(checkpoint, game_log)
+    assert checkpoint.load(str(game_log)) == bootstrap
+
+def test_no_resume_after_truncation(tmp_path, game_log):
+    checkpoint = LogCheckpoint(tmp_path / "checkpoint.json")
+    save_session(checkpoint, game_log)
+    with open(game_log, "r+b") as sc_log:
+        sc_log.truncate(1000)
+    assert checkpoint.load(str(game_log)) is None
+
+def test_saves_are_throttled(tmp_path, game_log):
+    checkpoint = LogCheckpoint(tmp_path / "checkpoint.json", save_interval=3600)
+    bootstrap = save_session(checkpoint, game_log)
+    bootstrap.resume_offset -= 10
+    checkpoint.save(bootstrap)
+    assert checkpoint.load(str(game_log)).resume_offset == bootstrap.resume_offset + 10
+    checkpoint.save(bootstrap, True)
+    assert checkpoint.load(str(game_log)).resume_offset == bootstrap.resume_offset
+
+def test_no_checkpoint_file(tmp_path, game_log):
+    assert LogCheckpoint(tmp_path / "missing.json").load(str(game_log)) is None
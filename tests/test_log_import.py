@@ -0,0 +1,46 @@
+import pytest
+
+from modules.log_import import import_log_file
+from tools.gen_game_log import GameLogGenerator, HANDLE
+
+COUNTS = ("kills", "deaths", "suicides", "weapons", "killed_by")
+
+@pytest.fixture
+def sessions(tmp_path):
+    """Two sessions on their own and both in one log, another account logs in halfway through the last one."""
+    first = GameLogGenerator(seed=3)
+    second = GameLogGenerator(seed=4, handle="OtherPilot", geid="999")
+    first_lines = first.header() + [first.line() for _ in range(5000)]
+    second_lines = second.header() + [second.line() for _ in range(5000)]
+    paths = {name: tmp_path / f"{name}.log" for name in ("first", "second", "relogin")}
+    # The relogin has no "Log started" line, the game keeps writing the same file
+    for name, lines in (("first", first_lines), ("second", second_lines), ("relogin", first_lines + second_lines[1:])):
+        paths[name].write_text("".join(lines), encoding="utf-8", newline="\n")
+    return paths
+
+def get_counts(stats:dict) -> dict:
+    return {name: stats[name] for name in COUNTS}
+
+def test_a_relogin_splits_the_events_by_handle(sessions):
+    first = import_log_file(str(sessions["first"]))
+    second = import_log_file(str(sessions["second"]))
+    assert first["kills"] and second["kills"]
+    mine = import_log_file(str(sessions["relogin"]), rsi_handle=HANDLE)
+    assert (mine["rsi_handle"], get_counts(mine)) == (HANDLE, get_counts(first))
+    other = import_log_file(str(sessions["relogin"]), rsi_handle="OtherPilot")
+    assert get_counts(other) == get_counts(second)
+
+def test_the_latest_login_is_imported_without_a_handle(sessions):
+    stats = import_log_file(str(sessions["relogin"]))
+    assert stats["rsi_handle"] == "OtherPilot"
+    assert get_counts(stats) == get_counts(import_log_file(str(sessions["second"])))
+
+def test_a_log_of_another_account_is_skipped(sessions):
+    assert import_log_file(str(sessions["first"]), rsi_handle="OtherPilot")["skipped"]
+    assert "skipped" not in import_log_file(str(sessions["relogin"]), rsi_handle=HANDLE)
+
+def test_deaths_are_tallied_by_killer(sessions):
+    stats = import_log_file(str(sessions["first"]))
+    assert stats["deaths"] and sum(stats["killed_by"].values()) == stats["deaths"]
+    assert "Unknown" not in stats["killed_by"]
+    assert HANDLE not in stats["killed_by"]
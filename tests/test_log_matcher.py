@@ -0,0 +1,11 @@
+from datetime import datetime, timezone
+
+from modules.log_matcher import parse_log_timestamp
+
+def test_parse_log_timestamp_reads_the_utc_stamp():
+    expected = datetime(2025, 3, 1, 18, 0, 9, 123000, tzinfo=timezone.utc).timestamp()
+    assert parse_log_timestamp("<2025-03-01T18:00:09.123Z> [Notice] <Actor Death>\n") == expected
+
+def test_parse_log_timestamp_of_a_line_without_a_stamp():
+    assert parse_log_timestamp("[Notice] no stamp\n") is None
+    assert parse_log_timestamp("<not a time> [Notice]\n") is None
@@ -0,0 +1,222 @@
+from threading import Thread, RLock
+from time import sleep
+
+import pytest
+
+import modules.log_parser
+from modules.api_client import API_Client
+from modules.headless import create_headless_parser, HeadlessGUI, HeadlessLogger
+from modules.log_reader import LogTailer
+from modules.scheduler import Scheduler
+from tools.gen_game_log import GameLogGenerator, HANDLE, GEID
+from tools.mock_servitor import MockServitor
+
+class RecordingLogger(HeadlessLogger):
+    """Keeps the messages as well as the counts."""
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def write(self, level:str, message:str) -> None:
+        super().write(level, message)
+        self.messages.append((level, message))
+
+class MemoryCfg():
+    """Keeps the pickled kills in memory instead of the encrypted config."""
+    def __init__(self):
+        self.cfg_dict = {"pickle": []}
+        self.lock = RLock()
+
+    def save_cfg(self, data_type:str, data) -> None:
+        self.cfg_dict[data_type] = data
+
+def create_parser(api=None):
+    """A headless parser logged in as the generated player."""
+    parser = create_headless_parser()
+    if api:
+        parser.api = api
+    parser.rsi_handle["current"] = HANDLE
+    parser.player_geid["current"] = GEID
+    return parser
+
+def tail(parser, log_path, anchors) -> None:
+    """Dispatch the whole log like the live tail does."""
+    with open(log_path, "rb") as sc_log:
+        tailer = LogTailer(sc_log, parser.log_encoding, parser.log_decode_errors, 64 * 1024, anchors)
+        while True:
+            lines = tailer.read_lines()
+            if lines:
+                parser.read_log_lines(lines, True)
+            elif tailer.eof:
+                return
+
+def test_kills_are_posted_for_the_player(game_log):
+    parser = create_parser()
+    tail(parser, game_log, None)
+    kills = [payload for endpoint, payload in parser.api.posts if endpoint == "reportKill"]
+    assert kills
+    assert all(kill["player"] == HANDLE and kill["victim"] != HANDLE for kill in kills)
+    assert parser.kill_total == len(kills)
+    assert parser.sounds.played == len(kills)
+    assert parser.log.counts["error"] == 0
+
+def test_a_failing_consumer_does_not_stop_the_parser(game_log):
+    parser = create_parser()
+    def broken(event) -> None:
+        raise RuntimeError("broken")
+    parser.event_bus.consumers["sound"].handler = broken
+    tail(parser, game_log, None)
+    kills = [payload for endpoint, payload in parser.api.posts if endpoint == "reportKill"]
+    assert kills
+    assert parser.event_bus.consumers["sound"].metrics["failed"] == len(kills)
+    assert parser.event_bus.get_metrics()["upload"]["failed"] == 0
+
+def test_the_anchor_prefilter_drops_no_event(game_log):
+    filtered = create_parser()
+    tail(filtered, game_log, filtered.line_anchors)
+    unfiltered = create_parser()
+    tail(unfiltered, game_log, None)
+    assert filtered.api.posts == unfiltered.api.posts
+    assert filtered.cm.heartbeats == unfiltered.cm.heartbeats
+    assert filtered.gui.vehicle_status == unfiltered.gui.vehicle_status
+    assert (filtered.active_ship, filtered.game_mode) == (unfiltered.active_ship, unfiltered.game_mode)
+
+def test_the_backlog_replay_posts_nothing(game_log):
+    parser = create_parser()
+    parser.log_file_location = str(game_log)
+    with open(game_log, "rb") as sc_log:
+        assert parser.replay_backlog(sc_log) == game_log.stat().st_size
+    # The state is replayed, kills are neither posted nor counted
+    assert parser.game_mode != "Nothing"
+    assert parser.api.posts == []
+    assert parser.kill_total == 0
+
+def test_the_backlog_replay_reports_every_line(game_log):
+    parser = create_parser()
+    parser.log = RecordingLogger()
+    parser.log_file_location = str(game_log)
+    with open(game_log, "rb") as sc_log:
+        parser.replay_backlog(sc_log)
+    # Counted with the lines the anchors drop, not just the ones with a trigger token
+    assert any(message.startswith("Loaded old log: 20,000 lines (") for _, message in parser.log.messages)
+    assert parser.log.counts["error"] == 0
+
+def test_the_live_stream_picks_up_a_relogin():
+    parser = create_parser()
+    other = GameLogGenerator(seed=4, handle="OtherPilot", geid="999")
+    parser.read_log_lines(other.header()[1:3], True)
+    assert (parser.rsi_handle["current"], parser.player_geid["current"]) == ("OtherPilot", "999")
+    kill = other.stamp(
+        "[Notice] <Actor Death> CActor::Kill: 'Foe_One' [1] in zone 'space' killed by 'OtherPilot' [2] using 'KLWE_LaserRepeater_S3_123' "
+        "[Class KLWE_LaserRepeater_S3] with damage type 'Bullet' from direction x: 0, y: 0, z: 0 [Team_ActorTech][Actor]"
+    )
+    parser.read_log_lines([kill], True)
+    assert [payload["player"] for _, payload in parser.api.posts] == ["OtherPilot"]
+
+@pytest.fixture(params=[True, False], ids=["batch", "single"])
+def servitor(request):
+    server = MockServitor(("127.0.0.1", 0), batch=request.param)
+    Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+def create_api_client(server) -> API_Client:
+    api = API_Client(MemoryCfg(), HeadlessGUI(), {"active": True}, "1.0", {"current": HANDLE})
+    api.log = HeadlessLogger()
+    api.transport.log = api.log
+    api.transport.api_fqdn = f"http://127.0.0.1:{server.server_port}"
+    api.api_key["value"] = "test"
+    return api
+
+def test_a_burst_of_kills_reaches_servitor(servitor):
+    api = create_api_client(servitor)
+    parser = create_parser(api)
+    generator = GameLogGenerator(seed=2)
+    kill = "[Notice] <Actor Death> CActor::Kill: 'Foe_{n}' [1] in zone 'space' killed by '{handle}' [2] using 'KLWE_LaserRepeater_S3_123' [Class KLWE_LaserRepeater_S3] with damage type 'Bullet' from direction x: 0, y: 0, z: 0 [Team_ActorTech][Actor]"
+    lines = [generator.stamp(kill.format(n=n, handle=HANDLE)) for n in range(25)]
+    parser.event_bus.start()
+    try:
+        parser.read_log_lines(lines, True)
+        for _ in range(100):
+            if servitor.kills["reportKill"] == 25:
+                break
+            sleep(0.05)
+    finally:
+        parser.event_bus.stop()
+    assert servitor.kills["reportKill"] == 25
+    assert api.cfg_handler.cfg_dict["pickle"] == []
+    if servitor.batch:
+        # The first kill goes out alone, the rest of the burst is batched
+        assert servitor.requests["reportKillBatch"] >= 1
+        assert sum(size * count for size, count in servitor.batch_sizes.items()) == 25
+    else:
+        assert servitor.requests["reportKill"] == 25
+
+def test_failed_kills_are_pickled(servitor):
+    servitor.fail_rate = 1.0
+    api = create_api_client(servitor)
+    parser = create_parser(api)
+    generator = GameLogGenerator(seed=2)
+    for _ in range(200):
+        line = generator.stamp(generator.make_kill())
+        if f"killed by '{HANDLE}'" in line and f"Kill: '{HANDLE}'" not in line:
+            parser.read_log_lines([line], True)
+            break
+    assert len(api.cfg_handler.cfg_dict["pickle"]) == 1
+
+def run_tail_log(parser, log_path) -> Thread:
+    """Start tail_log on its own thread like start_tail_log_thread does, without the consumer threads."""
+    parser.log = RecordingLogger()
+    parser.log_file_location = str(log_path)
+    parser.scheduler = Scheduler()
+    parser.watch_timeout = 0.05
+    thread = Thread(target=parser.tail_log, daemon=True)
+    thread.start()
+    return thread
+
+def test_tail_log_stops_when_the_log_cannot_be_opened(tmp_path):
+    parser = create_parser()
+    thread = run_tail_log(parser, tmp_path / "missing.log")
+    thread.join(5)
+    assert not thread.is_alive()
+    assert parser.log.counts["error"] == 1
+    assert parser.tail_offset is None
+
+def test_tail_log_stops_when_the_watcher_cannot_be_created(monkeypatch, game_log):
+    def broken(file_location, backend):
+        raise OSError("no watcher")
+    monkeypatch.setattr(modules.log_parser, "create_file_watcher", broken)
+    parser = create_parser()
+    thread = run_tail_log(parser, game_log)
+    thread.join(10)
+    assert not thread.is_alive()
+    assert parser.log.counts["error"] == 1
+    assert ("info", "Game log monitoring has stopped.") in parser.log.messages
+
+def test_tail_log_posts_kills_appended_to_the_log(game_log):
+    parser = create_parser()
+    parser.resume_offset = game_log.stat().st_size
+    thread = run_tail_log(parser, game_log)
+    generator = GameLogGenerator(seed=5)
+    kill = generator.stamp(
+        f"[Notice] <Actor Death> CActor::Kill: 'Foe_One' [1] in zone 'space' killed by '{HANDLE}' [2] using 'KLWE_LaserRepeater_S3_123' "
+        "[Class KLWE_LaserRepeater_S3] with damage type 'Bullet' from direction x: 0, y: 0, z: 0 [Team_ActorTech][Actor]"
+    )
+    try:
+        for _ in range(100):
+            if parser.tail_offset is not None:
+                break
+            sleep(0.05)
+        with open(game_log, "a", encoding="utf-8", newline="\n") as sc_log:
+            sc_log.write(kill)
+        for _ in range(100):
+            if parser.api.posts:
+                break
+            sleep(0.05)
+    finally:
+        parser.monitoring["active"] = False
+        thread.join(5)
+    assert [payload["victim"] for _, payload in parser.api.posts] == ["Foe_One"]
+    assert not thread.is_alive()
+    assert parser.log.counts["error"] == 0
@@ -0,0 +1,160 @@
+import io
+
+import pytest
+
+from modules.log_reader import (
+    find_line_spans, decode_lines, iter_line_batches, iter_candidate_batches, split_line_ranges, iter_lines_reversed,
+    find_last_line_end, LogTailer
+)
+
+ANCHORS = (b"<Actor Death>", b"Handle[")
+
+def read_candidates(data:bytes) -> list:
+    """The candidate lines the readers must hand out, by a plain split of the whole log."""
+    return [line for line in data.decode("utf-8").splitlines(keepends=True) if any(anchor.decode() in line for anchor in ANCHORS)]
+
+@pytest.mark.parametrize("chunk_size", [7, 64, 1000, 1024 * 1024])
+def test_iter_line_batches_split_lines_across_chunks(game_log, chunk_size):
+    data = game_log.read_bytes()
+    progress = {"lines": 0}
+    with open(game_log, "rb") as sc_log:
+        batches = list(iter_line_batches(sc_log, chunk_size, "utf-8", "replace", progress=progress))
+    assert [line for lines, _ in batches for line in lines] == data.decode("utf-8").splitlines(keepends=True)
+    assert batches[-1][1] == len(data)
+    assert progress["lines"] == data.count(b"\n")
+
+def test_iter_line_batches_hold_back_an_incomplete_last_line():
+    sc_log = io.BytesIO(b"first\nsecond\nthird without newline")
+    batches = list(iter_line_batches(sc_log, 4, "utf-8", "replace"))
+    assert [line for lines, _ in batches for line in lines] == ["first\n", "second\n"]
+    assert batches[-1][1] == len(b"first\nsecond\n")
+
+def test_find_line_spans_cover_whole_lines():
+    data = b"noise\n<Actor Death> a\nnoise Handle[x]\n<Actor Death> no newline"
+    spans = find_line_spans(data, ANCHORS, 0, len(data))
+    assert [data[start:end] for start, end in spans] == [b"<Actor Death> a\n", b"noise Handle[x]\n", b"<Actor Death> no newline"]
+
+def test_find_line_spans_report_a_line_with_two_anchors_once():
+    data = b"<Actor Death> Handle[x]\nnoise\n"
+    assert find_line_spans(data, ANCHORS, 0, len(data)) == [(0, 24)]
+
+def test_find_line_spans_stay_inside_the_range():
+    data = b"<Actor Death> a\n<Actor Death> b\n<Actor Death> c\n"
+    assert find_line_spans(data, ANCHORS, 16, 32) == [(16, 32)]
+
+def test_decode_lines_with_anchors_split_like_a_chunk_decode():
+    data = b"a\r\nb <Actor Death>\r\nc\n"
+    assert decode_lines(data, len(data), "utf-8", "replace", ANCHORS) == ["b <Actor Death>\r\n"]
+
+@pytest.mark.parametrize("chunk_size", [7, 64, 1000, 1024 * 1024])
+def test_iter_line_batches_with_anchors_keep_the_candidates(game_log, chunk_size):
+    data = game_log.read_bytes()
+    progress = {"lines": 0}
+    with open(game_log, "rb") as sc_log:
+        lines = [line for lines, _ in iter_line_batches(sc_log, chunk_size, "utf-8", "replace", ANCHORS, progress) for line in lines]
+    assert lines == read_candidates(data)
+    assert progress["lines"] == data.count(b"\n")
+
+def test_iter_candidate_batches_match_the_serial_reader(game_log):
+    data = game_log.read_bytes()
+    progress = {"lines": 0}
+    batches = list(iter_candidate_batches(str(game_log), 0, len(data), ANCHORS, "utf-8", "replace", 2, progress))
+    assert [line for lines, _ in batches for line in lines] == read_candidates(data)
+    assert batches[-1][1] == len(data)
+    assert progress["lines"] == data.count(b"\n")
+
+def test_split_line_ranges_end_on_line_boundaries():
+    data = b"".join(b"line %d\n" % n for n in range(100))
+    ranges = split_line_ranges(data, 0, len(data), 7)
+    assert ranges[0][0] == 0 and ranges[-1][1] == len(data)
+    assert all(end == next_start for (_, end), (next_start, _) in zip(ranges, ranges[1:]))
+    assert all(data[end - 1:end] == b"\n" for _, end in ranges)
+
+@pytest.mark.parametrize("chunk_size", [5, 64, 1000, 1024 * 1024])
+def test_iter_lines_reversed_is_the_forward_scan_backwards(game_log, chunk_size):
+    data = game_log.read_bytes()
+    with open(game_log, "rb") as sc_log:
+        lines = list(iter_lines_reversed(sc_log, len(data), chunk_size, "utf-8", "replace", ANCHORS))
+    assert lines == read_candidates(data)[::-1]
+
+def test_iter_lines_reversed_starts_at_the_end_offset():
+    data = b"<Actor Death> a\n<Actor Death> b\n<Actor Death> c\n"
+    lines = list(iter_lines_reversed(io.BytesIO(data), 32, 3, "utf-8", "replace", ANCHORS))
+    assert lines == ["<Actor Death> b\n", "<Actor Death> a\n"]
+
+def test_find_last_line_end_skips_an_incomplete_line():
+    assert find_last_line_end(io.BytesIO(b"one\ntwo\nthr"), 2) == 8
+    assert find_last_line_end(io.BytesIO(b"no newline yet"), 4) == 0
+
+def append(sc_log:io.BytesIO, data:bytes) -> None:
+    """Write to the end of the log like the game does, keeping the reader's position."""
+    position = sc_log.tell()
+    sc_log.seek(0, 2)
+    sc_log.write(data)
+    sc_log.seek(position)
+
+def read_all(tailer:LogTailer) -> list:
+    """Call read_lines until everything written so far was handed out."""
+    lines = []
+    while True:
+        lines.extend(tailer.read_lines())
+        if tailer.eof:
+            return lines
+
+def test_log_tailer_waits_for_the_rest_of_a_line():
+    sc_log = io.BytesIO()
+    tailer = LogTailer(sc_log, "utf-8", "replace", 4)
+    append(sc_log, b"first\nsecond ha")
+    assert read_all(tailer) == ["first\n"]
+    assert tailer.offset == len(b"first\n")
+    append(sc_log, b"lf\nthird\n")
+    assert read_all(tailer) == ["second half\n", "third\n"]
+    assert tailer.offset == len(sc_log.getvalue())
+
+def test_log_tailer_hands_out_every_line_in_chunks(game_log):
+    data = game_log.read_bytes()
+    with open(game_log, "rb") as sc_log:
+        tailer = LogTailer(sc_log, "utf-8", "replace", 1000)
+        lines = read_all(tailer)
+    assert lines == data.decode("utf-8").splitlines(keepends=True)
+    assert tailer.offset == len(data)
+
+def test_log_tailer_starts_over_on_attach():
+    tailer = LogTailer(io.BytesIO(b"old ha"), "utf-8", "replace")
+    assert tailer.read_lines() == []
+    tailer.attach(io.BytesIO(b"new\n"))
+    assert tailer.read_lines() == ["new\n"]
+    assert tailer.offset == 4
+
+def test_log_tailer_with_anchors_drops_the_noise():
+    sc_log = io.BytesIO()
+    tailer = LogTailer(sc_log, "utf-8", "replace", 4, ANCHORS)
+    append(sc_log, b"noise\n<Actor Death> ha")
+    assert read_all(tailer) == []
+    append(sc_log, b"lf\nnoise\n")
+    assert read_all(tailer) == ["<Actor Death> half\n"]
+    assert tailer.offset == len(sc_log.getvalue())
+
+def test_log_tailer_counts_the_dropped_lines(game_log):
+    data = game_log.read_bytes()
+    with open(game_log, "rb") as sc_log:
+        tailer = LogTailer(sc_log, "utf-8", "replace", 1000, ANCHORS)
+        assert read_all(tailer) == read_candidates(data)
+    assert tailer.lines_read == data.count(b"\n")
+
+def test_log_tailer_reads_at_most_its_budget_per_call():
+    noise = b"noise\n" * 1000
+    sc_log = io.BytesIO(noise + b"<Actor Death> late\n")
+    tailer = LogTailer(sc_log, "utf-8", "replace", 100, ANCHORS, max_chunks=4)
+    assert tailer.read_lines() == []
+    # Only noise so far, but the rest of the log is still waiting
+    assert not tailer.eof
+    assert tailer.offset == 396
+    calls = 1
+    lines = []
+    while not tailer.eof:
+        lines.extend(tailer.read_lines())
+        calls += 1
+    assert lines == ["<Actor Death> late\n"]
+    assert calls > len(noise) // 400
+    assert tailer.offset == len(sc_log.getvalue())
@@ -0,0 +1,119 @@
+from threading import Event
+from time import sleep, monotonic
+
+import pytest
+
+from modules.scheduler import Scheduler
+
+@pytest.fixture
+def scheduler():
+    scheduler = Scheduler(workers=2)
+    scheduler.start()
+    yield scheduler
+    scheduler.stop()
+
+def test_wake_runs_a_task_before_it_is_due(scheduler):
+    ran = Event()
+    scheduler.every("task", ran.set, 3600)
+    assert not ran.wait(0.1)
+    assert scheduler.wake("task")
+    assert ran.wait(5)
+    sleep(0.05)
+    # Still periodic, the next run is an interval away again
+    assert scheduler.is_scheduled("task")
+    assert scheduler.get_metrics()["task"]["next_due"] > 3000
+
+def test_wake_of_an_unknown_task_does_nothing(scheduler):
+    assert not scheduler.wake("missing")
+
+def test_wake_during_a_run_runs_again_right_after(scheduler):
+    started = Event()
+    release = Event()
+    runs = []
+    def task() -> None:
+        runs.append(1)
+        started.set()
+        release.wait(5)
+    scheduler.every("task", task, 3600, delay=0)
+    assert started.wait(5)
+    assert scheduler.wake("task")
+    release.set()
+    for _ in range(100):
+        if len(runs) == 2:
+            break
+        sleep(0.05)
+    assert len(runs) == 2
+
+def test_cancel_stops_a_periodic_task(scheduler):
+    runs = []
+    scheduler.every("task", lambda: runs.append(1), 0.02, delay=0)
+    sleep(0.2)
+    scheduler.cancel("task")
+    sleep(0.05)
+    count = len(runs)
+    assert count > 0
+    assert not scheduler.is_scheduled("task")
+    assert not scheduler.wake("task")
+    sleep(0.2)
+    assert len(runs) == count
+
+def test_cancel_before_a_timer_fires(scheduler):
+    ran = Event()
+    scheduler.after("timer", 0.1, ran.set)
+    scheduler.cancel("timer")
+    assert not ran.wait(0.3)
+
+def test_a_timer_runs_once_and_is_removed(scheduler):
+    ran = Event()
+    scheduler.after("timer", 0, ran.set)
+    assert ran.wait(5)
+    sleep(0.05)
+    assert not scheduler.is_scheduled("timer")
+
+def test_a_task_of_the_same_name_is_replaced(scheduler):
+    first = Event()
+    second = Event()
+    scheduler.after("timer", 0.1, first.set)
+    scheduler.after("timer", 0.1, second.set)
+    assert second.wait(5)
+    assert not first.wait(0.2)
+
+def test_a_failing_task_keeps_running(scheduler):
+    runs = []
+    def task() -> None:
+        runs.append(1)
+        raise RuntimeError("broken")
+    scheduler.every("task", task, 0.02, delay=0)
+    sleep(0.3)
+    metrics = scheduler.get_metrics()["task"]
+    assert metrics["runs"] >= 2
+    assert metrics["failures"] == metrics["runs"]
+
+def test_a_blocking_task_does_not_hold_up_the_workers():
+    scheduler = Scheduler(workers=1)
+    scheduler.start()
+    release = Event()
+    ticked = Event()
+    try:
+        scheduler.after("slow", 0, lambda: release.wait(5), blocking=True)
+        scheduler.after("tick", 0.05, ticked.set)
+        # The only worker is free for the tick while the slow task still runs
+        assert ticked.wait(5)
+        assert scheduler.get_metrics()["slow"]["running"]
+    finally:
+        release.set()
+        scheduler.stop()
+
+def test_stop_does_not_wait_for_a_blocking_task(scheduler):
+    started = Event()
+    release = Event()
+    def task() -> None:
+        started.set()
+        release.wait(5)
+    scheduler.every("slow", task, 3600, delay=0, blocking=True)
+    assert started.wait(5)
+    start = monotonic()
+    scheduler.stop()
+    assert monotonic() - start < 1
+    assert scheduler.get_metrics() == {}
+    release.set()
@@ -0,0 +1,40 @@
+from modules.headless import create_headless_parser, HeadlessLogger
+from modules.log_reader import LogTailer
+from tools.gen_game_log import GameLogGenerator
+
+def create_watched_parser(log_path, data:bytes):
+    """A parser tailing a log that has everything but the given bytes dispatched."""
+    parser = create_headless_parser()
+    parser.log_file_location = str(log_path)
+    parser.tail_watchdog.log = HeadlessLogger()
+    sc_log = open(log_path, "rb")
+    parser.tailer = LogTailer(sc_log, parser.log_encoding, parser.log_decode_errors)
+    while not parser.tailer.eof:
+        parser.tailer.read_lines()
+    parser.tail_offset = parser.tailer.offset
+    with open(log_path, "ab") as log_file:
+        log_file.write(data)
+    return parser, sc_log
+
+def test_a_partial_last_line_is_not_a_stall(tmp_path):
+    generator = GameLogGenerator(seed=1)
+    log_path = tmp_path / "Game.log"
+    # The old timestamp of the line the game is still writing must not count as lag
+    log_path.write_text("".join(generator.header()) + generator.stamp("[Notice] half")[:-1], encoding="utf-8", newline="\n")
+    parser, sc_log = create_watched_parser(log_path, b"")
+    with sc_log:
+        lag = parser.tail_watchdog.sample()
+    assert (lag["bytes"], lag["seconds"], lag["stalled"]) == (0, 0.0, False)
+
+def test_unread_lines_are_a_stall(tmp_path):
+    generator = GameLogGenerator(seed=1)
+    log_path = tmp_path / "Game.log"
+    log_path.write_text("".join(generator.header()), encoding="utf-8", newline="\n")
+    unread = generator.stamp("[Notice] late").encode("utf-8")
+    parser, sc_log = create_watched_parser(log_path, unread)
+    with sc_log:
+        lag = parser.tail_watchdog.sample()
+    assert lag["bytes"] == len(unread)
+    # Generated lines are stamped long ago
+    assert lag["stalled"] and lag["stalls"] == 1
+    assert parser.tail_watchdog.log.counts["warning"] == 1
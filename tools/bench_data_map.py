@@ -0,0 +1,57 @@
+"""Compare the list scan diff get_data_map used with the content hash change detection on large data maps.
+
+Run from the repository root:
+    python -m tools.bench_data_map --sizes 1000,10000,20000
+"""
+import argparse
+import itertools
+from time import perf_counter
+
+# Import kill tracker modules
+from modules.data_map_cache import get_content_hash, diff_data_maps
+
+def build_weapons(count:int) -> list:
+    """A weapons data map shaped like Servitor's."""
+    return [{"id": f"KLWE_LaserRepeater_S{n % 7}_{n}", "name": f"Laser Repeater {n}"} for n in range(count)]
+
+def list_scan_diff(old_entries:list, new_entries:list) -> list:
+    """The diff get_data_map computed on every pull, `x in list` over lists of dicts."""
+    return list(itertools.filterfalse(lambda x: x in old_entries, new_entries)) + list(itertools.filterfalse(lambda x: x in new_entries, old_entries))
+
+def hash_check(old_entries:list, old_hash:str, new_entries:list) -> str:
+    """What get_data_map does now: hash the pulled map, compare it with the hash of the local one and diff only on a change."""
+    new_hash = get_content_hash(new_entries)
+    if new_hash != old_hash:
+        diff_data_maps(old_entries, new_entries)
+    return new_hash
+
+def time_best(function, repeat:int) -> float:
+    best = None
+    for _ in range(repeat):
+        start = perf_counter()
+        function()
+        elapsed = perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="1000,10000", help="Comma separated data map sizes")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per case, the best one is reported")
+    args = parser.parse_args()
+
+    print(f"{'entries':>8} {'case':>9} {'list scan':>11} {'hash':>10} {'speedup':>9}")
+    for size in (int(size) for size in args.sizes.split(",")):
+        local = build_weapons(size)
+        local_hash = get_content_hash(local)
+        # Servitor sends a fresh copy, equal entries are never the same objects
+        unchanged = [dict(entry) for entry in local]
+        changed = [dict(entry) for entry in local]
+        changed[size // 2] = {"id": "GATS_BallisticGatling_S3_1", "name": "Ballistic Gatling"}
+        for case, pulled in (("unchanged", unchanged), ("changed", changed)):
+            legacy = time_best(lambda: list_scan_diff(local, pulled), args.repeat)
+            hashed = time_best(lambda: hash_check(local, local_hash, pulled), args.repeat)
+            print(f"{size:>8} {case:>9} {legacy * 1000:>9.1f}ms {hashed * 1000:>8.2f}ms {legacy / hashed:>8.0f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""Benchmark the log parser hot paths on a generated Game.log and save the results as JSON.
+
+Run from the repository root:
+    python -m tools.bench_parser --lines 200000 --output bench_results.json
+    python -m tools.bench_parser --compare bench_results.json --threshold 0.15
+
+With --compare the run fails when a benchmark got slower than the threshold allows.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+from datetime import datetime, timezone
+from time import perf_counter
+
+# Import kill tracker modules
+from modules.headless import create_headless_parser
+from tools.gen_game_log import GameLogGenerator, HANDLE, GEID, WEAPONS, parse_mix, write_game_log
+
+def build_data_map(rule_count:int) -> dict:
+    """A data map shaped like Servitor's, with decoy rules in front of the ones that match."""
+    rules = [{"value": f"Ignored_Archetype_{n}"} for n in range(rule_count)]
+    rules.append({"value": "NPC_Archetypes"})
+    return {
+        "weapons": [{"id": weapon, "name": weapon.replace("_", " ")} for weapon in WEAPONS],
+        "ships": [],
+        "ignoredVictimRules": rules,
+    }
+
+def create_parser(data_map:dict):
+    """A headless parser logged in like the generated session."""
+    parser = create_headless_parser(data_map)
+    parser.rsi_handle["current"] = HANDLE
+    parser.player_geid["current"] = GEID
+    return parser
+
+def sample_lines(count:int, seed:int, mix:dict) -> list:
+    generator = GameLogGenerator(seed, mix)
+    return generator.header() + [generator.line() for _ in range(count)]
+
+def cycle_lines(lines:list, minimum:int) -> list:
+    """Repeat the lines of a rare kind so that its benchmark runs long enough to be stable."""
+    if not lines:
+        return lines
+    return lines * -(-minimum // len(lines))
+
+def bench_read_log_line(data_map:dict, lines:list) -> int:
+    parser = create_parser(data_map)
+    read_log_line = parser.read_log_line
+    for line in lines:
+        read_log_line(line, True)
+    return len(lines)
+
+def bench_parse_kill_line(data_map:dict, lines:list) -> int:
+    parser = create_parser(data_map)
+    parse_kill_line = parser.parse_kill_line
+    for line in lines:
+        parse_kill_line(line, HANDLE)
+    return len(lines)
+
+def bench_set_player_zone(data_map:dict, lines:list) -> int:
+    parser = create_parser(data_map)
+    set_player_zone = parser.set_player_zone
+    for line in lines:
+        set_player_zone(line, "adam: " in line)
+    return len(lines)
+
+def bench_check_ignored_victims(data_map:dict, lines:list) -> int:
+    parser = create_parser(data_map)
+    check_ignored_victims = parser.check_ignored_victims
+    for line in lines:
+        check_ignored_victims(line)
+    return len(lines)
+
+def bench_replay_backlog(data_map:dict, log_path:str, line_count:int) -> int:
+    parser = create_parser(data_map)
+    with open(log_path, "rb") as sc_log:
+        parser.replay_backlog(sc_log)
+    return line_count
+
+def run_benchmark(function, args:tuple, repeat:int) -> dict:
+    """Run a benchmark repeat times and keep the best run."""
+    best = None
+    for _ in range(repeat):
+        start = perf_counter()
+        ops = function(*args)
+        elapsed = perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return {"ops": ops, "seconds": best, "ops_per_sec": ops / max(best, 1e-9), "us_per_op": best / max(ops, 1) * 1e6}
+
+def get_git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+def compare_results(baseline:dict, results:dict, threshold:float) -> list:
+    """Get the benchmarks that are slower than the baseline by more than the threshold."""
+    regressions = []
+    for name, result in results["benchmarks"].items():
+        previous = baseline.get("benchmarks", {}).get(name)
+        if not previous:
+            continue
+        change = result["us_per_op"] / previous["us_per_op"] - 1
+        print(f"  {name:<22} {previous['us_per_op']:>8.2f} -> {result['us_per_op']:>8.2f} us/op ({change:+.1%})")
+        if change > threshold:
+            regressions.append(name)
+    return regressions
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=200000, help="Lines in the generated log")
+    parser.add_argument("--seed", type=int, default=1, help="Seed of the generated log")
+    parser.add_argument("--mix", default="", help="Line kind weights of the generated log, see tools.gen_game_log")
+    parser.add_argument("--min-ops", type=int, default=50000, help="Minimum calls of the benchmarks of a single line kind")
+    parser.add_argument("--rules", type=int, default=50, help="Number of ignoredVictimRules to match against")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per benchmark, the best one is reported")
+    parser.add_argument("--output", default="bench_results.json", help="Where to save the JSON results")
+    parser.add_argument("--compare", help="JSON results of a previous run to compare with")
+    parser.add_argument("--threshold", type=float, default=0.15, help="Slowdown that counts as a regression, 0.15 is 15%%")
+    args = parser.parse_args()
+
+    mix = parse_mix(args.mix)
+    data_map = build_data_map(args.rules)
+    lines = sample_lines(args.lines, args.seed, mix)
+    kill_lines = cycle_lines([line for line in lines if "CActor::Kill" in line], args.min_ops)
+    zone_lines = cycle_lines([line for line in lines if "-> Entity " in line or "adam: " in line], args.min_ops)
+    fd, log_path = tempfile.mkstemp(suffix=".log")
+    os.close(fd)
+    try:
+        line_count, log_size = write_game_log(log_path, args.lines, seed=args.seed, mix=mix)
+        benchmarks = {
+            "read_log_line": (bench_read_log_line, (data_map, lines)),
+            "parse_kill_line": (bench_parse_kill_line, (data_map, kill_lines)),
+            "set_player_zone": (bench_set_player_zone, (data_map, zone_lines)),
+            "check_ignored_victims": (bench_check_ignored_victims, (data_map, kill_lines)),
+            "replay_backlog": (bench_replay_backlog, (data_map, log_path, line_count)),
+        }
+        results = {
+            "meta": {
+                "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "commit": get_git_commit(),
+                "python": platform.python_version(),
+                "implementation": platform.python_implementation(),
+                "platform": platform.platform(),
+                "lines": line_count,
+                "log_bytes": log_size,
+                "seed": args.seed,
+                "mix": mix,
+                "rules": args.rules,
+                "repeat": args.repeat,
+            },
+            "benchmarks": {},
+        }
+        for name, (function, function_args) in benchmarks.items():
+            result = run_benchmark(function, function_args, args.repeat)
+            results["benchmarks"][name] = result
+            print(f"{name:<22} {result['ops']:>10,} ops in {result['seconds']:.3f}s ({result['us_per_op']:>8.2f} us/op, {result['ops_per_sec']:>12,.0f} ops/sec)")
+    finally:
+        os.remove(log_path)
+
+    regressions = []
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)
+        print(f"Compared with {args.compare} ({baseline['meta'].get('commit')}):")
+        regressions = compare_results(baseline, results, args.threshold)
+    with open(args.output, "w", encoding="utf-8") as output:
+        json.dump(results, output, indent=2)
+    print(f"Saved the results to {args.output}")
+    if regressions:
+        print(f"Regressed by more than {args.threshold:.0%}: {', '.join(regressions)}", file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Compare the original live loop with the tail path of LogParser, both dispatching through a headless parser.
+
+Run from the repository root:
+    python -m tools.bench_tail --lines 200000
+    python -m tools.bench_tail --log Game.log
+"""
+import argparse
+import os
+import random
+import tempfile
+from time import perf_counter, process_time
+
+# Import kill tracker modules
+from modules.headless import create_headless_parser
+from modules.log_reader import LogTailer
+
+HANDLE = "TestPilot"
+GEID = "200146295176"
+
+SAMPLE_LINES = [
+    "<2025-03-01T20:15:01.123Z> [Notice] <SHUDEvent_OnNotification> Added notification \"Entered Monitored Space\" [6] to queue. New queue size: 1 [Team_CoreGameplayFeatures][Missions][Comms]\n",
+    "<2025-03-01T20:15:01.124Z> [Notice] <CEntity::OnOwnerRemoved> Entity lost owner [Team_Network][Network][Replication][Entity][Authority]\n",
+    "<2025-03-01T20:15:01.125Z> [Notice] <Vehicle Destruction> CVehicle::OnAdvanceDamageLevel: Vehicle 'AEGS_Gladius_4242333547198' [4242333547198] in zone 'space' destroyed [Team_VehicleFeatures]\n",
+    "<2025-03-01T20:15:01.126Z> [Notice] <Actor Death> CActor::Kill: 'Foe1' [1] in zone 'AEGS_Gladius_4242333547198' killed by 'TestPilot' [2] using 'KLWE_LaserRepeater_S3_1' [Class KLWE_LaserRepeater_S3] with damage type 'Bullet' from direction x: 0, y: 0, z: 0 [Team_ActorTech][Actor]\n",
+]
+
+# Not valid UTF-8, the game writes such bytes now and then
+JUNK_LINE = b"<2025-03-01T20:15:01.127Z> [Notice] <Audio> Trigger '\xff\xfe\x80' could not be resolved [Team_Audio]\n"
+
+def write_burst(file_location:str, line_count:int) -> int:
+    """Write a burst of fleet fight lines with some junk bytes and return its size in bytes."""
+    rng = random.Random(1)
+    samples = [line.encode("utf-8") for line in SAMPLE_LINES] + [JUNK_LINE]
+    with open(file_location, "wb") as burst:
+        burst.writelines(rng.choices(samples, weights=(60, 29, 5, 5, 1), k=line_count))
+    return os.path.getsize(file_location)
+
+def create_parser():
+    """A headless parser logged in as the player of the sample lines."""
+    parser = create_headless_parser()
+    parser.rsi_handle["current"] = HANDLE
+    parser.player_geid["current"] = GEID
+    return parser
+
+def original_loop(file_location:str, parser) -> int:
+    """The original live loop: a text-mode file with tell() and readline() for every line."""
+    lines = 0
+    with open(file_location, "r", encoding="utf-8", errors="replace") as sc_log:
+        while True:
+            where = sc_log.tell()
+            line = sc_log.readline()
+            if not line:
+                sc_log.seek(where)
+                return lines
+            parser.read_log_line(line, True)
+            lines += 1
+
+def tail_loop(file_location:str, parser, anchors:tuple=None) -> int:
+    """The loop of LogParser.tail_log: bulk reads, split into complete lines and dispatched as batches."""
+    with open(file_location, "rb") as sc_log:
+        tailer = LogTailer(sc_log, parser.log_encoding, parser.log_decode_errors, parser.backlog_chunk_size, anchors)
+        while True:
+            lines = tailer.read_lines()
+            if lines:
+                parser.read_log_lines(lines, True)
+            elif tailer.eof:
+                return tailer.offset
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=200000, help="Lines in the generated burst")
+    parser.add_argument("--log", help="Benchmark an existing Game.log instead of a generated burst")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per loop, the best one is reported")
+    args = parser.parse_args()
+
+    if args.log:
+        file_location = args.log
+        size = os.path.getsize(file_location)
+    else:
+        fd, file_location = tempfile.mkstemp(suffix=".log")
+        os.close(fd)
+        size = write_burst(file_location, args.lines)
+    loops = (
+        ("original", original_loop),
+        ("bulk", tail_loop),
+        # What tail_log runs, only lines with a trigger token anchor are decoded
+        ("tail", lambda file_location, parser: tail_loop(file_location, parser, parser.line_anchors)),
+    )
+    try:
+        results = {}
+        for name, loop in loops:
+            best = None
+            for _ in range(args.repeat):
+                parser = create_parser()
+                start = perf_counter()
+                cpu_start = process_time()
+                loop(file_location, parser)
+                elapsed = perf_counter() - start
+                cpu = process_time() - cpu_start
+                best = (elapsed, cpu) if best is None else min(best, (elapsed, cpu))
+            results[name] = best
+            print(f"{name:>8}: {size / 1e6:.1f} MB in {best[0]:.3f}s ({size / best[0] / 1e6:,.1f} MB/s, {best[1] * 1000 / (size / 1e6):.2f} ms CPU per MB)")
+        for name in ("bulk", "tail"):
+            print(f"  {name} vs original: {results['original'][1] / results[name][1]:.2f}x less CPU")
+    finally:
+        if not args.log:
+            os.remove(file_location)
+
+if __name__ == "__main__":
+    main()
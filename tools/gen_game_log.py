@@ -0,0 +1,175 @@
+"""Generate a synthetic Star Citizen Game.log of any size.
+
+Run from the repository root:
+    python -m tools.gen_game_log --lines 1000000 --output Game.log
+    python -m tools.gen_game_log --size-mb 500 --mix noise=0.9,kill=0.05 --output Game.log
+"""
+import argparse
+import random
+from datetime import datetime, timedelta, timezone
+
+HANDLE = "TestPilot"
+GEID = "200146295176"
+
+# Relative weight of each line kind after the login
+DEFAULT_MIX = {
+    "noise": 0.95,
+    "context": 0.002,
+    "vehicle_enter": 0.008,
+    "vehicle_exit": 0.006,
+    "zone": 0.01,
+    "kill": 0.012,
+    "jump": 0.004,
+    "destruction": 0.004,
+    "ship_spawn": 0.004,
+}
+
+NOISE_LINES = (
+    "[Notice] <SHUDEvent_OnNotification> Added notification \"Entered Monitored Space\" [6] to queue. New queue size: 1, MissionId: [00000000-0000-0000-0000-000000000000], ObjectiveId: [] [Team_CoreGameplayFeatures][Missions][Comms]",
+    "[Trace] @message: 'CEntityComponentInstancedInterior::OnEntityLeaveZone' Object 'Door_Ctrl_Bridge_{n}' left zone 'Hangar_LargeFront_{n}' [Team_Interiors]",
+    "[Notice] <CEntity::OnOwnerRemoved> Entity lost owner. Entity: EntityGeometry_{n} [{n}] [Team_Network][Network][Replication][Entity][Authority]",
+    "[Notice] <StatObjLoad 0x800 Format> 'Objects/Spaceships/Ships/ANVL/Hornet/F7A_Mk2/Hornet.cgf' Loading took {ms}ms [Team_Graphics][Loading]",
+    "[Notice] <InvalidItemDefinition> No item definition found for entity class 'Carryable_1H_CY_{n}' [Team_Items]",
+    "[Notice] <Physics> Grid {n} rebuilt in {ms} ms, 128 parts [Team_Physics]",
+    "[Warning] <Audio> Trigger 'Play_ui_notification_{n}' could not be resolved [Team_Audio]",
+    "[Notice] <Actor Stall> Player: {handle}, Type: up, Length: 0.{n} [Team_ActorTech]",
+    "[Notice] <CVehicle::OnAuthorityChanged> Vehicle 'ANVL_Hornet_F7A_Mk2_{n}' authority moved to the server [Team_VehicleFeatures][Vehicle]",
+    "[Notice] <GetAccountEntitlements> Entitlements refreshed, {n} items [Team_GameServices][Login]",
+)
+GAME_MODES = ("SC_Default", "EA_FreeFlight", "EA_SquadronBattle", "EA_Elimination")
+SHIPS = ("ANVL_Hornet_F7A_Mk2", "AEGS_Gladius", "DRAK_Cutlass_Black", "RSI_Aurora_MR", "ORIG_300i", "CRUS_Starfighter_Ion", "MISC_Prospector")
+WEAPONS = ("KLWE_LaserRepeater_S3", "BEHR_LaserCannon_S2", "GATS_BallisticGatling_S3", "AMRS_LaserCannon_S3", "behr_rifle_ballistic_01")
+PLAYERS = ("Foe_One", "Foe_Two", "Wingman_Three", "PU_Pilots-NineTails_123", "NPC_Archetypes-Male-Human-Guard_456")
+DAMAGE_TYPES = ("Bullet", "Bullet", "Bullet", "Crash", "SelfDestruct", "Explosion")
+
+def parse_mix(text:str) -> dict:
+    """Parse kind=weight pairs, unspecified kinds keep their default weight."""
+    mix = dict(DEFAULT_MIX)
+    for pair in filter(None, text.split(",")):
+        kind, weight = pair.split("=")
+        if kind not in mix:
+            raise ValueError(f"Unknown line kind {kind}, choose from {', '.join(mix)}")
+        mix[kind] = float(weight)
+    return mix
+
+class GameLogGenerator():
+    """Produces a consistent session: the login first, then ships entered, exited and destroyed with matching ids."""
+    def __init__(self, seed:int=1, mix:dict=None, handle:str=HANDLE, geid:str=GEID):
+        self.rng = random.Random(seed)
+        self.mix = mix if mix else dict(DEFAULT_MIX)
+        self.kinds = tuple(self.mix)
+        self.weights = tuple(self.mix.values())
+        self.handle = handle
+        self.geid = geid
+        self.clock = datetime(2025, 3, 1, 18, 0, 0, tzinfo=timezone.utc)
+        self.ship = None
+        self.ship_id = None
+
+    def stamp(self, line:str) -> str:
+        self.clock += timedelta(milliseconds=self.rng.randrange(1, 40))
+        return f"<{self.clock.strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3]}Z> {line}\n"
+
+    def new_ship(self) -> tuple:
+        return self.rng.choice(SHIPS), str(self.rng.randrange(10 ** 12, 10 ** 13))
+
+    def header(self) -> list:
+        """The lines every log starts with."""
+        return [
+            f"<{self.clock.strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3]}Z> Log started on {self.clock.strftime('%a %b %d %H:%M:%S %Y')}\n",
+            self.stamp(f"[Notice] <Legacy login response> [CIG-net] User Login Success - Handle[{self.handle}] - Time[{self.rng.randrange(10 ** 8)}] [Team_GameServices][Login]"),
+            self.stamp(f"[Notice] <AccountLoginCharacterStatus_Character> Character: createdAt 1 - updatedAt 2 - geid {self.geid} - accountId 3 - name {self.handle} - state STATE_CURRENT [Team_GameServices][Login]"),
+            self.stamp("[Notice] <Context Establisher Done> establisher=\"CReplicationModel\" runningTime=22.340000 map=\"megamap\" gamerules=\"SC_Default\" remainingStateCount=0 [Team_Network][Network][Replication][Loading][Persistence]"),
+        ]
+
+    def line(self) -> str:
+        """Generate the next line of the session."""
+        kind = self.rng.choices(self.kinds, self.weights)[0]
+        return self.stamp(getattr(self, f"make_{kind}")())
+
+    def make_noise(self) -> str:
+        return self.rng.choice(NOISE_LINES).format(n=self.rng.randrange(10 ** 6), ms=self.rng.randrange(1, 900), handle=self.handle)
+
+    def make_context(self) -> str:
+        self.ship = None
+        return f"[Notice] <Context Establisher Done> establisher=\"CReplicationModel\" runningTime={self.rng.uniform(5, 90):.6f} map=\"megamap\" gamerules=\"{self.rng.choice(GAME_MODES)}\" remainingStateCount=0 [Team_Network][Network][Replication][Loading][Persistence]"
+
+    def make_vehicle_enter(self) -> str:
+        self.ship, self.ship_id = self.new_ship()
+        return f"[Notice] <Vehicle Control Flow> CVehicleMovementBase::SetDriver: Local client node [{self.geid}] requesting control token for '{self.ship}_{self.ship_id}' [{self.ship_id}] [Team_VehicleFeatures][Vehicle]"
+
+    def make_vehicle_exit(self) -> str:
+        ship, ship_id = (self.ship, self.ship_id) if self.ship else self.new_ship()
+        self.ship = None
+        return f"[Notice] <Vehicle Control Flow> CVehicleMovementBase::ClearDriver: Local client node [{self.geid}] releasing control token for '{ship}_{ship_id}' [{ship_id}] [Team_VehicleFeatures][Vehicle]"
+
+    def make_zone(self) -> str:
+        ship, ship_id = (self.ship, self.ship_id) if self.ship else self.new_ship()
+        return f"[Notice] <OnEntityEnterZone> Player {self.handle} -> Entity [{ship}_{ship_id}] zone enter [Team_Interiors]"
+
+    def make_kill(self) -> str:
+        zone = f"{self.ship}_{self.ship_id}" if self.ship else "Hangar_LargeFront_001"
+        weapon = f"{self.rng.choice(WEAPONS)}_{self.rng.randrange(10 ** 12, 10 ** 13)}"
+        other = self.rng.choice(PLAYERS)
+        roll = self.rng.random()
+        if roll < 0.55:
+            victim, killer = other, self.handle
+        elif roll < 0.9:
+            victim, killer = self.handle, other
+        elif roll < 0.95:
+            victim, killer = self.handle, self.handle
+        else:
+            victim, killer = other, "unknown"
+        return (
+            f"[Notice] <Actor Death> CActor::Kill: '{victim}' [{self.rng.randrange(10 ** 12)}] in zone '{zone}' killed by '{killer}' "
+            f"[{self.rng.randrange(10 ** 12)}] using '{weapon}' [Class {weapon.rsplit('_', 1)[0]}] with damage type '{self.rng.choice(DAMAGE_TYPES)}' "
+            f"from direction x: 0.{self.rng.randrange(1000)}, y: -0.{self.rng.randrange(1000)}, z: 0.{self.rng.randrange(1000)} [Team_ActorTech][Actor]"
+        )
+
+    def make_jump(self) -> str:
+        ship, ship_id = (self.ship, self.ship_id) if self.ship else self.new_ship()
+        return f"[Notice] <Jump Drive State Changed> Now Idle adam: {ship}_{ship_id} in zone {ship}_{ship_id} [Team_CoreGameplayFeatures][JumpDrive]"
+
+    def make_destruction(self) -> str:
+        if self.ship and self.rng.random() < 0.5:
+            ship, ship_id = self.ship, self.ship_id
+        else:
+            ship, ship_id = self.new_ship()
+        return f"[Notice] <Vehicle Destruction> CVehicle::OnAdvanceDamageLevel: Vehicle '{ship}_{ship_id}' [{ship_id}] in zone 'space' [pos x: 1, y: 2, z: 3] driven by '{self.handle}' advanced from destroy level 0 to 1 caused by 'Foe_One' [Team_VehicleFeatures][Vehicle]"
+
+    def make_ship_spawn(self) -> str:
+        ship, ship_id = self.new_ship()
+        # set_ac_ship() takes the quoted ship from the sixth token
+        return f"[Notice] <CPlayerShipRespawnManager::OnVehicleSpawned> Vehicle spawned: '{ship}' [{ship_id}] for player [{self.geid}] at pad 3 [Team_CoreGameplayFeatures]"
+
+def write_game_log(output:str, lines:int=None, size_mb:float=None, seed:int=1, mix:dict=None) -> tuple:
+    """Write a log with the given number of lines or size, return (lines, bytes) written."""
+    generator = GameLogGenerator(seed, mix)
+    limit = size_mb * 1e6 if size_mb else None
+    written_lines = 0
+    written_bytes = 0
+    with open(output, "w", encoding="utf-8", newline="\n") as game_log:
+        batch = generator.header()
+        while True:
+            text = "".join(batch)
+            game_log.write(text)
+            written_lines += len(batch)
+            written_bytes += len(text.encode("utf-8"))
+            if (lines and written_lines >= lines) or (limit and written_bytes >= limit):
+                return written_lines, written_bytes
+            count = min(10000, lines - written_lines) if lines else 10000
+            batch = [generator.line() for _ in range(count)]
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    size = parser.add_mutually_exclusive_group(required=True)
+    size.add_argument("--lines", type=int, help="Number of lines to write")
+    size.add_argument("--size-mb", type=float, help="Approximate size of the log in MB")
+    parser.add_argument("--output", default="Game.log", help="Where to write the log")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed, the same seed gives the same log")
+    parser.add_argument("--mix", default="", help=f"Line kind weights, e.g. noise=0.9,kill=0.05. Kinds: {', '.join(DEFAULT_MIX)}")
+    args = parser.parse_args()
+    lines, size = write_game_log(args.output, args.lines, args.size_mb, args.seed, parse_mix(args.mix))
+    print(f"Wrote {lines:,} lines ({size / 1e6:,.1f} MB) to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Import archived Star Citizen session logs into the lifetime stats, nothing is posted to Servitor.
+
+Run from the repository root, --tracker-dir is the directory of bv_killtracker.cfg (default: current directory):
+    python -m tools.import_logbackups "C:/Program Files/Roberts Space Industries/StarCitizen/LIVE/Game.log" --tracker-dir "C:/BV Kill Tracker"
+    python -m tools.import_logbackups path/to/logbackups --handle MyHandle --workers 8
+
+A Game.log path imports the logbackups directory next to it. Logs imported before are skipped.
+The stats are saved to bv_killtracker_lifetime.json in the tracker directory, weapon names come from the
+data maps the tracker cached there unless --data-map is given.
+"""
+import argparse
+import json
+from pathlib import Path
+from time import perf_counter
+
+# Import kill tracker modules
+from modules.data_map_cache import DataMapCache
+from modules.log_import import LogImporter, find_log_backups
+
+def find_import_logs(paths:list) -> list:
+    """Expand Game.log paths into their backups and directories into the logs they contain."""
+    logs = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            logs.extend(sorted(str(log) for log in path.glob("*.log")))
+        elif path.name.lower() == "game.log":
+            logs.extend(find_log_backups(str(path)))
+        else:
+            logs.append(str(path))
+    return logs
+
+def print_top(title:str, tally:dict, count:int=5) -> None:
+    if tally:
+        print(f"{title}: " + ", ".join(f"{name} ({kills})" for name, kills in list(tally.items())[:count]))
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("logs", nargs="+", help="Game.log, logbackups directories or archived logs")
+    parser.add_argument("--handle", help="Only count the kills and deaths of this RSI handle, defaults to the latest login of each log")
+    parser.add_argument("--tracker-dir", type=Path, default=Path.cwd(), help="Directory of bv_killtracker.cfg")
+    parser.add_argument("--data-map", type=Path, help="JSON file with weapons and ignoredVictimRules data maps")
+    parser.add_argument("--workers", type=int, help="Worker processes, defaults to the number of CPUs")
+    args = parser.parse_args()
+    if not args.tracker_dir.is_dir():
+        parser.error(f"--tracker-dir {args.tracker_dir} is not a directory")
+    if args.data_map:
+        with open(args.data_map, encoding="utf-8") as data_map_file:
+            data_map = json.load(data_map_file)
+    else:
+        # The data maps the tracker pulled from Servitor last time it ran
+        cached = DataMapCache(args.tracker_dir / "bv_killtracker_data.json").load()
+        data_map = {data_type: entry["data"] for data_type, entry in cached.items()}
+        if not data_map:
+            print(f"No cached data maps in {args.tracker_dir}, weapons and ships keep their raw names")
+
+    importer = LogImporter(args.tracker_dir / "bv_killtracker_lifetime.json", args.workers)
+    logs = find_import_logs(args.logs)
+    already_imported = len(importer.get_lifetime_stats()["imported"])
+    start = perf_counter()
+    lifetime = importer.import_logs(logs, data_map, args.handle)
+    elapsed = perf_counter() - start
+
+    totals = lifetime["totals"]
+    print(f"Imported {len(lifetime['imported']) - already_imported} of {len(logs)} logs in {elapsed:.2f} s with {importer.workers} workers")
+    print(f"Lifetime: {totals.get('kills', 0)} kills, {totals.get('deaths', 0)} deaths, {totals.get('suicides', 0)} suicides from {len(lifetime['imported'])} logs")
+    print_top("Top weapons", totals.get("weapons"))
+    print_top("Top ships", totals.get("ships"))
+    print_top("Killed most by", totals.get("killed_by"))
+
+if __name__ == "__main__":
+    main()
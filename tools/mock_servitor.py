@@ -0,0 +1,155 @@
+"""Run a local stand-in for Servitor that records and acknowledges kills, single and batched.
+
+Run from the repository root:
+    python -m tools.mock_servitor --port 25966 --record posts.ndjson
+    python -m tools.mock_servitor --no-batch --fail-rate 0.2 --latency 150
+    python -m tools.mock_servitor --data-map data_map.json
+
+Point the client at it with api_client.transport.api_fqdn = "http://127.0.0.1:25966".
+Every key is valid, data maps are served with an ETag and Ctrl+C prints what was received.
+"""
+import argparse
+import hashlib
+import json
+import random
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from threading import Lock
+from time import sleep
+
+KILL_ENDPOINTS = ("reportKill", "reportACKill")
+
+class MockServitor(ThreadingHTTPServer):
+    """HTTP server holding the behaviour switches and what was received."""
+    daemon_threads = True
+
+    def __init__(self, address:tuple, batch:bool=True, fail_rate:float=0.0, latency:float=0.0, record=None, data_map:dict=None):
+        super().__init__(address, MockServitorHandler)
+        self.data_map = data_map if data_map else {}
+        self.batch = batch
+        self.fail_rate = fail_rate
+        self.latency = latency
+        self.record = record
+        self.rng = random.Random(1)
+        self.lock = Lock()
+        self.requests = Counter()
+        self.kills = Counter()
+        self.batch_sizes = Counter()
+
+    def accept_kill(self) -> bool:
+        with self.lock:
+            return self.rng.random() >= self.fail_rate
+
+    def save(self, path:str, body) -> None:
+        """Count the request and append it to the record file."""
+        with self.lock:
+            self.requests[path] += 1
+            if self.record:
+                self.record.write(json.dumps({"time": datetime.now(timezone.utc).isoformat(), "path": path, "body": body}) + "\n")
+                self.record.flush()
+
+class MockServitorHandler(BaseHTTPRequestHandler):
+    """Answers the Servitor endpoints the Kill Tracker calls."""
+    # Keep-alive, like the real server
+    protocol_version = "HTTP/1.1"
+
+    def do_HEAD(self) -> None:
+        self.send_json(200, None)
+
+    def do_GET(self) -> None:
+        path = self.path.strip("/")
+        self.server.save(path, None)
+        if path == "capabilities":
+            if self.server.batch:
+                self.send_json(200, {"batch": list(KILL_ENDPOINTS)})
+            else:
+                self.send_json(404, {"error": "not found"})
+        elif path.startswith("api/server/data/"):
+            data_type = path.rsplit("/", 1)[1]
+            body = {data_type: self.server.data_map.get(data_type, [])}
+            etag = f'"{hashlib.sha1(json.dumps(body, sort_keys=True).encode("utf-8")).hexdigest()}"'
+            if self.headers.get("If-None-Match") == etag:
+                self.send_json(304, None, {"ETag": etag})
+            else:
+                self.send_json(200, body, {"ETag": etag})
+        else:
+            self.send_json(404, {"error": "not found"})
+
+    def do_POST(self) -> None:
+        path = self.path.strip("/")
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"null")
+        self.server.save(path, body)
+        if self.server.latency:
+            sleep(self.server.latency)
+        if path == "validateKey":
+            expires_at = datetime.now(timezone.utc) + timedelta(days=30)
+            self.send_json(200, {"expires_at": expires_at.strftime("%Y-%m-%dT%H:%M:%S.000Z"), "commanders": []})
+        elif path in KILL_ENDPOINTS:
+            self.server.batch_sizes[1] += 1
+            if self.server.accept_kill():
+                self.server.kills[path] += 1
+                self.send_json(200, {"ok": True})
+            else:
+                self.send_json(500, {"error": "rejected"})
+        elif self.server.batch and path.removesuffix("Batch") in KILL_ENDPOINTS:
+            events = body["events"]
+            self.server.batch_sizes[len(events)] += 1
+            results = []
+            for _ in events:
+                if self.server.accept_kill():
+                    self.server.kills[path.removesuffix("Batch")] += 1
+                    results.append({"ok": True})
+                else:
+                    results.append({"ok": False, "error": "rejected"})
+            self.send_json(200, {"results": results})
+        else:
+            self.send_json(404, {"error": "not found"})
+
+    def send_json(self, status:int, body, headers:dict=None) -> None:
+        data = json.dumps(body).encode("utf-8") if body is not None else b""
+        self.send_response(status)
+        for name, value in (headers if headers else {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(data)
+
+    def log_message(self, format, *args) -> None:
+        # The summary on exit is enough
+        pass
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on")
+    parser.add_argument("--port", type=int, default=25966, help="Port to listen on")
+    parser.add_argument("--no-batch", action="store_true", help="Do not advertise or accept batch endpoints")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Fraction of kills to reject")
+    parser.add_argument("--latency", type=float, default=0.0, help="Delay before answering a post, in milliseconds")
+    parser.add_argument("--record", help="Append every request to this NDJSON file")
+    parser.add_argument("--data-map", help="JSON file with the data maps to serve, e.g. weapons and ignoredVictimRules")
+    args = parser.parse_args()
+    data_map = None
+    if args.data_map:
+        with open(args.data_map, encoding="utf-8") as data_map_file:
+            data_map = json.load(data_map_file)
+
+    record = open(args.record, "a", encoding="utf-8") if args.record else None
+    server = MockServitor((args.host, args.port), not args.no_batch, args.fail_rate, args.latency / 1000, record, data_map)
+    print(f"Mock Servitor listening on http://{args.host}:{server.server_port} (batches {'off' if args.no_batch else 'on'})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if record:
+            record.close()
+    print(f"Requests: {dict(server.requests)}")
+    print(f"Kills acknowledged: {dict(server.kills)}")
+    print(f"Kills per request: {dict(sorted(server.batch_sizes.items()))}")
+
+if __name__ == "__main__":
+    main()
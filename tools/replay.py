@@ -0,0 +1,159 @@
+"""Replay recorded Game.log files through LogParser with no Tk, pygame or network.
+
+Run from the repository root:
+    python -m tools.replay path/to/Game.log [more logs or directories] > events.ndjson
+
+Events are written as NDJSON, timings go to stderr.
+"""
+import argparse
+import json
+import sys
+from dataclasses import asdict
+from pathlib import Path
+from time import perf_counter
+
+# Import kill tracker modules
+from modules.headless import create_headless_parser
+from modules.log_bootstrap import SessionBootstrap
+from modules.log_events import KillEvent, DeathEvent, ZoneChange, VehicleStatus, SessionStats
+from modules.log_reader import iter_line_batches, find_last_line_end
+
+RECORDED_EVENTS = (KillEvent, DeathEvent, ZoneChange, VehicleStatus, SessionStats)
+
+def find_logs(paths:list) -> list:
+    """Expand directories, e.g. logbackups, into the .log files they contain."""
+    logs = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            logs.extend(sorted(path.glob("*.log")))
+        else:
+            logs.append(path)
+    return logs
+
+def get_peak_rss() -> int:
+    """Get the peak resident set size of this process in bytes."""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports KiB, macOS bytes
+        return peak if sys.platform == "darwin" else peak * 1024
+    except ImportError:
+        import psutil
+        memory = psutil.Process().memory_info()
+        return getattr(memory, "peak_wset", memory.rss)
+
+def time_handlers(parser, timings:dict) -> None:
+    """Wrap the parser's event handlers to count calls and time spent per event type."""
+    for event_type, handler in list(parser.event_handlers.items()):
+        timing = timings.setdefault(event_type, [0, 0.0])
+        def timed(line, upload_kills, handler=handler, timing=timing):
+            start = perf_counter()
+            try:
+                return handler(line, upload_kills)
+            finally:
+                timing[0] += 1
+                timing[1] += perf_counter() - start
+        parser.event_handlers[event_type] = timed
+
+def replay_log(log_path:Path, args, output, timings:dict) -> dict:
+    """Replay one log through a fresh headless parser and return its statistics."""
+    parser = create_headless_parser(args.data_map, args.verbose)
+    # The identity is known before the first line, the state evolves from the start like a live session
+    bootstrap = SessionBootstrap()
+    with open(log_path, "rb") as sc_log:
+        bootstrap.resume_offset = find_last_line_end(sc_log, parser.backlog_chunk_size)
+        parser.session_scanner.scan_identity(str(log_path), sc_log, bootstrap)
+    parser.rsi_handle["current"] = args.handle if args.handle else bootstrap.rsi_handle
+    parser.player_geid["current"] = bootstrap.player_geid
+    if args.handle:
+        # Login lines of the log must not replace the tracked handle
+        parser.event_handlers["login"] = lambda line, upload_kills: True
+
+    if output:
+        def record(event) -> None:
+            fields = asdict(event)
+            # Stage timestamps differ on every run
+            fields.pop("stages", None)
+            output.write(json.dumps({"file": log_path.name, "event": type(event).__name__, **fields}) + "\n")
+        parser.event_bus.subscribe("recorder", record, RECORDED_EVENTS)
+    time_handlers(parser, timings)
+
+    stats = {"file": str(log_path), "lines": 0, "bytes": 0, "errors": 0}
+    start = perf_counter()
+    with open(log_path, "rb") as sc_log:
+        for lines, offset in iter_line_batches(sc_log, parser.backlog_chunk_size, parser.log_encoding, parser.log_decode_errors):
+            for line in lines:
+                try:
+                    parser.read_log_line(line, True)
+                except Exception as e:
+                    stats["errors"] += 1
+                    parser.log.error(f"replay_log(): Error: {e.__class__.__name__} {e}")
+            stats["lines"] += len(lines)
+            stats["bytes"] = offset
+    stats["seconds"] = perf_counter() - start
+    stats.update({
+        "rsi_handle": parser.rsi_handle["current"],
+        "kills": parser.kill_total,
+        "deaths": parser.death_total,
+        "posts": len(parser.api.posts),
+        "heartbeats": len(parser.cm.heartbeats),
+        "sounds": parser.sounds.played,
+    })
+    return stats
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("logs", nargs="+", help="Game.log files or directories of them")
+    parser.add_argument("--handle", help="RSI handle to track instead of the one found in each log")
+    parser.add_argument("--data-map", type=Path, help="JSON file with weapons and ignoredVictimRules data maps")
+    parser.add_argument("--output", help="Write the NDJSON events here instead of stdout")
+    parser.add_argument("--no-events", action="store_true", help="Only measure, don't write events")
+    parser.add_argument("--stats", help="Write the statistics as JSON to this file")
+    parser.add_argument("--verbose", action="store_true", help="Print the parser log to stderr")
+    args = parser.parse_args()
+    if args.data_map:
+        with open(args.data_map, encoding="utf-8") as data_map:
+            args.data_map = json.load(data_map)
+
+    output = None
+    if not args.no_events:
+        output = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    timings = {}
+    results = []
+    try:
+        for log_path in find_logs(args.logs):
+            stats = replay_log(log_path, args, output, timings)
+            results.append(stats)
+            print(
+                f"{log_path.name}: {stats['lines']:,} lines, {stats['bytes'] / 1e6:,.1f} MB in {stats['seconds']:.2f} s "
+                f"({stats['lines'] / max(stats['seconds'], 1e-9):,.0f} lines/sec), "
+                f"{stats['kills']} kills, {stats['deaths']} deaths, {stats['errors']} errors",
+                file=sys.stderr
+            )
+    finally:
+        if output and output is not sys.stdout:
+            output.close()
+
+    total_lines = sum(stats["lines"] for stats in results)
+    total_seconds = sum(stats["seconds"] for stats in results)
+    summary = {
+        "logs": results,
+        "lines": total_lines,
+        "seconds": total_seconds,
+        "lines_per_sec": total_lines / max(total_seconds, 1e-9),
+        "event_types": {
+            event_type: {"count": count, "seconds": seconds, "us_per_event": seconds / count * 1e6 if count else 0.0}
+            for event_type, (count, seconds) in sorted(timings.items())
+        },
+        "peak_rss": get_peak_rss(),
+    }
+    print(f"Total: {total_lines:,} lines in {total_seconds:.2f} s ({summary['lines_per_sec']:,.0f} lines/sec)", file=sys.stderr)
+    for event_type, timing in summary["event_types"].items():
+        print(f"  {event_type:<20} {timing['count']:>8,} events {timing['seconds'] * 1000:>9.1f} ms {timing['us_per_event']:>8.1f} us/event", file=sys.stderr)
+    print(f"Peak RSS: {summary['peak_rss'] / 1e6:.1f} MB", file=sys.stderr)
+    if args.stats:
+        with open(args.stats, "w", encoding="utf-8") as stats_file:
+            json.dump(summary, stats_file, indent=2)
+
+if __name__ == "__main__":
+    main()